@@ -17,6 +17,29 @@ Usage:
 >>> # cookies are preserved per class
 """
 
+import sys
+
 from beeswax_wrapper.core.access import BeeswaxAPI, configure_endpoint
 
 __all__ = ['BeeswaxAPI', 'configure_endpoint']
+
+
+if sys.version_info >= (3, 7):
+    from importlib import import_module
+    from importlib.util import find_spec
+
+    def __getattr__(name):
+        """Imports the AsyncBeeswaxAPI (and aiohttp) on first use"""
+        if name == 'AsyncBeeswaxAPI':
+            return import_module('beeswax_wrapper.core.async_access').AsyncBeeswaxAPI
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    if find_spec('aiohttp') is not None:  # without importing it
+        __all__ += ['AsyncBeeswaxAPI']
+
+else:  # no module __getattr__
+    try:
+        from beeswax_wrapper.core.async_access import AsyncBeeswaxAPI
+        __all__ += ['AsyncBeeswaxAPI']
+    except (ImportError, SyntaxError):  # python2 or aiohttp not installed
+        pass
@@ -6,15 +6,26 @@ Beeswax specific access classes for the wrapper
 from __future__ import unicode_literals
 
 import logging
+import os
+import threading
+import time
 import traceback
-import ujson
-
-import requests
-from requests import ConnectionError
-
-from beeswax_wrapper.core.exceptions import BeeswaxRESTException
-from beeswax_wrapper.credentials.credential_manager import get_beeswax_credentials
-from beeswax_wrapper.modules import account, admin, creatives, extensions, monitoring, operations, segments
+import weakref
+
+from beeswax_wrapper.core.base_classes import LazyEndpoint
+from beeswax_wrapper.core.batch import BeeswaxBatch, BulkResult
+from beeswax_wrapper.core.coalescing import SingleFlight
+from beeswax_wrapper.core.codecs import get_codec
+from beeswax_wrapper.core.compression import ACCEPT_ENCODING
+from beeswax_wrapper.core.exceptions import (
+    BeeswaxAuthenticationException, BeeswaxRESTException, BeeswaxTransientException, exception_from_status
+)
+from beeswax_wrapper.core.metrics import EXPIRING, REJECTED, endpoint_name, notify, request_size
+from beeswax_wrapper.core.retry import AUTHENTICATION, RetryPolicy
+from beeswax_wrapper.core.sessions import SessionLifetime
+from beeswax_wrapper.core.streaming import JSONArrayStream
+from beeswax_wrapper.core.tracing import DECODE, DOWNLOAD, current_span, phase
+from beeswax_wrapper.credentials.credential_manager import get_credential_provider
 
 
 try:
@@ -24,17 +35,111 @@ except NameError:  # 2to3
 
 
 BEESWAX_DAL = None
+_BEESWAX_DAL_LOCK = threading.Lock()
+_DALS = weakref.WeakSet()  # rebuilt in forked children
+_FORK_COMPONENTS = weakref.WeakSet()  # other objects whose locks are replaced in forked children
 
 
 class BeeswaxDAL(object):
     """
     DAL specific to beeswax
     Creates a session and authenticates it using the beeswax authentication endpoint
+    Safe to share between threads, and rebuilds its sessions in forked processes keeping the authentication
     """
 
-    def __init__(self, endpoint_url):
+    def __init__(self, endpoint_url, retry_policy=None, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keep_alive=True, thread_local_sessions=False, session_lifetime=None, refresh_margin=30.0,
+                 rate_limiter=None, circuit_breakers=None, cache=None, coalesce=True, compression=None,
+                 codec=None, credential_provider=None, metrics=None, tracer=None, profiler=None):
+        """
+        :type endpoint_url: str
+        :type retry_policy: RetryPolicy
+        :param int pool_connections: number of hosts to keep connection pools for
+        :param int pool_maxsize: maximum connections kept per host
+        :param bool pool_block: wait for a free connection rather than opening (and discarding) extra ones
+        :param bool keep_alive: reuse connections, with tcp keep-alive probes on idle connections
+        :param bool thread_local_sessions: one session (and connection pool) per thread sharing the auth cookies
+        :param float session_lifetime: seconds an authentication is valid for if the auth cookie has no expiry
+        :param float refresh_margin: seconds before the authentication expires to refresh it
+        :type rate_limiter: beeswax_wrapper.core.rate_limit.RateLimiter
+        :type circuit_breakers: beeswax_wrapper.core.circuit_breaker.CircuitBreakers
+        :type cache: beeswax_wrapper.core.cache.ResponseCache
+        :param bool coalesce: share a single network call between identical concurrent GETs
+        :type compression: beeswax_wrapper.core.compression.RequestCompression
+        :param codec: json codec name ('ujson', 'orjson' or 'json') or beeswax_wrapper.core.codecs.JSONCodec
+        :param credential_provider: source of the credentials, the shared get_credential_provider() by default
+        :type credential_provider: beeswax_wrapper.credentials.credential_manager.CredentialProvider
+        :param metrics: receives the latency, size, status, retry and re-authentication of every call
+        :type metrics: beeswax_wrapper.core.metrics.MetricsCollector
+        :param tracer: opens a span for every api method call, with a child span per phase of the call
+        :type tracer: beeswax_wrapper.core.tracing.Tracer
+        :param profiler: profiles a sample of the api method calls
+        :type profiler: beeswax_wrapper.core.profiling.Profiler
+        """
         self.endpoint_url = endpoint_url
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.compression = compression
+        self.codec = get_codec(codec)
+        self.credential_provider = credential_provider
+        self.metrics = metrics
+        self.tracer = tracer
+        self.profiler = profiler
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.thread_local_sessions = thread_local_sessions
+        self._cookies = None
+        self._adapters = {}
         self._session = None
+        self._local = threading.local()
+        self.lifetime = SessionLifetime(session_lifetime, refresh_margin)
+        self._lock = threading.RLock()
+        self._auth_generation = 0
+        self._auth_parameters = None
+        self.username = None  # the authenticated user
+        self._pid = os.getpid()
+        _DALS.add(self)
+
+    def _check_fork(self):
+        """Rebuild the DAL if the process forked without os.register_at_fork (python < 3.7)"""
+        if self._pid != os.getpid():
+            self._after_fork()
+
+    def _after_fork(self):
+        """
+        Drop the sessions and locks inherited from the parent process, the auth cookies are kept
+        The sessions are not closed as their sockets are shared with the parent
+        """
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
+        self._session = None
+        self._local = threading.local()
+        if self.single_flight is not None:  # calls in flight in the parent never finish here
+            self.single_flight = SingleFlight()
+        if self._cookies is not None:
+            self._cookies._cookies_lock = threading.RLock()
+        for component in (self.cache, self.rate_limiter, self.circuit_breakers, self.metrics, self.tracer,
+                          self.profiler, self.credential_provider or get_credential_provider()):
+            if hasattr(component, '_after_fork'):
+                component._after_fork()
+
+    @property
+    def cookies(self):
+        """
+        The auth cookies shared by the sessions
+        :rtype: requests.cookies.RequestsCookieJar
+        """
+        if self._cookies is None:
+            with self._lock:
+                if self._cookies is None:
+                    from requests.cookies import RequestsCookieJar  # deferred to first use for fast imports
+                    self._cookies = RequestsCookieJar()
+        return self._cookies
 
     @property
     def session(self):
@@ -42,31 +147,164 @@ class BeeswaxDAL(object):
         Get or create a requests Session
         :rtype: requests.Session
         """
+        self._check_fork()
+
+        if self.thread_local_sessions:
+            if getattr(self._local, 'session', None) is None:
+                self._local.session = self._create_session()
+            return self._local.session
+
         if not self._session:
-            self._session = requests.Session()
+            with self._lock:
+                if not self._session:
+                    self._session = self._create_session()
         return self._session
 
-    def _call(self, method, paths, **kwargs):
+    def _create_session(self):
         """
-        returns the results of an endpoint _call
-        :rtype: list|dict
+        Create a session using the pool configuration and the shared auth cookies
+        :rtype: requests.Session
+        """
+        import requests
+        from beeswax_wrapper.core.adapters import KEEP_ALIVE_SOCKET_OPTIONS, BeeswaxHTTPAdapter
+
+        session = requests.Session()
+        session.cookies = self.cookies
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING  # decoded incrementally by iter_content
+
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, BeeswaxHTTPAdapter(
+                socket_options=KEEP_ALIVE_SOCKET_OPTIONS if self.keep_alive else None,
+                pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block
+            ))
+        for prefix, adapter in self._adapters.items():
+            session.mount(prefix, adapter)
+
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def mount(self, prefix, adapter):
+        """
+        Mount a custom transport adapter on the DAL sessions
+        :type prefix: str
+        :type adapter: requests.adapters.BaseAdapter
+        """
+        with self._lock:
+            self._adapters[prefix] = adapter
+            self.reset_sessions()
+
+    def configure_pool(self, **kwargs):
+        """
+        Update the connection pool configuration, sessions are recreated on next use keeping the auth cookies
+        :param dict kwargs: pool_connections, pool_maxsize, pool_block, keep_alive, thread_local_sessions
+        """
+        with self._lock:
+            for option, value in kwargs.items():
+                if option not in {'pool_connections', 'pool_maxsize', 'pool_block', 'keep_alive',
+                                  'thread_local_sessions'}:
+                    raise TypeError('Unknown pool option {}'.format(option))
+                setattr(self, option, value)
+            self.reset_sessions()
+
+    def reset_sessions(self):
+        """Drop the current sessions (and their connections), the auth cookies are kept"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._local = threading.local()
+
+    def _request(self, method, paths, **kwargs):
+        """
+        returns the http response of an endpoint request
+        :rtype: requests.Response
         """
         if self.endpoint_url is None:
             raise RuntimeError('Must provide a valid endpoint_url as str|unicode')
 
         url = self.endpoint_url + '/'.join(map(unicode, paths))
+        request_bytes = request_size(kwargs) if self.metrics is not None else None
+        if self.compression is not None:
+            kwargs = self.compression.prepare(kwargs)
 
         call_func = getattr(self.session, method.lower())
-        response = call_func(url, **kwargs).json()
+        traced = not kwargs.get('stream') and current_span() is not None
+        if self.metrics is None and not traced:
+            return call_func(url, **kwargs)
+
+        started = time.time()
+        try:
+            if traced:  # the body is read separately so that its download is timed apart from the wait
+                http_response = call_func(url, **dict(kwargs, stream=True))
+                with phase(DOWNLOAD):
+                    http_response.content  # noqa, reads and caches the body
+            else:
+                http_response = call_func(url, **kwargs)
+        except Exception:
+            notify(self.metrics, 'on_response', method, endpoint_name(paths), None, time.time() - started,
+                   request_bytes, None)
+            raise
+        if self.metrics is not None:
+            response_bytes = None if kwargs.get('stream') else len(http_response.content)  # streams are not read yet
+            notify(self.metrics, 'on_response', method, endpoint_name(paths), http_response.status_code,
+                   time.time() - started, request_bytes, response_bytes)
+        return http_response
+
+    def _decode(self, http_response):
+        """
+        returns the payload of an endpoint response, decoded from the body bytes by the codec
+        :type http_response: requests.Response
+        :rtype: list|dict
+        """
+        try:
+            response = self.codec.loads(http_response.content)
+        except ValueError:  # e.g. an html error page from a proxy
+            raise exception_from_status(http_response.status_code, http_response.text)
 
         if isinstance(response, list):
             return response
 
         if not response['success']:
-            raise BeeswaxRESTException('\n'.join(response.get('errors', [response.get('message', '')])))
+            message = '\n'.join(response.get('errors', [response.get('message', '')]))
+            raise exception_from_status(http_response.status_code, message)
 
         return response.get('payload')
 
+    def _call(self, method, paths, **kwargs):
+        """
+        returns the results of an endpoint _call
+        :rtype: list|dict
+        """
+        http_response = self._request(method, paths, **kwargs)
+        with phase(DECODE):
+            return self._decode(http_response)
+
+    def _stream_call(self, method, paths, chunk_size=65536, **kwargs):
+        """
+        returns an iterator of the payload elements of an endpoint _call, decoded as the body is received
+        errors in the response status are raised before the iterator is returned
+        :rtype: collections.Iterator
+        """
+        http_response = self._request(method, paths, stream=True, **kwargs)
+        if not http_response.ok:
+            self._decode(http_response)
+            raise exception_from_status(http_response.status_code, http_response.text)
+        return self._iter_payload(http_response, chunk_size, self.codec)
+
+    @staticmethod
+    def _iter_payload(http_response, chunk_size, codec=None):
+        try:
+            stream = JSONArrayStream(http_response.iter_content(chunk_size), codec=codec)
+            for item in stream:
+                yield item
+        finally:
+            http_response.close()
+
+        if stream.envelope.get('success') is False:
+            message = '\n'.join(stream.envelope.get('errors', [stream.envelope.get('message', '')]))
+            raise exception_from_status(http_response.status_code, message)
+
     def authenticate(self, username=None, password=None):
         """
         Authenticates the user credentials provided
@@ -79,34 +317,184 @@ class BeeswaxDAL(object):
     def masquerade(self, username=None, password=None, account_id=None):
         """
         Changes the user account_id
+        Missing credentials come from the (cached) credential provider, which is invalidated if they are rejected
         :type username: str
         :type password: str
         :type account_id: int
         :rtype: list|dict
         """
-        if not (username and password):
-            credentials = get_beeswax_credentials()
-            username = username or credentials['username']
-            password = password or credentials['password']
-
+        self._check_fork()
+        provider = None
         parameters = {'email': username, 'password': password}
+        if not (username and password):
+            provider = self.credential_provider or get_credential_provider()
+            credentials = provider.get_credentials()
+            parameters = {'email': username or credentials['username'], 'password': password or credentials['password']}
         if account_id:
             parameters['account_id'] = account_id
 
-        return self._call('POST', ['authenticate'], data=ujson.dumps(parameters))
+        with self._lock:
+            try:
+                result = self._call('POST', ['authenticate'], data=self.codec.dumps(parameters))
+            except BeeswaxAuthenticationException:
+                if provider is not None:
+                    provider.invalidate()
+                raise
+            self._auth_generation += 1
+            # provider credentials are not kept so refreshes pick up rotated credentials
+            self._auth_parameters = {'username': username, 'password': password, 'account_id': account_id}
+            self.username = parameters['email']
+            self.lifetime.issued([cookie.expires for cookie in self.cookies])
+        return result
+
+    @property
+    def authenticated(self):
+        """
+        :rtype: bool
+        :return: True once the DAL has authenticated
+        """
+        return self._auth_generation > 0
+
+    @property
+    def account_id(self):
+        """The account the session is masquerading as"""
+        return self._auth_parameters and self._auth_parameters['account_id']
+
+    def _reauthenticate(self, generation):
+        """Re-authenticates once for all threads that failed against the same session generation"""
+        with self._lock:
+            if generation == self._auth_generation:
+                self._refresh()
+                notify(self.metrics, 'on_reauthentication', REJECTED)
+
+    def _refresh_expiring(self):
+        """Refreshes an expiring session once, concurrent callers wait for the in-flight refresh"""
+        with self._lock:
+            if self.lifetime.expiring:
+                self._refresh()
+                notify(self.metrics, 'on_reauthentication', EXPIRING)
+
+    def _refresh(self):
+        """Authenticate again as the current user and account"""
+        if self._auth_parameters:
+            self.masquerade(**self._auth_parameters)
+        else:
+            self.authenticate()
+
+    def _guarded_call(self, call_func, method, paths, **kwargs):
+        """
+        call_func through the circuit breaker of the endpoint
+        only transport errors and transient responses count as failures, any other response shows the endpoint is up
+        """
+        if self.circuit_breakers is None:
+            return call_func(method, paths, **kwargs)
+
+        from requests import RequestException
+
+        breaker = self.circuit_breakers.get(paths)
+        breaker.before_call()
+        try:
+            result = call_func(method, paths, **kwargs)
+        except (RequestException, BeeswaxTransientException):
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
 
     def call(self, method, paths, **kwargs):
         """
         returns the results of an endpoint _call
-        auto authenticates if connections go stale
+        auto authenticates if the session is rejected and retries transient failures as per the retry_policy
         :rtype: requests.Response
         """
-        try:
-            return self._call(method, paths, **kwargs)
-        except (ConnectionError, BeeswaxRESTException):  # connection timed out or not authenticated
-            logging.warning(traceback.format_exc())
-            self.authenticate()
-            return self.call(method, paths, **kwargs)
+        if self.cache is None:
+            return self._coalesced_call(method, paths, **kwargs)
+
+        key = self.cache.key(method, paths, self.account_id, self.endpoint_url, self.username, **kwargs)
+        if key is not None:
+            hit, result = self.cache.get(key)
+            if hit:
+                return result
+
+        result = self._coalesced_call(method, paths, **kwargs)
+        if key is not None:
+            self.cache.set(key, result)
+        elif self.cache.invalidates(method, paths):
+            self.cache.invalidate(unicode(paths[0]))
+        return result
+
+    def _coalesced_call(self, method, paths, **kwargs):
+        """_call with retries, shared with any identical GET already in flight"""
+        key = self.single_flight.key(method, paths, self.account_id, **kwargs) if self.single_flight else None
+        if key is None:
+            return self._call_with_retries(self._call, method, paths, **kwargs)
+        return self.single_flight.do(key, self._call_with_retries, self._call, method, paths, **kwargs)
+
+    @staticmethod
+    def bulk_call(func, parameters, max_workers=8):
+        """
+        Calls func once per set of keyword parameters, collecting failures instead of aborting
+        :type func: callable
+        :type parameters: collections.Iterable[dict]
+        :param int max_workers: number of calls in flight at once
+        :rtype: BulkResult
+        """
+        batch = BeeswaxBatch(max_workers=max_workers)
+        batch.map(func, parameters)
+        return BulkResult(batch.run(), batch.errors)
+
+    @staticmethod
+    def pipeline_call(encode, upload, chunks, processes=None, upload_workers=4):
+        """
+        Encodes chunks in a process pool while a thread pool uploads the encoded bodies
+        :param callable encode: builds the body of a chunk, must be picklable
+        :param callable upload: sends a body
+        :type chunks: collections.Iterable[list]
+        :param int processes: encoding processes, None for the number of cores and 0 to encode in the calling thread
+        :param int upload_workers: concurrent uploads
+        :rtype: BulkResult
+        """
+        from beeswax_wrapper.core.pipeline import ProcessPipeline
+
+        return ProcessPipeline(encode, upload, processes=processes, upload_workers=upload_workers).run(chunks)
+
+    def iter_call(self, method, paths, **kwargs):
+        """
+        returns an iterator of the payload elements of an endpoint _call with bounded memory
+        the request is retried as per call, failures part way through the body are raised to the consumer
+        :param dict kwargs: chunk_size and requests keyword arguments
+        :rtype: collections.Iterator
+        """
+        return self._call_with_retries(self._stream_call, method, paths, **kwargs)
+
+    def _call_with_retries(self, call_func, method, paths, **kwargs):
+        from requests import RequestException  # deferred to first use for fast imports
+
+        attempt = 0
+        while True:
+            attempt += 1
+            generation = self._auth_generation
+            try:
+                if self.lifetime.expiring:
+                    self._refresh_expiring()
+                    generation = self._auth_generation
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(paths, self.account_id)
+                return self._guarded_call(call_func, method, paths, **kwargs)
+            except (RequestException, BeeswaxRESTException) as e:
+                classification = self.retry_policy.classify(e, method)
+                if not self.retry_policy.should_retry(classification, attempt):
+                    raise
+                logging.warning(traceback.format_exc())
+                notify(self.metrics, 'on_retry', method, endpoint_name(paths), classification)
+
+            if classification == AUTHENTICATION:
+                self._reauthenticate(generation)
+            else:
+                time.sleep(self.retry_policy.delay(attempt))
 
 
 def get_beeswax_dal():
@@ -117,58 +505,117 @@ def get_beeswax_dal():
     """
     global BEESWAX_DAL
     if BEESWAX_DAL is None:
-        BEESWAX_DAL = BeeswaxDAL(None)
+        with _BEESWAX_DAL_LOCK:
+            if BEESWAX_DAL is None:
+                BEESWAX_DAL = BeeswaxDAL(None)
     return BEESWAX_DAL
 
 
-def configure_endpoint(url):
-    get_beeswax_dal().endpoint_url = url
+def register_after_fork(component):
+    """
+    Call component._after_fork() in forked children along with the DALs (python 3.7+), for objects shared by DALs
+    that hold locks across calls, e.g. a DALPool
+    """
+    _FORK_COMPONENTS.add(component)
+
+
+def _after_fork():
+    """Rebuild every DAL in a forked child before it is used"""
+    global _BEESWAX_DAL_LOCK
+    _BEESWAX_DAL_LOCK = threading.Lock()
+    for dal in list(_DALS):
+        dal._after_fork()
+    for component in list(_FORK_COMPONENTS):
+        component._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):  # python 3.7+
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def configure_endpoint(url, **pool_options):
+    """
+    Configure the shared DAL
+    :type url: str
+    :param dict pool_options: pool_connections, pool_maxsize, pool_block, keep_alive, thread_local_sessions
+    """
+    dal = get_beeswax_dal()
+    dal.endpoint_url = url
+    if pool_options:
+        dal.configure_pool(**pool_options)
 
 
 class BeeswaxAPI(object):
-    """Beeswax API for communicating with the beeswax interface"""
+    """
+    Beeswax API for communicating with the beeswax interface
+    The endpoints (and their modules) are created on first access
+    """
 
-    def __init__(self, username=None, password=None):
-        self.dal = get_beeswax_dal()
+    accounts = LazyEndpoint('beeswax_wrapper.modules.account:Account')
 
-        self.accounts = account.Account(self.dal)
+    authentication = LazyEndpoint('beeswax_wrapper.modules.admin:Authentication')
+    passwords = LazyEndpoint('beeswax_wrapper.modules.admin:Password')
+    roles = LazyEndpoint('beeswax_wrapper.modules.admin:Role')
+    users = LazyEndpoint('beeswax_wrapper.modules.admin:User')
 
-        self.authentication = admin.Authentication(self.dal)
-        self.passwords = admin.Password(self.dal)
-        self.roles = admin.Role(self.dal)
-        self.users = admin.User(self.dal)
+    creatives = LazyEndpoint('beeswax_wrapper.modules.creatives:Creative')
 
-        self.creatives = creatives.Creative(self.dal)
+    bid_modifiers = LazyEndpoint('beeswax_wrapper.modules.extensions:BidModifier')
+    custom_lists = LazyEndpoint('beeswax_wrapper.modules.extensions:CustomList')
+    list_items = LazyEndpoint('beeswax_wrapper.modules.extensions:ListItem')
+    native_offers = LazyEndpoint('beeswax_wrapper.modules.extensions:NativeOffer')
+    push_queue = LazyEndpoint('beeswax_wrapper.modules.extensions:PushQueue')
+    reports = LazyEndpoint('beeswax_wrapper.modules.extensions:Report')
+    strategies = LazyEndpoint('beeswax_wrapper.modules.extensions:Strategy')
+    targeting_templates = LazyEndpoint('beeswax_wrapper.modules.extensions:TargetingTemplate')
+    vendors = LazyEndpoint('beeswax_wrapper.modules.extensions:Vendor')
+    misc = LazyEndpoint('beeswax_wrapper.modules.extensions:Misc')
 
-        self.bid_modifiers = extensions.BidModifier(self.dal)
-        self.custom_lists = extensions.CustomList(self.dal)
-        self.list_items = extensions.ListItem(self.dal)
-        self.native_offers = extensions.NativeOffer(self.dal)
-        self.push_queue = extensions.PushQueue(self.dal)
-        self.reports = extensions.Report(self.dal)
-        self.strategies = extensions.Strategy(self.dal)
-        self.targeting_templates = extensions.TargetingTemplate(self.dal)
-        self.vendors = extensions.Vendor(self.dal)
-        self.misc = extensions.Misc(self.dal)
+    activity_logs = LazyEndpoint('beeswax_wrapper.modules.monitoring:ActivityLog')
+    alerts = LazyEndpoint('beeswax_wrapper.modules.monitoring:Alert')
+    dashboards = LazyEndpoint('beeswax_wrapper.modules.monitoring:Dashboard')
 
-        self.activity_logs = monitoring.ActivityLog(self.dal)
-        self.alerts = monitoring.Alert(self.dal)
-        self.dashboards = monitoring.Dashboard(self.dal)
+    advertisers = LazyEndpoint('beeswax_wrapper.modules.operations:Advertiser')
+    campaigns = LazyEndpoint('beeswax_wrapper.modules.operations:Campaign')
+    events = LazyEndpoint('beeswax_wrapper.modules.operations:Event')
+    line_items = LazyEndpoint('beeswax_wrapper.modules.operations:LineItem')
 
-        self.advertisers = operations.Advertiser(self.dal)
-        self.campaigns = operations.Campaign(self.dal)
-        self.events = operations.Event(self.dal)
-        self.line_items = operations.LineItem(self.dal)
+    segments = LazyEndpoint('beeswax_wrapper.modules.segments:Segment')
+    segment_categories = LazyEndpoint('beeswax_wrapper.modules.segments:SegmentCategory')
 
-        self.segments = segments.Segment(self.dal)
-        self.segment_categories = segments.SegmentCategory(self.dal)
+    def __init__(self, username=None, password=None, dal=None):
+        self.dal = dal or get_beeswax_dal()
 
         if username or password:
             self.change_user(username, password)
 
+    @classmethod
+    def for_account(cls, account_id=None, username=None, password=None, pool=None):
+        """
+        An api bound to the pooled DAL of a user and account, other apis are not affected by its session
+        :param int account_id: the account to masquerade as, None for the user's own account
+        :param str username: None for the user of the credential provider
+        :type password: str
+        :param pool: the shared get_dal_pool() by default
+        :type pool: beeswax_wrapper.core.dal_pool.DALPool
+        :rtype: BeeswaxAPI
+        """
+        if pool is None:
+            from beeswax_wrapper.core.dal_pool import get_dal_pool
+            pool = get_dal_pool()
+        return cls(dal=pool.get(account_id=account_id, username=username, password=password))
+
     def change_user(self, username, password):
         """Change the sessions user cookies"""
         self.dal.authenticate(username, password)
 
     def masquerade(self, account_id=None):
         self.dal.masquerade(account_id=account_id)
+
+    @staticmethod
+    def batch(max_workers=8):
+        """
+        Run many api calls concurrently on the shared DAL
+        :rtype: BeeswaxBatch
+        """
+        return BeeswaxBatch(max_workers=max_workers)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Transport adapters for the beeswax DAL sessions
+"""
+from __future__ import unicode_literals
+
+import socket
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from beeswax_wrapper.core.tracing import CONNECT, SEND, WAIT, record
+
+
+# probe idle pooled connections so they are not silently dropped by load balancers between bursts
+KEEP_ALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _TracedConnectionMixin(object):
+    """Records the connect, send and wait phases of the current span (send includes connect on plain http)"""
+
+    def connect(self):
+        start = time.time()
+        super(_TracedConnectionMixin, self).connect()
+        record(CONNECT, start)
+
+    def request(self, *args, **kwargs):
+        start = time.time()
+        super(_TracedConnectionMixin, self).request(*args, **kwargs)
+        record(SEND, start)
+
+    def getresponse(self, *args, **kwargs):
+        start = time.time()
+        response = super(_TracedConnectionMixin, self).getresponse(*args, **kwargs)
+        record(WAIT, start)
+        return response
+
+
+class TracedHTTPConnection(_TracedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TracedHTTPSConnection(_TracedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TracedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracedHTTPSConnection
+
+
+class BeeswaxHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with configurable socket options for the pooled connections, which report their tracing phases"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['socket_options']
+
+    def __init__(self, socket_options=None, **kwargs):
+        """
+        :param list socket_options: passed to the urllib3 connection pools
+        :param dict kwargs: pool_connections, pool_maxsize, max_retries, pool_block
+        """
+        self.socket_options = socket_options
+        super(BeeswaxHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs['socket_options'] = self.socket_options
+        super(BeeswaxHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TracedHTTPConnectionPool,
+                                                   'https': TracedHTTPSConnectionPool}
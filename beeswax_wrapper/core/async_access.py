@@ -0,0 +1,758 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Asyncio access classes for the wrapper (python 3.5+ and aiohttp only)
+Usage:
+>>> import asyncio
+>>> from beeswax_wrapper.core.async_access import AsyncBeeswaxAPI
+>>> async def main():
+...     async with AsyncBeeswaxAPI() as api:
+...         return await asyncio.gather(*[api.campaigns.retrieve(campaign_id=i) for i in range(1, 100)])
+
+The api classes in beeswax_wrapper.modules are shared with the synchronous BeeswaxAPI.
+Calls made through an AsyncBeeswaxDAL return an awaitable AsyncResult instead of the decoded payload.
+"""
+import asyncio
+import collections
+import contextlib
+import copy
+import logging
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+from requests import ConnectionError, ConnectTimeout, ReadTimeout, RequestException
+from requests.exceptions import SSLError
+
+from beeswax_wrapper.core.access import BeeswaxAPI, get_beeswax_dal
+from beeswax_wrapper.core.batch import BulkResult
+from beeswax_wrapper.core.coalescing import SingleFlight
+from beeswax_wrapper.core.codecs import get_codec
+from beeswax_wrapper.core.compression import ACCEPT_ENCODING
+from beeswax_wrapper.core.exceptions import (
+    BeeswaxAuthenticationException, BeeswaxRESTException, BeeswaxTransientException, exception_from_status
+)
+from beeswax_wrapper.core.metrics import EXPIRING, REJECTED, endpoint_name, notify, request_size
+from beeswax_wrapper.core.pipeline import encoding_processes
+from beeswax_wrapper.core.retry import AUTHENTICATION, RetryPolicy
+from beeswax_wrapper.core.sessions import SessionLifetime, cookie_expiry
+from beeswax_wrapper.core.streaming import JSONArrayStream
+from beeswax_wrapper.core.tracing import CONNECT, DECODE, DOWNLOAD, SEND, WAIT, activate, current_span, phase, record
+from beeswax_wrapper.credentials.credential_manager import CallableCredentialProvider, get_credential_provider
+
+
+ASYNC_BEESWAX_DAL = None
+
+
+class AsyncResult(object):
+    """
+    Awaitable result of an AsyncBeeswaxDAL call
+    Supports item access before being awaited so module methods such as `self._call(...)[0]` work unchanged
+    The underlying request is scheduled at most once and shared between all derived results
+    """
+
+    def __init__(self, coroutine=None, parent=None, key=None):
+        self._coroutine = coroutine
+        self._parent = parent
+        self._key = key
+        self._future = None
+
+    def __getitem__(self, key):
+        return AsyncResult(parent=self, key=key)
+
+    def __await__(self):
+        return self._resolve().__await__()
+
+    def cancel(self):
+        """Cancel the underlying request, or discard it if it was never scheduled"""
+        if self._parent is not None:
+            return self._parent.cancel()
+        if self._future is None:
+            self._future = asyncio.get_event_loop().create_future()
+            self._future.cancel()
+            self._coroutine.close()
+        else:
+            self._future.cancel()
+
+    def _get_future(self):
+        if self._future is None:
+            self._future = asyncio.ensure_future(self._coroutine)
+        return self._future
+
+    async def _resolve(self):
+        try:
+            if self._parent is None:
+                return await asyncio.shield(self._get_future())
+            return (await self._parent)[self._key]
+        except BeeswaxRESTException:
+            raise
+        except Exception as e:
+            raise BeeswaxRESTException(e) from e
+
+
+async def _resolve_paths(paths):
+    """Await any AsyncResult path components (e.g. ids returned from a previous call)"""
+    resolved = []
+    for path in paths:
+        if isinstance(path, AsyncResult):
+            path = await path
+        resolved.append(str(path))
+    return resolved
+
+
+@contextlib.contextmanager
+def _transport_errors():
+    """Raise transport errors as their requests equivalents so the retry policy classifies them alike"""
+    try:
+        yield
+    except getattr(aiohttp, 'ConnectionTimeoutError', ()) as e:
+        raise ConnectTimeout(e)
+    except asyncio.TimeoutError as e:
+        raise ReadTimeout(e)
+    except aiohttp.ClientSSLError as e:
+        raise SSLError(e)
+    except aiohttp.ClientConnectorError as e:  # the connection could not be opened
+        error = ConnectionError(e)
+        error.request_sent = False
+        raise error
+    except aiohttp.ClientConnectionError as e:  # e.g. ServerDisconnectedError, the request may have been processed
+        raise ConnectionError(e)
+
+
+@contextlib.contextmanager
+def _form_data(files):
+    """Converts the requests style `files` argument to aiohttp form data, closing the file opened from a path"""
+    form = aiohttp.FormData()
+    if isinstance(files, dict):
+        for name, value in files.items():
+            form.add_field(name, value)
+        yield form
+    else:
+        with open(files, 'rb') as f:
+            form.add_field('file', f)
+            yield form
+
+
+def _trace_config():
+    """
+    aiohttp signals recording the connect, send and wait phases of the current span
+    :rtype: aiohttp.TraceConfig
+    """
+    async def on_request_start(session, context, params):
+        context.start = context.sent = time.time()
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_start = time.time()
+
+    async def on_connection_create_end(session, context, params):
+        record(CONNECT, context.connect_start)
+        context.start = time.time()
+
+    async def on_connection_reuseconn(session, context, params):
+        context.start = time.time()
+
+    async def on_request_sent(session, context, params):
+        context.sent = time.time()
+
+    async def on_request_end(session, context, params):  # the response headers were received
+        if current_span() is not None:
+            record(SEND, context.start, max(context.start, context.sent))
+            record(WAIT, max(context.start, context.sent))
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_connection_create_start.append(on_connection_create_start)
+    config.on_connection_create_end.append(on_connection_create_end)
+    config.on_connection_reuseconn.append(on_connection_reuseconn)
+    config.on_request_chunk_sent.append(on_request_sent)
+    if hasattr(config, 'on_request_headers_sent'):  # aiohttp 3.8+
+        config.on_request_headers_sent.append(on_request_sent)
+    config.on_request_end.append(on_request_end)
+    return config
+
+
+async def _in_span(span, coroutine):
+    """Run a call in the span of the api method that made it, finishing the span when the call completes"""
+    with activate(span):
+        try:
+            return await coroutine
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            span.finish()
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    Shares one in-flight call between the tasks requesting the same key
+    The call keeps running for the other waiters if the task that started it is cancelled
+    """
+
+    async def do(self, key, func, *args, **kwargs):
+        """
+        Await func, or the identical call already in flight
+        :type key: tuple
+        :param func: coroutine function
+        """
+        future = self._flights.get(key)
+        if future is not None:
+            return copy.deepcopy(await asyncio.shield(future))
+
+        future = self._flights[key] = asyncio.ensure_future(func(*args, **kwargs))
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future):
+        if self._flights.get(key) is future:
+            del self._flights[key]
+        if not future.cancelled():
+            future.exception()  # retrieved, even if every waiter was cancelled
+
+    def in_flight(self):
+        return len(self._flights)
+
+
+class AsyncBeeswaxDAL(object):
+    """
+    Asyncio DAL specific to beeswax
+    Creates an aiohttp session and authenticates it using the beeswax authentication endpoint
+    The session is bound to the event loop it is first used on.
+    """
+
+    def __init__(self, endpoint_url=None, limit=100, retry_policy=None, limit_per_host=0, keepalive_timeout=15,
+                 session_lifetime=None, refresh_margin=30.0, rate_limiter=None, circuit_breakers=None, cache=None,
+                 coalesce=True, compression=None, codec=None, credential_provider=None, metrics=None, tracer=None,
+                 profiler=None):
+        """
+        :type endpoint_url: str
+        :param int limit: maximum number of simultaneous connections
+        :type retry_policy: RetryPolicy
+        :param int limit_per_host: maximum number of simultaneous connections per host, 0 for no limit
+        :param float keepalive_timeout: seconds to keep idle connections open for reuse
+        :param float session_lifetime: seconds an authentication is valid for, enables refreshing before expiry
+        :param float refresh_margin: seconds before the authentication expires to refresh it
+        :type rate_limiter: beeswax_wrapper.core.rate_limit.RateLimiter
+        :type circuit_breakers: beeswax_wrapper.core.circuit_breaker.CircuitBreakers
+        :type cache: beeswax_wrapper.core.cache.ResponseCache
+        :param bool coalesce: share a single network call between identical concurrent GETs
+        :type compression: beeswax_wrapper.core.compression.RequestCompression
+        :param codec: json codec name ('ujson', 'orjson' or 'json') or beeswax_wrapper.core.codecs.JSONCodec
+        :param credential_provider: source of the credentials, the shared get_credential_provider() by default
+        :type credential_provider: beeswax_wrapper.credentials.credential_manager.CredentialProvider
+        :param metrics: receives the latency, size, status, retry and re-authentication of every call
+        :type metrics: beeswax_wrapper.core.metrics.MetricsCollector
+        :param tracer: opens a span for every api method call, with a child span per phase of the call
+        :type tracer: beeswax_wrapper.core.tracing.Tracer
+        :param profiler: profiles a sample of the api method calls until their AsyncResult is returned
+        :type profiler: beeswax_wrapper.core.profiling.Profiler
+        """
+        self._endpoint_url = endpoint_url
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.cache = cache
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.compression = compression
+        self.codec = get_codec(codec)
+        self.credential_provider = credential_provider
+        self.metrics = metrics
+        self.tracer = tracer
+        self.profiler = profiler
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session = None
+        self.lifetime = SessionLifetime(session_lifetime, refresh_margin)
+        self._auth_lock = None
+        self._auth_generation = 0
+        self._auth_parameters = None
+        self.username = None  # the authenticated user
+
+    @property
+    def endpoint_url(self):
+        """Falls back to the endpoint set by configure_endpoint"""
+        return self._endpoint_url or get_beeswax_dal().endpoint_url
+
+    @endpoint_url.setter
+    def endpoint_url(self, value):
+        self._endpoint_url = value
+
+    @property
+    def session(self):
+        """
+        Get or create an aiohttp ClientSession
+        :rtype: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                               keepalive_timeout=self.keepalive_timeout),
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                headers={'Accept-Encoding': ACCEPT_ENCODING},  # decoded incrementally by the response stream
+                trace_configs=[_trace_config()]
+            )
+        return self._session
+
+    @property
+    def auth_lock(self):
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, paths, **kwargs):
+        """
+        returns the http response of an endpoint request, the caller must release it
+        :rtype: aiohttp.ClientResponse
+        """
+        if self.endpoint_url is None:
+            raise RuntimeError('Must provide a valid endpoint_url as str|unicode')
+
+        url = self.endpoint_url + '/'.join(await _resolve_paths(paths))
+
+        if 'files' in kwargs:  # the body is sent by the time the response headers are returned
+            with _form_data(kwargs.pop('files')) as form, _transport_errors():
+                return await self.session.request(method.upper(), url, data=form, **kwargs)
+        if self.compression is not None:
+            kwargs = self.compression.prepare(kwargs)
+
+        with _transport_errors():
+            return await self.session.request(method.upper(), url, **kwargs)
+
+    def _decode(self, status_code, body):
+        """
+        returns the payload of an endpoint response, decoded from the body bytes by the codec
+        :type status_code: int
+        :type body: bytes
+        :rtype: list|dict
+        """
+        try:
+            response = self.codec.loads(body)
+        except ValueError:  # e.g. an html error page from a proxy
+            raise exception_from_status(status_code, body.decode('utf-8', 'replace'))
+
+        if isinstance(response, list):
+            return response
+
+        if not response['success']:
+            message = '\n'.join(response.get('errors', [response.get('message', '')]))
+            raise exception_from_status(status_code, message)
+
+        return response.get('payload')
+
+    async def _call(self, method, paths, **kwargs):
+        """
+        returns the results of an endpoint _call
+        :rtype: list|dict
+        """
+        started, request_bytes = time.time(), request_size(kwargs)
+        http_response = body = None
+        try:
+            http_response = await self._request(method, paths, **kwargs)
+            try:
+                with _transport_errors(), phase(DOWNLOAD):
+                    body = await http_response.read()
+            finally:
+                http_response.release()
+        finally:
+            await self._observe_response(method, paths, started, request_bytes, http_response, body)
+        with phase(DECODE):
+            return self._decode(http_response.status, body)
+
+    async def _stream_call(self, method, paths, chunk_size=65536, **kwargs):
+        """
+        returns an async iterator of the payload elements of an endpoint _call, decoded as the body is received
+        errors in the response status are raised before the iterator is returned
+        """
+        started, request_bytes = time.time(), request_size(kwargs)
+        http_response = None
+        try:
+            http_response = await self._request(method, paths, **kwargs)
+        finally:
+            await self._observe_response(method, paths, started, request_bytes, http_response)
+        if not http_response.ok:
+            try:
+                with _transport_errors():
+                    body = await http_response.read()
+            finally:
+                http_response.release()
+            self._decode(http_response.status, body)
+            raise exception_from_status(http_response.status, body.decode('utf-8', 'replace'))
+        return self._iter_payload(http_response, chunk_size, self.codec)
+
+    async def _observe_response(self, method, paths, started, request_bytes, http_response=None, body=None):
+        """Report a request to the metrics collector, streamed responses are reported before their body is read"""
+        if self.metrics is not None:
+            notify(self.metrics, 'on_response', method, endpoint_name(await _resolve_paths(paths)),
+                   http_response.status if http_response is not None else None, time.time() - started,
+                   request_bytes, len(body) if body is not None else None)
+
+    @staticmethod
+    async def _iter_payload(http_response, chunk_size, codec=None):
+        stream = JSONArrayStream(codec=codec)
+        try:
+            with _transport_errors():
+                async for chunk in http_response.content.iter_chunked(chunk_size):
+                    for item in stream.feed(chunk):
+                        yield item
+            stream.close()
+        except BeeswaxRESTException:
+            raise
+        except Exception as e:
+            raise BeeswaxRESTException(e) from e
+        finally:
+            http_response.release()
+
+        if stream.envelope.get('success') is False:
+            message = '\n'.join(stream.envelope.get('errors', [stream.envelope.get('message', '')]))
+            raise exception_from_status(http_response.status, message)
+
+    async def authenticate(self, username=None, password=None):
+        """
+        Authenticates the user credentials provided
+        :type username: str
+        :type password: str
+        :rtype: list|dict
+        """
+        return await self.masquerade(username, password)
+
+    async def masquerade(self, username=None, password=None, account_id=None):
+        """
+        Changes the user account_id
+        :type username: str
+        :type password: str
+        :type account_id: int
+        :rtype: list|dict
+        """
+        provider = None
+        parameters = {'email': username, 'password': password}
+        if not (username and password):
+            provider = self.credential_provider or get_credential_provider()
+            if provider.cached:
+                credentials = provider.get_credentials()
+            else:  # credential sources (e.g. keyring backends) block, keep them off the event loop
+                credentials = await asyncio.get_event_loop().run_in_executor(None, provider.get_credentials)
+            parameters = {'email': username or credentials['username'], 'password': password or credentials['password']}
+        if account_id:
+            parameters['account_id'] = account_id
+
+        try:
+            result = await self._call('POST', ['authenticate'], data=self.codec.dumps(parameters))
+        except BeeswaxAuthenticationException:
+            if provider is not None:
+                provider.invalidate()
+            raise
+        self._auth_generation += 1
+        # provider credentials are not kept so refreshes pick up rotated credentials
+        self._auth_parameters = {'username': username, 'password': password, 'account_id': account_id}
+        self.username = parameters['email']
+        self.lifetime.issued([cookie_expiry(morsel) for morsel in self.session.cookie_jar])
+        return result
+
+    @property
+    def account_id(self):
+        """The account the session is masquerading as"""
+        return self._auth_parameters and self._auth_parameters['account_id']
+
+    async def _reauthenticate(self, generation):
+        """Re-authenticates once for all callers that failed against the same session generation"""
+        async with self.auth_lock:
+            if generation == self._auth_generation:
+                await self._refresh()
+                notify(self.metrics, 'on_reauthentication', REJECTED)
+
+    async def _refresh_expiring(self):
+        """Refreshes an expiring session once, concurrent callers wait for the in-flight refresh"""
+        async with self.auth_lock:
+            if self.lifetime.expiring:
+                await self._refresh()
+                notify(self.metrics, 'on_reauthentication', EXPIRING)
+
+    async def _refresh(self):
+        """Authenticate again as the current user and account"""
+        if self._auth_parameters:
+            await self.masquerade(**self._auth_parameters)
+        else:
+            await self.authenticate()
+
+    async def _guarded_call(self, call_func, method, paths, **kwargs):
+        """
+        call_func through the circuit breaker of the endpoint
+        only transport errors and transient responses count as failures, any other response shows the endpoint is up
+        """
+        if self.circuit_breakers is None:
+            return await call_func(method, paths, **kwargs)
+
+        breaker = self.circuit_breakers.get(await _resolve_paths(paths))
+        breaker.before_call()
+        try:
+            result = await call_func(method, paths, **kwargs)
+        except (RequestException, BeeswaxTransientException, asyncio.CancelledError):
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _call_with_retries(self, call_func, method, paths, **kwargs):
+        attempt = 0
+        while True:
+            attempt += 1
+            generation = self._auth_generation
+            try:
+                if self.lifetime.expiring:
+                    await self._refresh_expiring()
+                    generation = self._auth_generation
+                if self.rate_limiter is not None:
+                    await asyncio.sleep(self.rate_limiter.reserve(await _resolve_paths(paths), self.account_id))
+                return await self._guarded_call(call_func, method, paths, **kwargs)
+            except (RequestException, BeeswaxRESTException) as e:
+                classification = self.retry_policy.classify(e, method)
+                if not self.retry_policy.should_retry(classification, attempt):
+                    raise
+                logging.warning(traceback.format_exc())
+                if self.metrics is not None:
+                    notify(self.metrics, 'on_retry', method, endpoint_name(await _resolve_paths(paths)), classification)
+
+            if classification == AUTHENTICATION:
+                await self._reauthenticate(generation)
+            else:
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+
+    def call(self, method, paths, **kwargs):
+        """
+        returns an awaitable for the results of an endpoint _call
+        auto authenticates if the session is rejected and retries transient failures as per the retry_policy
+        :rtype: AsyncResult
+        """
+        if self.cache is None:
+            coroutine = self._coalesced_call(method, paths, **kwargs)
+        else:
+            coroutine = self._cached_call(method, paths, **kwargs)
+
+        span = current_span()  # the span of the api method, which runs when the result is awaited
+        return AsyncResult(coroutine if span is None else _in_span(span, coroutine))
+
+    async def _cached_call(self, method, paths, **kwargs):
+        key = self.cache.key(method, paths, self.account_id, self.endpoint_url, self.username, **kwargs)
+        if key is not None:
+            hit, result = self.cache.get(key)
+            if hit:
+                return result
+
+        result = await self._coalesced_call(method, paths, **kwargs)
+        if key is not None:
+            self.cache.set(key, result)
+        elif self.cache.invalidates(method, paths):
+            self.cache.invalidate(str(paths[0]))
+        return result
+
+    async def _coalesced_call(self, method, paths, **kwargs):
+        """_call with retries, shared with any identical GET already in flight"""
+        key = self.single_flight.key(method, paths, self.account_id, **kwargs) if self.single_flight else None
+        if key is None:
+            return await self._call_with_retries(self._call, method, paths, **kwargs)
+        return await self.single_flight.do(key, self._call_with_retries, self._call, method, paths, **kwargs)
+
+    def bulk_call(self, func, parameters, max_workers=8):
+        """
+        returns an awaitable for calling func once per set of keyword parameters, collecting failures
+        :type func: callable
+        :type parameters: collections.Iterable[dict]
+        :param int max_workers: number of calls in flight at once
+        :rtype: AsyncResult
+        """
+        return AsyncResult(self._bulk_call(func, parameters, max_workers))
+
+    @staticmethod
+    async def _bulk_call(func, parameters, max_workers):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(kwargs):
+            async with semaphore:
+                return await func(**kwargs)
+
+        results = await asyncio.gather(*[call(kwargs) for kwargs in parameters], return_exceptions=True)
+        errors = {index: result for index, result in enumerate(results) if isinstance(result, BaseException)}
+        return BulkResult(results, errors)
+
+    def pipeline_call(self, encode, upload, chunks, processes=None, upload_workers=4):
+        """
+        returns an awaitable for encoding chunks in a process pool while their bodies are uploaded on the event loop
+        :param callable encode: builds the body of a chunk, must be picklable
+        :param callable upload: returns an awaitable sending a body
+        :type chunks: collections.Iterable[list]
+        :param int processes: encoding processes, None for the number of cores and 0 to encode on the event loop
+        :param int upload_workers: concurrent uploads
+        :rtype: AsyncResult
+        """
+        return AsyncResult(self._pipeline_call(encode, upload, chunks, processes, upload_workers))
+
+    @staticmethod
+    async def _pipeline_call(encode, upload, chunks, processes, upload_workers):
+        processes = encoding_processes(processes)
+        process_pool = ProcessPoolExecutor(max_workers=processes) if processes != 0 else None
+        max_pending = 2 * max(upload_workers, processes, 1)
+        semaphore = asyncio.Semaphore(upload_workers)
+        results, errors = {}, {}
+        pending = set()
+        count = 0
+
+        async def stage(index, chunk):
+            try:
+                if process_pool is None:
+                    body = encode(chunk)
+                else:
+                    body = await asyncio.get_event_loop().run_in_executor(process_pool, encode, chunk)
+                async with semaphore:
+                    results[index] = await upload(body)
+            except Exception as e:
+                errors[index] = e
+
+        try:
+            for index, chunk in enumerate(chunks):
+                count = index + 1
+                pending.add(asyncio.ensure_future(stage(index, chunk)))
+                if len(pending) >= max_pending:  # bounds the chunks held in memory
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            for future in pending:
+                future.cancel()
+            if process_pool is not None:  # waits for the encoding processes to exit, off the event loop
+                await asyncio.get_event_loop().run_in_executor(None, process_pool.shutdown)
+
+        return BulkResult([errors[index] if index in errors else results[index] for index in range(count)], errors)
+
+    def iter_call(self, method, paths, **kwargs):
+        """
+        returns an async iterator of the payload elements of an endpoint _call with bounded memory
+        the request is retried as per call, failures part way through the body are raised to the consumer
+        :param dict kwargs: chunk_size and aiohttp keyword arguments
+        """
+        return self._iter_call_with_retries(method, paths, **kwargs)
+
+    async def _iter_call_with_retries(self, method, paths, **kwargs):
+        try:
+            iterator = await self._call_with_retries(self._stream_call, method, paths, **kwargs)
+        except BeeswaxRESTException:
+            raise
+        except Exception as e:
+            raise BeeswaxRESTException(e) from e
+
+        async for item in iterator:
+            yield item
+
+
+async def iter_pages(paginator):
+    """
+    Async iteration of a Paginator, the read ahead pages are requested concurrently on the event loop
+    :type paginator: beeswax_wrapper.core.pagination.Paginator
+    """
+    pending = collections.deque()
+    next_page = 0
+    try:
+        while True:
+            while len(pending) <= paginator.read_ahead:
+                result = paginator.list_func(**paginator.page_parameters(next_page))
+                pending.append((result, asyncio.ensure_future(result)))
+                next_page += 1
+
+            page = await pending.popleft()[1]
+            for item in page:
+                yield item
+
+            if len(page) < paginator.page_size:  # the last page
+                break
+    finally:
+        for result, future in pending:
+            future.cancel()
+            if isinstance(result, AsyncResult):
+                result.cancel()
+
+
+def get_async_beeswax_dal():
+    """
+    'Singleton' asyncio beeswax DAL.
+    All asyncio beeswax API's share the same DAL connection per process
+    """
+    global ASYNC_BEESWAX_DAL
+    if ASYNC_BEESWAX_DAL is None:
+        ASYNC_BEESWAX_DAL = AsyncBeeswaxDAL()
+    return ASYNC_BEESWAX_DAL
+
+
+def _user_credentials(username, password):
+    """
+    :rtype: dict
+    :return: the given credentials, completed by the shared credential provider
+    """
+    if username and password:
+        return {'username': username, 'password': password}
+    credentials = get_credential_provider().get_credentials()
+    return {'username': username or credentials['username'], 'password': password or credentials['password']}
+
+
+class AsyncBeeswaxAPI(BeeswaxAPI):
+    """
+    Asyncio Beeswax API for communicating with the beeswax interface
+    Has the same `api.<object>.<restful_method>` structure as BeeswaxAPI but every method returns an awaitable
+    """
+
+    def __init__(self, username=None, password=None, dal=None):
+        """
+        Authentication is awaited, so the credentials of the user are given to a new AsyncBeeswaxDAL,
+        which authenticates when its session is first rejected
+        :param str username: None for the shared DAL, or the user of the credential provider if a password is given
+        :param str password: None for the shared DAL, or the password of the credential provider if a username is given
+        :param dal: the shared get_async_beeswax_dal() by default, await api.change_user(...) to authenticate it
+        :type dal: AsyncBeeswaxDAL
+        """
+        if username or password:
+            if dal is not None:
+                raise TypeError('AsyncBeeswaxAPI cannot authenticate the given dal on creation, '
+                                'await api.change_user(username, password) instead')
+            dal = AsyncBeeswaxDAL(credential_provider=CallableCredentialProvider(
+                lambda: _user_credentials(username, password)))
+        super(AsyncBeeswaxAPI, self).__init__(dal=dal or get_async_beeswax_dal())
+
+    @classmethod
+    def for_account(cls, account_id=None, username=None, password=None, pool=None):
+        """
+        Not available: the DAL pool holds blocking BeeswaxDALs
+        Create an AsyncBeeswaxAPI with its own AsyncBeeswaxDAL per account and await api.masquerade(account_id)
+        :raises TypeError: always
+        """
+        raise TypeError('AsyncBeeswaxAPI.for_account is not available, create an AsyncBeeswaxAPI '
+                        'with its own AsyncBeeswaxDAL and await api.masquerade(account_id)')
+
+    @staticmethod
+    def batch(max_workers=8):
+        """
+        Not available: the batch runs blocking calls on a thread pool
+        Await the calls together with asyncio.gather(...) instead
+        :raises TypeError: always
+        """
+        raise TypeError('AsyncBeeswaxAPI.batch is not available, await the calls with asyncio.gather instead')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.dal.close()
+
+    async def change_user(self, username, password):
+        """Change the sessions user cookies"""
+        await self.dal.authenticate(username, password)
+
+    async def masquerade(self, account_id=None):
+        await self.dal.masquerade(account_id=account_id)
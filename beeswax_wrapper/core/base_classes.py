@@ -7,9 +7,15 @@ Components in this module should not be used but built upon
 from __future__ import unicode_literals
 
 import sys
+from importlib import import_module
 from abc import ABCMeta, abstractproperty
+from inspect import CO_VARKEYWORDS
 
 from beeswax_wrapper.core.exceptions import BeeswaxRESTException
+from beeswax_wrapper.core.metrics import endpoint_name
+from beeswax_wrapper.core.pagination import Paginator
+from beeswax_wrapper.core.profiling import Profiler
+from beeswax_wrapper.core.tracing import Tracer, activate, record_serialize
 
 try:
     from boltons.funcutils import wraps
@@ -22,24 +28,131 @@ from six import with_metaclass, reraise
 class BeeswaxABCMeta(ABCMeta):
 
     def __new__(mcs, name, bases, attrs):
-        """Wrap methods in BeeswaxRestException raising"""
+        """
+        Wrap methods in BeeswaxRestException raising, profiling and tracing, list endpoints get a streaming iter_list
+        create, update and delete get a bulk_<method> counterpart
+        """
+        for method in ('create', 'update', 'delete'):
+            if callable(attrs.get(method)) and 'bulk_' + method not in attrs:
+                attrs['bulk_' + method] = _bulk(method)
+        if callable(attrs.get('list')) and 'iter_list' not in attrs:
+            attrs['iter_list'] = _iter_list
+        if callable(attrs.get('list')) and attrs['list'].__code__.co_flags & CO_VARKEYWORDS \
+                and 'paginate' not in attrs:
+            attrs['paginate'] = _paginate
+
         for attr, pos_func in attrs.items():
 
             if callable(pos_func) and attr in {'retrieve', 'create', 'list', 'update', 'delete'}:
-                attrs[attr] = BeeswaxABCMeta.wrap_errors(pos_func)
+                attrs[attr] = BeeswaxABCMeta.wrap_errors(BeeswaxABCMeta.wrap_span(pos_func))
+
+            if callable(pos_func) and attr == 'iter_list':
+                attrs[attr] = BeeswaxABCMeta.wrap_iterator_errors(pos_func)
 
         return super(BeeswaxABCMeta, mcs).__new__(mcs, name, bases, attrs)
 
     @staticmethod
     def wrap_errors(func):
+        """Calls made through a DAL with a profiler are sampled for profiling"""
         @wraps(func)
-        def new_func(*args, **kwargs):
+        def new_func(self, *args, **kwargs):
             try:
-                return func(*args, **kwargs)
+                profiler = getattr(self._dal, 'profiler', None)
+                if isinstance(profiler, Profiler) and profiler.sampled():
+                    return profiler.profile(endpoint_name(self.paths), func, self, *args, **kwargs)
+                return func(self, *args, **kwargs)
+            except BeeswaxRESTException:  # keeps its type e.g. BeeswaxCircuitOpenException
+                raise
             except Exception as e:
                 reraise(BeeswaxRESTException, BeeswaxRESTException(e), sys.exc_info()[2])
         return new_func
 
+    @staticmethod
+    def wrap_span(func):
+        """Calls made through a DAL with a tracer open a span tagged with the endpoint and object id"""
+        code = func.__code__
+        id_parameter = code.co_varnames[1] if code.co_argcount > 1 and code.co_varnames[1].endswith('_id') else None
+
+        @wraps(func)
+        def new_func(self, *args, **kwargs):
+            tracer = getattr(self._dal, 'tracer', None)
+            if not isinstance(tracer, Tracer):
+                return func(self, *args, **kwargs)
+
+            object_id = args[0] if args and id_parameter else kwargs.get(id_parameter)
+            span = tracer.start_span('{}.{}'.format(type(self).__name__, func.__name__),
+                                     endpoint=endpoint_name(self.paths), object_id=object_id)
+            with activate(span):
+                try:
+                    result = func(self, *args, **kwargs)
+                except Exception as e:
+                    span.fail(e)
+                    span.finish()
+                    raise
+            if not hasattr(result, '__await__'):  # the async DAL finishes the span when the call completes
+                span.finish()
+            return result
+        return new_func
+
+    @staticmethod
+    def wrap_iterator_errors(func):
+        """Also wraps errors raised while iterating (async iterators are wrapped by their DAL)"""
+        func = BeeswaxABCMeta.wrap_errors(func)
+
+        def iterate(iterator):
+            try:
+                for item in iterator:
+                    yield item
+            except BeeswaxRESTException:
+                raise
+            except Exception as e:
+                reraise(BeeswaxRESTException, BeeswaxRESTException(e), sys.exc_info()[2])
+
+        @wraps(func)
+        def new_func(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            return iterator if hasattr(iterator, '__aiter__') else iterate(iterator)
+        return new_func
+
+
+def _iter_list(self, **kwargs):
+    """
+    Streaming list, yields the objects one at a time as the response is received so memory use is bounded
+    :param dict kwargs: the list keywords of the endpoint
+    """
+    return self._iter_call('GET', data=self._dumps(kwargs))
+
+
+def _paginate(self, page_size=500, read_ahead=2, **kwargs):
+    """
+    Iterate every object of the endpoint, requesting the next pages while the current page is consumed
+    :param int page_size: objects requested per page
+    :param int read_ahead: pages requested ahead of the page being consumed
+    :param dict kwargs: the list keywords of the endpoint
+    :rtype: Paginator
+    """
+    return Paginator(self.list, page_size=page_size, read_ahead=read_ahead, **kwargs)
+
+
+def _bulk(method):
+    """
+    :param str method: the write method to call once per set of parameters
+    :return: the bulk_<method> function
+    """
+    def bulk(self, parameters, max_workers=8):
+        """
+        Calls {method} once per set of keyword parameters with at most max_workers calls in flight
+        Failed calls do not abort the others
+        :type parameters: collections.Iterable[dict]
+        :param int max_workers: number of calls in flight at once
+        :rtype: beeswax_wrapper.core.batch.BulkResult
+        """
+        return self._dal.bulk_call(getattr(self, method), parameters, max_workers=max_workers)
+
+    bulk.__name__ = str('bulk_' + method)
+    bulk.__doc__ = bulk.__doc__.format(method=method)
+    return bulk
+
 
 class BaseAPI(with_metaclass(BeeswaxABCMeta, object)):
     """Base API class for attribute API structures"""
@@ -54,6 +167,65 @@ class BaseAPI(with_metaclass(BeeswaxABCMeta, object)):
     def paths(self):
         pass
 
+    def _dumps(self, parameters):
+        """
+        Request body of the parameters, encoded by the DAL's codec
+        :type parameters: dict
+        :rtype: bytes
+        """
+        return self._dal.codec.dumps(parameters)
+
     def _call(self, method, **kwargs):
         """Call to the DAL"""
+        record_serialize()
         return self._dal.call(method, self.paths, **kwargs)
+
+    def _iter_call(self, method, **kwargs):
+        """Streaming call to the DAL"""
+        return self._dal.iter_call(method, self.paths, **kwargs)
+
+
+class LazyEndpoint(object):
+    """
+    Api class attribute created on first access and then cached on the instance
+    Usage:
+    >>> class Segment(BaseAPI):
+    ...     tags = LazyEndpoint('SegmentTag')
+    """
+
+    def __init__(self, api_class):
+        """
+        :param api_class: a BaseAPI subclass, its 'module:Class' path to import on first access,
+            or its class name in the module of the owning class
+        """
+        self.api_class = api_class
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _attribute_name(self, owner):
+        """The name of the descriptor on its class (python2 has no __set_name__)"""
+        if self.name is None:
+            for cls in owner.__mro__:
+                for name, value in vars(cls).items():
+                    if value is self:
+                        self.name = name
+        return self.name
+
+    def resolve(self, owner):
+        """
+        :type owner: type
+        :rtype: type
+        """
+        if not isinstance(self.api_class, type):
+            module_name, _, class_name = self.api_class.rpartition(':')
+            self.api_class = getattr(import_module(module_name or owner.__module__), class_name)
+        return self.api_class
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        dal = instance._dal if isinstance(instance, BaseAPI) else instance.dal
+        # setdefault keeps the first endpoint if threads race on the first access
+        return instance.__dict__.setdefault(self._attribute_name(owner), self.resolve(owner)(dal))
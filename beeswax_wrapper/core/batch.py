@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Concurrent execution of many api calls on a shared DAL
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> api = BeeswaxAPI()
+>>> with api.batch(max_workers=32) as batch:
+...     for line_item_id in range(1, 5000):
+...         batch.add(api.line_items.update, line_item_id=line_item_id, active=False)
+>>> batch.results  # in the order the calls were added, failed calls hold their exception
+>>> batch.errors  # {index: exception}
+
+>>> result = api.line_items.bulk_update([{'line_item_id': i, 'active': False} for i in range(1, 5000)])
+>>> result.succeeded  # {index: result}
+>>> result.failed  # {index: exception}
+"""
+from __future__ import unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BeeswaxBatch(object):
+    """Runs queued api calls concurrently, collecting per-call exceptions instead of aborting"""
+
+    def __init__(self, max_workers=8):
+        """
+        :param int max_workers: number of calls in flight at once
+        """
+        self.max_workers = max_workers
+        self._calls = []
+        self.results = []
+        self.errors = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.run()
+
+    def add(self, func, *args, **kwargs):
+        """
+        Queue a call e.g. batch.add(api.line_items.update, line_item_id=62, active=False)
+        :rtype: int
+        :return: the index of the call's result
+        """
+        self._calls.append((func, args, kwargs))
+        return len(self._calls) - 1
+
+    def map(self, func, parameters):
+        """
+        Queue one call per set of keyword parameters
+        :type parameters: collections.Iterable[dict]
+        """
+        for kwargs in parameters:
+            self.add(func, **kwargs)
+
+    def run(self):
+        """
+        Runs the queued calls and clears the queue
+        :rtype: list
+        :return: results in the order the calls were added, failed calls hold their exception
+        """
+        calls, self._calls = self._calls, []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(func, *args, **kwargs) for func, args, kwargs in calls]
+
+        self.results, self.errors = [], {}
+        for index, future in enumerate(futures):
+            error = future.exception()
+            if error is not None:
+                self.errors[index] = error
+            self.results.append(error if error is not None else future.result())
+        return self.results
+
+
+class BulkResult(object):
+    """Outcome of a bulk write, successes and failures by the index of their parameters"""
+
+    def __init__(self, results, errors):
+        """
+        :param list results: in the order of the parameters, failed calls hold their exception
+        :param dict errors: {index: exception}
+        """
+        self.results = results
+        self.failed = errors
+        self.succeeded = dict((index, result) for index, result in enumerate(results) if index not in errors)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __bool__(self):
+        return not self.failed
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return '<BulkResult succeeded={} failed={}>'.format(len(self.succeeded), len(self.failed))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Response caching for the beeswax DALs
+Only GET calls to endpoints with a ttl are cached, successful writes to an endpoint invalidate its entries.
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.cache import ResponseCache, SQLiteResponseCache
+>>> from beeswax_wrapper.modules.extensions import Strategy
+>>> get_beeswax_dal().cache = ResponseCache(ttls={Strategy: 3600, 'vendor': 3600, 'segment_lookup': 300})
+>>> get_beeswax_dal().cache.stats()
+{'hits': 10, 'misses': 2, 'evictions': 0, 'entries': 2, 'bytes': 1532}
+
+>>> # shared by every process on the host and kept across restarts
+>>> get_beeswax_dal().cache = SQLiteResponseCache('/var/tmp/beeswax_cache.db', ttls={Strategy: 3600})
+"""
+from __future__ import unicode_literals
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import ujson
+from collections import OrderedDict
+
+
+class BaseResponseCache(object):
+    """Cache keys and ttls shared by the cache backends"""
+
+    def __init__(self, ttls=None, default_ttl=None):
+        """
+        :param dict ttls: {endpoint path or api class: seconds} e.g. {'strategy': 3600} or {Strategy: 3600}
+        :param float default_ttl: seconds for endpoints not in ttls, None to only cache the endpoints in ttls
+        """
+        self.ttls = dict((endpoint.paths[0] if isinstance(endpoint, type) else endpoint, ttl)
+                         for endpoint, ttl in (ttls or {}).items())
+        self.default_ttl = default_ttl
+
+    def ttl(self, endpoint):
+        """
+        :type endpoint: str
+        :rtype: float
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def key(self, method, paths, account_id=None, endpoint_url=None, username=None, **kwargs):
+        """
+        Cache key for a call, keyword arguments are canonicalized so the order of the parameters does not matter
+        The endpoint url and user are part of the key as a cache may be shared by DALs of other environments and users
+        :type method: str
+        :type paths: list
+        :type account_id: int
+        :type endpoint_url: str
+        :param str username: the authenticated user
+        :rtype: tuple|None
+        :return: None if the call is not cacheable
+        """
+        if method.upper() != 'GET' or not paths or not self.ttl(str(paths[0])) or set(kwargs) - {'data'}:
+            return None
+        data = kwargs.get('data')
+        if isinstance(data, bytes):  # bodies encoded by the DAL's codec
+            data = data.decode('utf-8')
+        if data:
+            data = ujson.dumps(ujson.loads(data), sort_keys=True)
+        return str(paths[0]), tuple(str(path) for path in paths[1:]), endpoint_url, username, account_id, data
+
+    @staticmethod
+    def invalidates(method, paths):
+        """
+        :type method: str
+        :type paths: list
+        :rtype: bool
+        :return: True if the successful call changes the endpoint
+        """
+        return method.upper() not in {'GET', 'HEAD', 'OPTIONS'} and bool(paths)
+
+    def get(self, key):
+        """
+        :type key: tuple
+        :rtype: (bool, object)
+        :return: whether the key was a hit and the cached value
+        """
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """
+        :type key: tuple
+        :type value: list|dict
+        """
+        raise NotImplementedError
+
+    def invalidate(self, endpoint=None):
+        """
+        Remove the cached responses of an endpoint, or of every endpoint
+        :type endpoint: str
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+
+class ResponseCache(BaseResponseCache):
+    """
+    In memory TTL cache with a least recently used bound on entries and size
+    Values are stored serialized so callers can not modify cached objects
+    """
+
+    def __init__(self, ttls=None, default_ttl=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        :param dict ttls: {endpoint path or api class: seconds} e.g. {'strategy': 3600} or {Strategy: 3600}
+        :param float default_ttl: seconds for endpoints not in ttls, None to only cache the endpoints in ttls
+        :param int max_entries: maximum number of cached responses
+        :param int max_bytes: maximum total size of the cached (serialized) responses
+        """
+        super(ResponseCache, self).__init__(ttls, default_ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key: (expires_at, serialized value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries[key] = self._entries.pop(key)  # most recently used
+                self.hits += 1
+                return True, ujson.loads(entry[1])
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        serialized = ujson.dumps(value)
+        if len(serialized) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + self.ttl(key[0]), serialized)
+            self._bytes += len(serialized)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self._bytes -= len(self._entries.pop(key)[1])
+
+    def invalidate(self, endpoint=None):
+        with self._lock:
+            for key in [key for key in self._entries if endpoint is None or key[0] == endpoint]:
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self._bytes}
+
+
+class SQLiteResponseCache(BaseResponseCache):
+    """
+    TTL cache in a local SQLite file shared by every process (and thread) using the same path
+    Uses write ahead logging so readers do not block each other or the writer.
+    Cache errors (e.g. a locked or unwritable file) are logged and treated as misses.
+    """
+
+    purge_interval = 100  # sets between removals of expired entries
+
+    def __init__(self, path, ttls=None, default_ttl=None, timeout=10.0):
+        """
+        :param str path: the SQLite database file, created if it does not exist
+        :param dict ttls: {endpoint path or api class: seconds} e.g. {'strategy': 3600} or {Strategy: 3600}
+        :param float default_ttl: seconds for endpoints not in ttls, None to only cache the endpoints in ttls
+        :param float timeout: seconds to wait for another process's write lock
+        """
+        super(SQLiteResponseCache, self).__init__(ttls, default_ttl)
+        self.path = path
+        self.timeout = timeout
+        self.hits = self.misses = 0
+        self._sets = 0
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """
+        One connection per thread and process (connections must not be shared across a fork)
+        :rtype: sqlite3.Connection
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS responses '
+                               '(key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, expires_at REAL NOT NULL, value TEXT)')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_endpoint ON responses (endpoint)')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+
+    @staticmethod
+    def _serialize_key(key):
+        return ujson.dumps(key)
+
+    def get(self, key):
+        try:
+            row = self.connection.execute('SELECT value FROM responses WHERE key = ? AND expires_at > ?',
+                                          (self._serialize_key(key), time.time())).fetchone()
+        except sqlite3.Error:
+            logging.warning('Beeswax cache read failed', exc_info=True)
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, ujson.loads(row[0])
+
+    def set(self, key, value):
+        try:
+            self.connection.execute('INSERT OR REPLACE INTO responses (key, endpoint, expires_at, value) '
+                                    'VALUES (?, ?, ?, ?)',
+                                    (self._serialize_key(key), key[0], time.time() + self.ttl(key[0]),
+                                     ujson.dumps(value)))
+            self._sets += 1
+            if self._sets % self.purge_interval == 0:
+                self.connection.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+        except sqlite3.Error:
+            logging.warning('Beeswax cache write failed', exc_info=True)
+
+    def invalidate(self, endpoint=None):
+        try:
+            if endpoint is None:
+                self.connection.execute('DELETE FROM responses')
+            else:
+                self.connection.execute('DELETE FROM responses WHERE endpoint = ?', (endpoint,))
+        except sqlite3.Error:
+            logging.warning('Beeswax cache invalidation failed', exc_info=True)
+
+    def stats(self):
+        entries, size = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses '
+                                                'WHERE expires_at > ?', (time.time(),)).fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
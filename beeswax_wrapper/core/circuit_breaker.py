@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Circuit breakers per beeswax endpoint
+A breaker opens when the recent failure rate of an endpoint passes a threshold, calls then fail fast
+with a BeeswaxCircuitOpenException until probe requests show the endpoint has recovered.
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.circuit_breaker import CircuitBreakers
+>>> get_beeswax_dal().circuit_breakers = CircuitBreakers(failure_rate=0.5, open_duration=30)
+>>> get_beeswax_dal().circuit_breakers.states()
+{'report_queue': 'open', 'line_item': 'closed'}
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+from collections import deque
+
+from beeswax_wrapper.core.exceptions import BeeswaxCircuitOpenException
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker(object):
+    """Rolling window failure rate breaker for a single endpoint"""
+
+    def __init__(self, name, failure_rate=0.5, minimum_calls=10, window=20, open_duration=30.0,
+                 half_open_probes=1, on_state_change=None):
+        """
+        :param str name: the endpoint the breaker guards
+        :param float failure_rate: fraction of failed calls in the window that opens the breaker
+        :param int minimum_calls: calls needed in the window before the failure rate is considered
+        :param int window: number of recent calls the failure rate is measured over
+        :param float open_duration: seconds to fail fast before allowing probe requests
+        :param int half_open_probes: concurrent probe requests allowed, all must succeed to close the breaker
+        :param callable on_state_change: called with (name, old_state, new_state)
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.on_state_change = on_state_change
+        self._results = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.RLock()
+
+    def _current_state(self):
+        if self._state == OPEN and time.time() - self._opened_at >= self.open_duration:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        old_state, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = time.time()
+            logging.warning('Circuit breaker opened for %s', self.name)
+        self._results.clear()
+        self._probes = self._probe_successes = 0
+        if self.on_state_change is not None:
+            self.on_state_change(self.name, old_state, state)
+
+    def before_call(self):
+        """
+        :raises BeeswaxCircuitOpenException: if the call is not allowed
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_probes):
+                raise BeeswaxCircuitOpenException('Circuit breaker open for {}'.format(self.name))
+            if state == HALF_OPEN:
+                self._probes += 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._results.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self._state == CLOSED:
+                self._results.append(False)
+                failures = self._results.count(False)
+                if len(self._results) >= self.minimum_calls and failures >= self.failure_rate * len(self._results):
+                    self._transition(OPEN)
+
+
+class CircuitBreakers(object):
+    """Circuit breakers keyed on the endpoint paths of each call"""
+
+    def __init__(self, **breaker_options):
+        """
+        :param dict breaker_options: failure_rate, minimum_calls, window, open_duration, half_open_probes,
+            on_state_change
+        """
+        self.breaker_options = breaker_options
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+        for breaker in self._breakers.values():
+            breaker._after_fork()
+
+    @staticmethod
+    def key(paths):
+        """
+        Endpoint name for the paths, ids are dropped so e.g. every segment upload shares a breaker
+        :type paths: list
+        :rtype: str
+        """
+        return '/'.join(str(path) for path in paths if not str(path).isdigit())
+
+    def get(self, paths):
+        """
+        :type paths: list
+        :rtype: CircuitBreaker
+        """
+        key = self.key(paths)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(key, **self.breaker_options)
+            return self._breakers[key]
+
+    def states(self):
+        """
+        :rtype: dict[str, str]
+        :return: the state of every breaker for monitoring
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return dict((breaker.name, breaker.state) for breaker in breakers)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Coalescing of identical in-flight beeswax requests
+Concurrent identical GETs (same path, parameters and account) share a single network call,
+every waiter receives the result (or error) of that call.
+Usage:
+>>> from beeswax_wrapper.core.coalescing import SingleFlight
+>>> flight = SingleFlight()
+>>> key = flight.key('GET', ['campaign'], data='{"campaign_id": 10}')
+>>> flight.do(key, api.dal._call, 'GET', ['campaign'], data='{"campaign_id": 10}')
+"""
+from __future__ import unicode_literals
+
+import copy
+import threading
+import ujson
+
+
+class _Flight(object):
+    """An in-flight call and its outcome"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Shares one in-flight call between the threads requesting the same key
+    The calling thread makes the call, the other threads wait for and receive a copy of its result
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, paths, account_id=None, **kwargs):
+        """
+        Coalescing key for a call
+        :type method: str
+        :type paths: list
+        :type account_id: int
+        :rtype: tuple|None
+        :return: None if the call can not be shared (not a GET, or with files, streams or unresolved paths)
+        """
+        if method.upper() != 'GET' or not paths or set(kwargs) - {'data'}:
+            return None
+        if any(hasattr(path, '__await__') for path in paths):
+            return None
+        data = kwargs.get('data')
+        if isinstance(data, bytes):  # bodies encoded by the DAL's codec
+            data = data.decode('utf-8')
+        if data:
+            data = ujson.dumps(ujson.loads(data), sort_keys=True)
+        return tuple('{}'.format(path) for path in paths), account_id, data
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Call func, or wait for the identical call already in flight
+        :type key: tuple
+        :type func: callable
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = func(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def in_flight(self):
+        """
+        :rtype: int
+        :return: the number of distinct calls in flight
+        """
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON codecs for the beeswax DALs
+Responses are decoded straight from the body bytes and request bodies are encoded to bytes.
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.codecs import get_codec
+>>> get_beeswax_dal().codec = get_codec('orjson')  # requires orjson
+"""
+from __future__ import unicode_literals
+
+import json
+import ujson
+
+
+_RAW_DECODE = json.JSONDecoder().raw_decode
+
+
+class JSONCodec(object):
+    """Encodes and decodes json bodies"""
+
+    name = None
+
+    def loads(self, data):
+        """
+        :type data: bytes|str
+        :rtype: list|dict
+        :raises ValueError: if data is not valid json
+        """
+        raise NotImplementedError
+
+    def dumps(self, obj):
+        """
+        :type obj: list|dict
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def raw_decode(self, text, pos=0):
+        """
+        Decode the json value starting at pos of a text that continues after it, e.g. the elements of a streamed list
+        ujson and orjson only decode whole documents, so every codec uses the C scanner of the json module by default
+        :type text: str
+        :type pos: int
+        :rtype: tuple
+        :return: the value and the offset after it
+        :raises ValueError: if the value is invalid or incomplete
+        """
+        return _RAW_DECODE(text, pos)
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self.name)
+
+
+class UJSONCodec(JSONCodec):
+    """ujson, the default codec"""
+
+    name = 'ujson'
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(obj).encode('utf-8')  # ujson only encodes to str
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson (python 3.6+ only), the fastest decoder for large responses"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson  # optional dependency
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+    def __reduce__(self):
+        # the module is imported again when unpickled, e.g. in the SegmentUpdate.push process pool
+        return OrjsonCodec, ()
+
+
+class StdlibCodec(JSONCodec):
+    """The standard library json module"""
+
+    name = 'json'
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+CODECS = {codec.name: codec for codec in (UJSONCodec, OrjsonCodec, StdlibCodec)}
+
+
+def get_codec(codec=None):
+    """
+    :param codec: a codec name ('ujson', 'orjson' or 'json'), a JSONCodec or None for the default
+    :rtype: JSONCodec
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    try:
+        return CODECS[codec or UJSONCodec.name]()
+    except KeyError:
+        raise ValueError('Unknown json codec {}, expected one of {}'.format(codec, ', '.join(sorted(CODECS))))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Gzip compression of beeswax request bodies
+Large json bodies (e.g. segment updates and list item uploads) are compressed before they are sent.
+Responses are requested with ACCEPT_ENCODING and decompressed incrementally by the http clients as they stream.
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.compression import RequestCompression
+>>> get_beeswax_dal().compression = RequestCompression(threshold=4096, level=6)
+"""
+from __future__ import unicode_literals
+
+import zlib
+
+
+ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def gzip_compress(data, level=6):
+    """
+    :type data: bytes|str
+    :param int level: 1 (fastest) to 9 (smallest)
+    :rtype: bytes
+    """
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+class RequestCompression(object):
+    """Gzip encodes request bodies above a size threshold"""
+
+    def __init__(self, threshold=1024, level=6):
+        """
+        :param int threshold: bytes, smaller bodies are sent uncompressed
+        :param int level: 1 (fastest) to 9 (smallest)
+        """
+        self.threshold = threshold
+        self.level = level
+
+    def prepare(self, kwargs):
+        """
+        Compress the data of request keyword arguments if it is large enough
+        :param dict kwargs: request keyword arguments
+        :rtype: dict
+        :return: the keyword arguments to send
+        """
+        data = kwargs.get('data')
+        headers = kwargs.get('headers') or {}
+        if not isinstance(data, (bytes, type(''))) or len(data) < self.threshold \
+                or 'Content-Encoding' in headers or kwargs.get('files'):
+            return kwargs
+
+        kwargs = dict(kwargs, data=gzip_compress(data, self.level))
+        kwargs['headers'] = dict(headers, **{'Content-Encoding': 'gzip'})
+        return kwargs
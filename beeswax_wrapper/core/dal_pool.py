@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pool of authenticated DALs per user and account
+Every (user, account) has its own session, so work for different accounts can run concurrently
+without masquerading the shared DAL back and forth.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> api = BeeswaxAPI.for_account(42)  # bound to the pooled DAL of account 42
+>>> api.line_items.list(campaign_id=10)
+
+>>> from beeswax_wrapper.core.dal_pool import DALPool
+>>> pool = DALPool(max_size=16, pool_maxsize=4)
+>>> api = BeeswaxAPI(dal=pool.get(account_id=42))
+"""
+from __future__ import unicode_literals
+
+import os
+import threading
+from collections import OrderedDict
+
+from beeswax_wrapper.core.access import BeeswaxDAL, get_beeswax_dal, register_after_fork
+
+
+DAL_POOL = None
+
+
+class DALPool(object):
+    """
+    Authenticated DALs keyed by (username, account_id), bounded by the number of live sessions
+    The least recently used DALs are evicted and their connections closed beyond max_size
+    """
+
+    def __init__(self, max_size=32, endpoint_url=None, **dal_options):
+        """
+        :param int max_size: maximum number of pooled DALs
+        :param str endpoint_url: endpoint of the pooled DALs, the shared DAL's endpoint by default
+        :param dict dal_options: BeeswaxDAL keyword arguments for the pooled DALs e.g. pool_maxsize, retry_policy
+        """
+        self.max_size = max_size
+        self.endpoint_url = endpoint_url
+        self.dal_options = dal_options
+        self._dals = OrderedDict()  # key: (dal, authentication lock)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        register_after_fork(self)
+
+    def _check_fork(self):
+        """Replace the locks if the process forked without os.register_at_fork (python < 3.7)"""
+        if self._pid != os.getpid():
+            self._after_fork()
+
+    def _after_fork(self):
+        """
+        Replace the locks inherited from a forked parent process, one of its threads may hold them
+        (the authentication locks are held while the DALs authenticate), the DALs rebuild themselves
+        """
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        for key, (dal, _) in list(self._dals.items()):
+            self._dals[key] = (dal, threading.Lock())
+
+    def __len__(self):
+        return len(self._dals)
+
+    def __contains__(self, key):
+        return key in self._dals
+
+    def create_dal(self):
+        """
+        :rtype: BeeswaxDAL
+        """
+        return BeeswaxDAL(self.endpoint_url or get_beeswax_dal().endpoint_url, **self.dal_options)
+
+    def get(self, account_id=None, username=None, password=None):
+        """
+        The DAL of a user and account, authenticated on first use
+        :param int account_id: the account to masquerade as, None for the user's own account
+        :param str username: None for the user of the credential provider
+        :param str password: required with a username not known to the credential provider
+        :rtype: BeeswaxDAL
+        """
+        key = (username, account_id)
+        self._check_fork()
+        with self._lock:
+            entry = self._dals.pop(key, None)
+            if entry is None:
+                entry = (self.create_dal(), threading.Lock())
+            self._dals[key] = entry  # most recently used
+            evicted = [self._dals.popitem(last=False)[1][0] for _ in range(len(self._dals) - self.max_size)]
+
+        for dal in evicted:
+            dal.reset_sessions()
+
+        dal, authentication_lock = entry
+        with authentication_lock:  # concurrent first uses authenticate once
+            if not dal.authenticated:
+                dal.masquerade(username, password, account_id)
+        return dal
+
+    def evict(self, account_id=None, username=None):
+        """
+        Remove the DAL of a user and account, closing its connections
+        :type account_id: int
+        :type username: str
+        """
+        with self._lock:
+            entry = self._dals.pop((username, account_id), None)
+        if entry is not None:
+            entry[0].reset_sessions()
+
+    def clear(self):
+        """Remove every DAL, closing their connections"""
+        with self._lock:
+            entries, self._dals = list(self._dals.values()), OrderedDict()
+        for dal, _ in entries:
+            dal.reset_sessions()
+
+
+def get_dal_pool():
+    """
+    The pool used by BeeswaxAPI.for_account
+    :rtype: DALPool
+    """
+    global DAL_POOL
+    if DAL_POOL is None:
+        DAL_POOL = DALPool()
+    return DAL_POOL
@@ -6,8 +6,50 @@ Exception classes for the beeswax wrapper
 from __future__ import unicode_literals
 
 
+AUTHENTICATION_STATUS_CODES = {401}
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
 class BeeswaxRESTException(Exception):
     """
     Raised if we get a response from the Beeswax endpoint with the 'success' attribute is False.
     """
+
+    def __init__(self, *args, **kwargs):
+        self.status_code = kwargs.pop('status_code', None)
+        super(BeeswaxRESTException, self).__init__(*args, **kwargs)
+
+
+class BeeswaxAuthenticationException(BeeswaxRESTException):
+    """
+    Raised if the Beeswax endpoint rejects the session, the session should be re-authenticated.
+    """
     pass
+
+
+class BeeswaxTransientException(BeeswaxRESTException):
+    """
+    Raised if the Beeswax endpoint is throttling or temporarily unavailable, the request may be retried.
+    """
+    pass
+
+
+class BeeswaxCircuitOpenException(BeeswaxRESTException):
+    """
+    Raised without calling the Beeswax endpoint while its circuit breaker is open.
+    """
+    pass
+
+
+def exception_from_status(status_code, message):
+    """
+    Classify a failed response by its status code
+    :type status_code: int
+    :type message: str|unicode
+    :rtype: BeeswaxRESTException
+    """
+    if status_code in AUTHENTICATION_STATUS_CODES:
+        return BeeswaxAuthenticationException(message, status_code=status_code)
+    if status_code in TRANSIENT_STATUS_CODES:
+        return BeeswaxTransientException(message, status_code=status_code)
+    return BeeswaxRESTException(message, status_code=status_code)
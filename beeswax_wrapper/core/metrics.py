@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Instrumentation of the beeswax DALs
+The DALs report every response, retry and re-authentication to a MetricsCollector.
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.metrics import PrometheusMetrics
+>>> metrics = get_beeswax_dal().metrics = PrometheusMetrics()
+>>> metrics.render()  # prometheus text format, e.g. served on /metrics
+"""
+from __future__ import unicode_literals
+
+import bisect
+import logging
+import threading
+import traceback
+
+from beeswax_wrapper.core.circuit_breaker import CircuitBreakers
+
+
+REJECTED = 'rejected'  # re-authenticated after the session was rejected
+EXPIRING = 'expiring'  # re-authenticated before the session expired
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsCollector(object):
+    """
+    Receives the DAL instrumentation events, the default implementation ignores them
+    Subclass it to forward the events e.g. to statsd, every method is called in the thread of the call
+    """
+
+    def on_response(self, method, endpoint, status_code, duration, request_bytes, response_bytes):
+        """
+        A request finished (or failed to get a response)
+        :param str method: http method
+        :param str endpoint: the endpoint paths without ids e.g. 'segment_upload/upload'
+        :param int status_code: None if no response was received
+        :param float duration: seconds from sending the request to receiving the response body
+        :param int request_bytes: size of the request body before compression
+        :param int response_bytes: size of the decoded response body, None for streamed responses
+        """
+
+    def on_retry(self, method, endpoint, classification):
+        """
+        A call failed and is retried
+        :type method: str
+        :type endpoint: str
+        :param str classification: the RetryPolicy classification of the failure, AUTHENTICATION or TRANSIENT
+        """
+
+    def on_reauthentication(self, reason):
+        """
+        The DAL authenticated again with the credentials of its last authentication
+        :param str reason: REJECTED or EXPIRING
+        """
+
+
+def endpoint_name(paths):
+    """
+    :type paths: list
+    :rtype: str
+    """
+    return CircuitBreakers.key(paths)
+
+
+def request_size(kwargs):
+    """
+    :param dict kwargs: the requests or aiohttp keyword arguments of a call
+    :rtype: int
+    """
+    data = kwargs.get('data')
+    return len(data) if isinstance(data, (bytes, type(''))) else 0
+
+
+def notify(collector, event, *args):
+    """
+    Report an event to a collector, errors of the collector are logged so that they never fail a call
+    :type collector: MetricsCollector
+    :param str event: name of the MetricsCollector method
+    """
+    if collector is None:
+        return
+    try:
+        getattr(collector, event)(*args)
+    except Exception:
+        logging.warning(traceback.format_exc())
+
+
+def _escape(value):
+    return '{}'.format(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join('{}="{}"'.format(name, _escape(value)) for name, value in zip(names, values))
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else '{}'.format(value)
+
+
+class PrometheusMetrics(MetricsCollector):
+    """Aggregates the events per endpoint and method, and renders them in the prometheus text format"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace='beeswax'):
+        """
+        :param tuple[float] buckets: upper bounds in seconds of the latency histogram buckets
+        :param str namespace: prefix of the metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._durations = {}  # (method, endpoint): [bucket counts..., sum, count]
+        self._request_bytes = {}  # (method, endpoint): bytes
+        self._response_bytes = {}  # (method, endpoint): bytes
+        self._responses = {}  # (method, endpoint, status): count
+        self._retries = {}  # (method, endpoint, classification): count
+        self._reauthentications = {}  # reason: count
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+
+    def on_response(self, method, endpoint, status_code, duration, request_bytes, response_bytes):
+        key = (method.upper(), endpoint)
+        status = 'error' if status_code is None else status_code
+        with self._lock:
+            histogram = self._durations.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            bucket = bisect.bisect_left(self.buckets, duration)
+            if bucket < len(self.buckets):  # slower responses only count in the +Inf bucket
+                histogram[bucket] += 1
+            histogram[-2] += duration
+            histogram[-1] += 1
+            self._request_bytes[key] = self._request_bytes.get(key, 0) + (request_bytes or 0)
+            if response_bytes is not None:
+                self._response_bytes[key] = self._response_bytes.get(key, 0) + response_bytes
+            self._responses[key + (status,)] = self._responses.get(key + (status,), 0) + 1
+
+    def on_retry(self, method, endpoint, classification):
+        key = (method.upper(), endpoint, classification)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def on_reauthentication(self, reason):
+        with self._lock:
+            self._reauthentications[reason] = self._reauthentications.get(reason, 0) + 1
+
+    def clear(self):
+        """Reset every metric"""
+        with self._lock:
+            for metric in (self._durations, self._request_bytes, self._response_bytes, self._responses,
+                           self._retries, self._reauthentications):
+                metric.clear()
+
+    def render(self):
+        """
+        :rtype: str
+        :return: the metrics in the prometheus text exposition format (version 0.0.4)
+        """
+        with self._lock:
+            durations = dict((key, list(value)) for key, value in self._durations.items())
+            counters = [
+                ('request_bytes_total', 'Request body bytes sent before compression', ('method', 'endpoint'),
+                 dict(self._request_bytes)),
+                ('response_bytes_total', 'Decoded response body bytes received', ('method', 'endpoint'),
+                 dict(self._response_bytes)),
+                ('responses_total', 'Responses by status code', ('method', 'endpoint', 'status'),
+                 dict(self._responses)),
+                ('retries_total', 'Retried calls by failure classification', ('method', 'endpoint', 'classification'),
+                 dict(self._retries)),
+                ('reauthentications_total', 'Authentications repeated by the DAL', ('reason',),
+                 dict(((reason,), count) for reason, count in self._reauthentications.items())),
+            ]
+
+        name = '{}_request_duration_seconds'.format(self.namespace)
+        lines = ['# HELP {} Time from sending a request to receiving the response body'.format(name),
+                 '# TYPE {} histogram'.format(name)]
+        for key in sorted(durations):
+            histogram, labels = durations[key], _labels(('method', 'endpoint'), key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram[:len(self.buckets)] + [None]):
+                cumulative = histogram[-1] if count is None else cumulative + count
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, _number(bound), cumulative))
+            lines.append('{}_sum{{{}}} {}'.format(name, labels, _number(histogram[-2])))
+            lines.append('{}_count{{{}}} {}'.format(name, labels, histogram[-1]))
+
+        for suffix, description, label_names, values in counters:
+            name = '{}_{}'.format(self.namespace, suffix)
+            lines.extend(['# HELP {} {}'.format(name, description), '# TYPE {} counter'.format(name)])
+            for key in sorted(values, key=lambda k: tuple('{}'.format(value) for value in k)):
+                lines.append('{}{{{}}} {}'.format(name, _labels(label_names, key), values[key]))
+
+        return '\n'.join(lines) + '\n'
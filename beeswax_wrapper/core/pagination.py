@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Automatic pagination of beeswax list endpoints
+The next pages are requested while the current page is consumed, so full scans are not bound by serial latency.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> api = BeeswaxAPI()
+>>> for line_item in api.line_items.paginate(page_size=500, read_ahead=2, campaign_id=10):
+...     print(line_item['line_item_id'])
+"""
+from __future__ import unicode_literals
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Paginator(object):
+    """
+    Iterates every object of a list endpoint using the beeswax rows/offset parameters
+    Iterate with `for` for BeeswaxAPI endpoints and `async for` for AsyncBeeswaxAPI endpoints
+    """
+
+    rows_parameter = 'rows'
+    offset_parameter = 'offset'
+
+    def __init__(self, list_func, page_size=500, read_ahead=2, **kwargs):
+        """
+        :param callable list_func: the list method of an endpoint
+        :param int page_size: objects requested per page
+        :param int read_ahead: pages requested ahead of the page being consumed
+        :param dict kwargs: list keywords
+        """
+        self.list_func = list_func
+        self.page_size = page_size
+        self.read_ahead = read_ahead
+        self.kwargs = kwargs
+
+    def page_parameters(self, page):
+        """
+        :type page: int
+        :rtype: dict
+        """
+        parameters = dict(self.kwargs)
+        parameters[self.rows_parameter] = self.page_size
+        parameters[self.offset_parameter] = page * self.page_size
+        return parameters
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=self.read_ahead + 1)
+        pending = deque()
+        next_page = 0
+        try:
+            while True:
+                while len(pending) <= self.read_ahead:
+                    pending.append(executor.submit(self.list_func, **self.page_parameters(next_page)))
+                    next_page += 1
+
+                page = pending.popleft().result()
+                for item in page:
+                    yield item
+
+                if len(page) < self.page_size:  # the last page
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def __aiter__(self):
+        from beeswax_wrapper.core.async_access import iter_pages
+        return iter_pages(self)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pipeline for bulk uploads whose request bodies are expensive to build
+Chunks are encoded in a process pool, so encoding scales with cores rather than one GIL,
+while a thread pool uploads the encoded bodies. Each stage holds at most max_pending chunks.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> api = BeeswaxAPI()
+>>> result = api.segments.updates.push(iter_users(), chunk_size=10000, build_user=build_user, segment_key_type=1)
+>>> result.failed  # {chunk index: exception}
+"""
+from __future__ import unicode_literals
+
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from beeswax_wrapper.core.batch import BulkResult
+
+
+def chunked(iterable, size):
+    """
+    :type iterable: collections.Iterable
+    :type size: int
+    :rtype: collections.Iterator[list]
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def encoding_processes(processes):
+    """
+    :param int processes: None for the number of cores
+    :rtype: int
+    """
+    return multiprocessing.cpu_count() if processes is None else processes
+
+
+class ProcessPipeline(object):
+    """Encodes chunks in a process pool while a thread pool uploads the encoded bodies"""
+
+    def __init__(self, encode, upload, processes=None, upload_workers=4, max_pending=None):
+        """
+        :param callable encode: builds the body of a chunk, must be picklable (e.g. a module level function)
+        :param callable upload: sends a body, runs in the upload threads
+        :param int processes: encoding processes, None for the number of cores and 0 to encode in the calling thread
+        :param int upload_workers: concurrent uploads
+        :param int max_pending: chunks queued at each stage, twice the workers of the larger stage by default
+        """
+        self.encode = encode
+        self.upload = upload
+        self.processes = processes
+        self.upload_workers = upload_workers
+        self.max_pending = max_pending
+
+    def _encode_inline(self, chunk):
+        future = Future()
+        try:
+            future.set_result(self.encode(chunk))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, chunks):
+        """
+        :type chunks: collections.Iterable[list]
+        :rtype: BulkResult
+        :return: the upload results and the encoding or upload errors by chunk index
+        """
+        processes = encoding_processes(self.processes)
+        process_pool = ProcessPoolExecutor(max_workers=processes) if processes != 0 else None
+        thread_pool = ThreadPoolExecutor(self.upload_workers)
+        max_pending = self.max_pending or 2 * max(self.upload_workers, processes, 1)
+
+        encoding, uploading = deque(), deque()
+        results, errors = {}, {}
+        count = 0
+
+        def advance(limit):
+            """Move chunks on until both stages are within the limit"""
+            while len(encoding) > limit or len(uploading) > limit:
+                if len(encoding) > limit:
+                    index, future = encoding.popleft()
+                    try:
+                        uploading.append((index, thread_pool.submit(self.upload, future.result())))
+                    except Exception as e:
+                        errors[index] = e
+                else:
+                    index, future = uploading.popleft()
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        errors[index] = e
+
+        try:
+            for index, chunk in enumerate(chunks):
+                count = index + 1
+                if process_pool is None:
+                    encoding.append((index, self._encode_inline(chunk)))
+                else:
+                    encoding.append((index, process_pool.submit(self.encode, chunk)))
+                advance(max_pending)
+            advance(0)
+        finally:
+            for future in [future for _, future in encoding] + [future for _, future in uploading]:
+                future.cancel()
+            if process_pool is not None:
+                process_pool.shutdown()
+            thread_pool.shutdown()
+
+        return BulkResult([errors[index] if index in errors else results[index] for index in range(count)], errors)
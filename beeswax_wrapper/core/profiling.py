@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sampled profiling of the beeswax API calls
+A sample of the retrieve, create, list, update and delete calls made through a DAL with a profiler run under cProfile,
+and their profiles are aggregated per endpoint.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> from beeswax_wrapper.core.profiling import Profiler
+>>> api = BeeswaxAPI()
+>>> profiler = api.dal.profiler = Profiler(sample_rate=0.01)
+>>> print(profiler.report('line_item'))  # the hottest functions of the sampled line item calls
+>>> profiler.dump('/var/tmp/beeswax_profiles')  # one .prof file per endpoint e.g. for snakeviz
+"""
+from __future__ import unicode_literals
+
+import os
+import random
+import threading
+import time
+
+from six import StringIO
+
+
+try:
+    _process_time = time.process_time
+except AttributeError:  # python 2
+    _process_time = time.clock
+
+WALL = 'wall'  # includes the time spent waiting on the network
+CPU = 'cpu'  # only the time spent in python e.g. serializing and decoding, at a higher profiling overhead
+CLOCKS = {WALL: None, CPU: _process_time}
+
+
+class Profiler(object):
+    """Profiles a sample of the api calls and aggregates the profiles per endpoint"""
+
+    def __init__(self, sample_rate=0.01, clock=WALL):
+        """
+        :param float sample_rate: fraction of the calls to profile
+        :param str clock: WALL or CPU
+        """
+        if clock not in CLOCKS:
+            raise ValueError('Unknown profiling clock {}, expected one of {}'.format(clock, ', '.join(sorted(CLOCKS))))
+        self.sample_rate = sample_rate
+        self.clock = clock
+        self._stats = {}  # endpoint: pstats.Stats
+        self._samples = {}  # endpoint: number of profiled calls
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+
+    def sampled(self):
+        """
+        :rtype: bool
+        :return: True if the next call should be profiled
+        """
+        return random.random() < self.sample_rate
+
+    def profile(self, endpoint, func, *args, **kwargs):
+        """
+        Call func under cProfile and add its profile to the endpoint's
+        Calls made while another profiler is active in the thread (e.g. a bulk update's updates) are not profiled
+        :type endpoint: str
+        :type func: callable
+        """
+        if getattr(self._local, 'active', False):
+            return func(*args, **kwargs)
+
+        import cProfile  # deferred to first use for fast imports
+
+        timer = CLOCKS[self.clock]
+        profile = cProfile.Profile(timer) if timer is not None else cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiling tool is active (python 3.12+)
+            return func(*args, **kwargs)
+
+        self._local.active = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            self._local.active = False
+            self._add(endpoint, profile)
+
+    def _add(self, endpoint, profile):
+        import pstats  # deferred to first use for fast imports
+
+        profile.create_stats()
+        with self._lock:
+            if endpoint in self._stats:
+                self._stats[endpoint].add(profile)
+            else:
+                self._stats[endpoint] = pstats.Stats(profile)
+            self._samples[endpoint] = self._samples.get(endpoint, 0) + 1
+
+    def samples(self):
+        """
+        :rtype: dict[str, int]
+        :return: the number of profiled calls per endpoint
+        """
+        with self._lock:
+            return dict(self._samples)
+
+    def report(self, endpoint=None, sort='cumulative', limit=30):
+        """
+        :param str endpoint: None for every endpoint
+        :param str sort: a pstats sort key e.g. 'cumulative', 'tottime' or 'calls'
+        :param int limit: number of functions listed per endpoint
+        :rtype: str
+        :return: the aggregated profiles in the pstats text format
+        """
+        stream = StringIO()
+        with self._lock:
+            for name in sorted(self._stats) if endpoint is None else [endpoint]:
+                if name not in self._stats:
+                    continue
+                stream.write('{} ({} calls profiled)\n'.format(name, self._samples[name]))
+                stats = self._stats[name]
+                stats.stream = stream
+                stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self, directory):
+        """
+        Write the aggregated profile of each endpoint to <directory>/<endpoint>.prof
+        :type directory: str
+        :rtype: list[str]
+        :return: the paths written
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        paths = []
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                paths.append(os.path.join(directory, '{}.prof'.format(name.replace('/', '.'))))
+                stats.dump_stats(paths[-1])
+        return paths
+
+    def clear(self):
+        """Drop the aggregated profiles"""
+        with self._lock:
+            self._stats.clear()
+            self._samples.clear()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Client side rate limiting for the beeswax DALs
+Usage:
+>>> from beeswax_wrapper.core.access import get_beeswax_dal
+>>> from beeswax_wrapper.core.rate_limit import RateLimiter
+>>> get_beeswax_dal().rate_limiter = RateLimiter(default_rate=10, rates={'segment_update': 2, 'line_item': (5, 20)})
+"""
+from __future__ import unicode_literals
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to `capacity`
+    Callers reserve tokens ahead of time so concurrent callers are spaced evenly rather than released together
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param float rate: tokens added per second
+        :param float capacity: maximum tokens held, defaults to one second of tokens
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the bucket
+        :type tokens: int
+        :rtype: float
+        :return: seconds the caller must wait before using the tokens
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+
+
+class RateLimiter(object):
+    """
+    Rate limits per endpoint path prefix and per masqueraded account
+    Each account has its own buckets as beeswax quotas are per account
+    """
+
+    def __init__(self, rates=None, default_rate=None, account_rates=None):
+        """
+        :param dict rates: {path prefix: rate or (rate, burst)} e.g. {'segment_update': 2, 'segment_upload/upload': 1}
+        :param float|tuple default_rate: rate or (rate, burst) for paths without a prefix in rates, None for no limit
+        :param dict account_rates: {account_id: rate or (rate, burst)} limiting all calls for an account
+        """
+        self.rates = dict((tuple(prefix.strip('/').split('/')), rate) for prefix, rate in (rates or {}).items())
+        self.default_rate = default_rate
+        self.account_rates = account_rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+        for bucket in self._buckets.values():
+            bucket._after_fork()
+
+    def _bucket(self, key, rate):
+        with self._lock:
+            if key not in self._buckets:
+                rate, burst = rate if isinstance(rate, (tuple, list)) else (rate, None)
+                self._buckets[key] = TokenBucket(rate, burst)
+            return self._buckets[key]
+
+    def _match(self, paths):
+        """
+        :type paths: list
+        :return: the longest configured prefix of the paths and its rate
+        """
+        paths = tuple(str(path) for path in paths)
+        matches = [prefix for prefix in self.rates if paths[:len(prefix)] == prefix]
+        if matches:
+            prefix = max(matches, key=len)
+            return prefix, self.rates[prefix]
+        return None, self.default_rate
+
+    def reserve(self, paths, account_id=None):
+        """
+        Reserve a request against the path and account limits
+        :type paths: list
+        :type account_id: int
+        :rtype: float
+        :return: seconds the caller must wait before sending the request
+        """
+        delays = [0.0]
+
+        prefix, rate = self._match(paths)
+        if rate:
+            delays.append(self._bucket((account_id, prefix), rate).reserve())
+
+        account_rate = self.account_rates.get(account_id)
+        if account_rate:
+            delays.append(self._bucket((account_id, '*'), account_rate).reserve())
+
+        return max(delays)
+
+    def acquire(self, paths, account_id=None):
+        """Block until a request is allowed"""
+        time.sleep(self.reserve(paths, account_id))
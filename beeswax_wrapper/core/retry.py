@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Retry policy for the beeswax DAL
+Failures are classified so that only rejected sessions are re-authenticated,
+only transient failures are retried and business errors (e.g. validation) are raised immediately.
+"""
+from __future__ import unicode_literals
+
+import random
+
+from beeswax_wrapper.core.exceptions import BeeswaxAuthenticationException, BeeswaxTransientException
+
+
+AUTHENTICATION = 'authentication'
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+IDEMPOTENT_METHODS = {'GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'}
+UNPROCESSED_STATUS_CODES = {429, 503}  # the request was refused so is safe to resend whatever the method
+
+
+class RetryPolicy(object):
+    """Bounded retries with exponential backoff and full jitter"""
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30.0, jitter=True):
+        """
+        :param int max_attempts: total attempts per call including the first
+        :param float backoff: delay in seconds before the first retry of a transient failure
+        :param float max_backoff: upper bound for the delay in seconds
+        :param bool jitter: randomise delays so that concurrent callers do not retry in lockstep
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        """
+        Delay in seconds before retrying after the given failed attempt
+        :type attempt: int
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def classify(error, method):
+        """
+        Classify a failed call
+        Requests that may have been processed are only retried for idempotent methods
+        :type error: Exception
+        :type method: str
+        :rtype: str
+        :return: one of AUTHENTICATION, TRANSIENT, PERMANENT
+        """
+        # deferred to first use for fast imports
+        from requests import ConnectionError, ConnectTimeout, Timeout
+        from requests.exceptions import SSLError
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        if isinstance(error, BeeswaxAuthenticationException):
+            return AUTHENTICATION
+        if isinstance(error, BeeswaxTransientException):
+            return TRANSIENT if idempotent or error.status_code in UNPROCESSED_STATUS_CODES else PERMANENT
+        if isinstance(error, SSLError):  # certificate and protocol mismatches do not go away
+            return PERMANENT
+        if isinstance(error, ConnectTimeout) or isinstance(error, ConnectionError) and not request_sent(error):
+            return TRANSIENT
+        if isinstance(error, (Timeout, ConnectionError)):  # e.g. read timeouts and connections dropped mid-request
+            return TRANSIENT if idempotent else PERMANENT
+        return PERMANENT
+
+    def should_retry(self, classification, attempt):
+        """
+        :type classification: str
+        :type attempt: int
+        :rtype: bool
+        """
+        return classification != PERMANENT and attempt < self.max_attempts
+
+
+def request_sent(error):
+    """
+    Whether a connection error may have happened after the request was sent
+    Connections that could not be opened (e.g. refused or unresolved hosts) fail before anything is sent
+    :type error: requests.ConnectionError
+    :rtype: bool
+    """
+    from urllib3.exceptions import NewConnectionError  # deferred to first use for fast imports
+
+    if getattr(error, 'request_sent', True) is False:  # set by the transports without urllib3 e.g. aiohttp
+        return False
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)  # requests wraps the urllib3 MaxRetryError
+    return not isinstance(reason, NewConnectionError)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Authentication session lifetime tracking for the beeswax DALs
+"""
+from __future__ import unicode_literals
+
+import time
+
+from six.moves.http_cookiejar import http2time
+
+
+class SessionLifetime(object):
+    """Tracks when the authentication session expires so it can be refreshed before calls are rejected"""
+
+    def __init__(self, lifetime=None, refresh_margin=30.0):
+        """
+        :param float lifetime: seconds an authentication is valid for, None to rely on the cookie expiry only
+        :param float refresh_margin: seconds before the expiry to refresh the session
+        """
+        self.lifetime = lifetime
+        self.refresh_margin = refresh_margin
+        self.issued_at = None
+        self.expires_at = None
+
+    def issued(self, cookie_expiries=()):
+        """
+        Record a new authentication
+        :param list[float] cookie_expiries: expiry timestamps of the authentication cookies
+        """
+        self.issued_at = time.time()
+        expiries = [expiry for expiry in cookie_expiries if expiry]
+        if self.lifetime:
+            expiries.append(self.issued_at + self.lifetime)
+        self.expires_at = min(expiries) if expiries else None
+
+    @property
+    def expiring(self):
+        """
+        True if the authentication expires within the refresh margin
+        :rtype: bool
+        """
+        return self.expires_at is not None and time.time() >= self.expires_at - self.refresh_margin
+
+
+def cookie_expiry(morsel, received_at=None):
+    """
+    Expiry timestamp of a Set-Cookie morsel (e.g. from an aiohttp cookie jar), Max-Age taking precedence over Expires
+    :type morsel: http.cookies.Morsel
+    :param float received_at: when the cookie was set, now by default
+    :rtype: float|None
+    :return: None for session cookies and unparseable attributes
+    """
+    if morsel['max-age']:
+        try:
+            return (time.time() if received_at is None else received_at) + int(morsel['max-age'])
+        except ValueError:
+            pass
+    if morsel['expires']:
+        return http2time(morsel['expires'])
+    return None
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Incremental decoding of beeswax list responses
+The elements of the payload array are decoded and yielded one at a time as the body arrives,
+so peak memory is bounded by the largest element rather than the whole response.
+"""
+from __future__ import unicode_literals
+
+import codecs
+import re
+
+from beeswax_wrapper.core.codecs import get_codec
+
+
+_STRUCTURE = re.compile(r'[\[\]{}",:]')
+_STRING = re.compile(r'["\\]')
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JSONArrayStream(object):
+    """
+    Iterates the elements of the array under `key` of a top level json object (or of a top level json array)
+    The other top level values of the object are decoded into `envelope` as they complete
+    Chunks can also be pushed with `feed` (e.g. from an asyncio stream) followed by `close`
+    The elements are decoded by the raw_decode of the codec (by default the C scanner of the json module),
+    which also finds where each one ends, so only the top level values are scanned in python.
+    An element is decoded again when it spans several chunks.
+    """
+
+    def __init__(self, chunks=(), key='payload', codec=None):
+        """
+        :param collections.Iterable[bytes] chunks: the raw response body
+        :param str key: the top level key of the array to stream
+        :param codec: decodes the elements with its raw_decode and the top level values with its loads,
+            a beeswax_wrapper.core.codecs.JSONCodec or codec name, None for the default
+        """
+        self.chunks = chunks
+        self.key = key
+        self.codec = get_codec(codec)
+        self.envelope = {}
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._state = ('', 0, 0, False, None, None, None, None, None)
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for item in self.feed(chunk):
+                yield item
+        self.close()
+
+    def close(self):
+        """
+        :raises ValueError: if the body was incomplete
+        """
+        self._decoder.decode(b'', True)
+        depth, root = self._state[2], self._state[4]
+        if root is None or depth:
+            raise ValueError('Truncated json response')
+
+    def feed(self, chunk):
+        """
+        :type chunk: bytes
+        :rtype: list
+        :return: the elements completed by the chunk
+        """
+        text, pos, depth, in_string, root, stream_depth, field_start, colon, field_key = self._state
+        text += self._decoder.decode(chunk)
+        items = []
+
+        while True:
+            if depth == stream_depth:  # between the elements of the streamed array
+                pos = _WHITESPACE.match(text, pos).end()
+                if pos == len(text):
+                    break
+                char = text[pos]
+                if char == ']':
+                    depth -= 1
+                    stream_depth = None
+                    pos += 1
+                elif char == ',':
+                    pos += 1
+                else:
+                    try:
+                        item, end = self.codec.raw_decode(text, pos)
+                    except ValueError:  # the element continues in the next chunk
+                        break
+                    # a number cut by the chunk (e.g. `1.` of `1.5`) scans as a shorter number,
+                    # so the element is only complete once the next separator arrived
+                    end = _WHITESPACE.match(text, end).end()
+                    if end == len(text) or text[end] not in ',]':
+                        break
+                    items.append(item)
+                    pos = end
+                continue
+
+            match = (_STRING if in_string else _STRUCTURE).search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char, pos = match.group(), match.end()
+
+            if in_string:
+                if char == '\\':
+                    if pos >= len(text):  # the escaped character is in the next chunk
+                        pos = match.start()
+                        break
+                    pos += 1
+                else:
+                    in_string = False
+
+            elif char == '"':
+                in_string = True
+
+            elif char in '[{':
+                depth += 1
+                if depth == 1:
+                    root = char
+                    if char == '[':
+                        stream_depth = 1
+                    else:
+                        field_start = pos
+                elif depth == 2 and root == '{' and char == '[' and field_key == self.key \
+                        and not text[colon + 1:match.start()].strip():
+                    stream_depth = 2
+                    field_start = None
+
+            elif char in ']}':
+                if depth == 1 and root == '{':
+                    self._end_field(text, field_start, colon, field_key, match.start())
+                    field_start = colon = field_key = None
+                depth -= 1
+
+            elif char == ',':
+                if depth == 1 and root == '{':
+                    self._end_field(text, field_start, colon, field_key, match.start())
+                    field_start, colon, field_key = pos, None, None
+
+            elif char == ':' and depth == 1 and root == '{':
+                colon = match.start()
+                field_key = self.codec.loads(text[field_start:colon])
+
+        # only keep the unfinished element or top level value
+        keep = min(offset for offset in (field_start, pos) if offset is not None)
+        text = text[keep:]
+        pos -= keep
+        field_start = field_start - keep if field_start is not None else None
+        colon = colon - keep if colon is not None else None
+
+        self._state = text, pos, depth, in_string, root, stream_depth, field_start, colon, field_key
+        return items
+
+    def _end_field(self, text, field_start, colon, field_key, end):
+        """Decode a completed top level value, the streamed array has no field_start"""
+        if field_start is not None and colon is not None:
+            self.envelope[field_key] = self.codec.loads(text[colon + 1:end])
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-process tracing of the beeswax API calls
+Every API method call made through a DAL with a tracer opens a span, with a child span for each phase:
+serialize (building the request body), connect (opening a new connection), send (writing the request),
+wait (until the response headers are received), download (reading the body) and decode.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> from beeswax_wrapper.core.tracing import JSONLinesExporter, Tracer
+>>> api = BeeswaxAPI()
+>>> api.dal.tracer = Tracer(JSONLinesExporter('/var/tmp/beeswax_spans.jsonl'))
+>>> api.campaigns.retrieve(campaign_id=1)  # spans of Campaign.retrieve and its phases are written to the file
+"""
+from __future__ import unicode_literals
+
+import io
+import random
+import threading
+import time
+import ujson
+from contextlib import contextmanager
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # python < 3.7, spans are tracked per thread
+    ContextVar = None
+
+
+SERIALIZE = 'serialize'
+CONNECT = 'connect'
+SEND = 'send'
+WAIT = 'wait'
+DOWNLOAD = 'download'
+DECODE = 'decode'
+
+
+if ContextVar is not None:
+    _CURRENT_SPAN = ContextVar('beeswax_span', default=None)
+
+    def current_span():
+        """
+        The span of the API method being called, in this thread or asyncio task
+        :rtype: Span
+        """
+        return _CURRENT_SPAN.get()
+
+    def _set_current_span(span):
+        return _CURRENT_SPAN.set(span)
+
+    def _reset_current_span(token):
+        _CURRENT_SPAN.reset(token)
+
+else:
+    _LOCAL = threading.local()
+
+    def current_span():
+        """
+        The span of the API method being called in this thread
+        :rtype: Span
+        """
+        return getattr(_LOCAL, 'span', None)
+
+    def _set_current_span(span):
+        token, _LOCAL.span = current_span(), span
+        return token
+
+    def _reset_current_span(token):
+        _LOCAL.span = token
+
+
+class Span(object):
+    """A timed operation, exported when it finishes"""
+
+    def __init__(self, tracer, name, parent=None, start=None, tags=None):
+        """
+        :type tracer: Tracer
+        :type name: str
+        :type parent: Span
+        :param float start: timestamp, now by default
+        :type tags: dict
+        """
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else '{:032x}'.format(random.getrandbits(128))
+        self.span_id = '{:016x}'.format(random.getrandbits(64))
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time() if start is None else start
+        self.end = None
+        self.tags = tags or {}
+        self.serialized = False
+
+    @property
+    def duration(self):
+        """
+        :rtype: float
+        :return: seconds, None until the span is finished
+        """
+        return None if self.end is None else self.end - self.start
+
+    def fail(self, error):
+        """
+        :type error: Exception
+        """
+        self.tags['error'] = '{}: {}'.format(type(error).__name__, error)
+
+    def finish(self, end=None):
+        """
+        Record the end of the span and export it, later calls are ignored
+        :param float end: timestamp, now by default
+        """
+        if self.end is None:
+            self.end = time.time() if end is None else end
+            self.tracer.exporter.export(self)
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        """
+        return {'name': self.name, 'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id,
+                'start': self.start, 'end': self.end, 'duration': self.duration, 'tags': self.tags}
+
+    def __repr__(self):
+        return '<Span {} {}>'.format(self.name, self.duration)
+
+
+class Tracer(object):
+    """Creates the spans of a DAL's API calls"""
+
+    def __init__(self, exporter):
+        """
+        :type exporter: SpanExporter
+        """
+        self.exporter = exporter
+
+    def _after_fork(self):
+        """Replace the locks of the exporter inherited from a forked parent process"""
+        if hasattr(self.exporter, '_after_fork'):
+            self.exporter._after_fork()
+
+    def start_span(self, name, **tags):
+        """
+        A span, child of the current span if any, that must be activated and finished by the caller
+        :type name: str
+        :rtype: Span
+        """
+        return Span(self, name, current_span(), tags=tags)
+
+
+@contextmanager
+def activate(span):
+    """
+    Make a span the current span, it is not finished on exit
+    :type span: Span
+    """
+    token = _set_current_span(span)
+    try:
+        yield span
+    finally:
+        _reset_current_span(token)
+
+
+class _NoPhase(object):
+    """Phase of a call made without a current span"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase(object):
+
+    def __init__(self, parent, name):
+        self.parent = parent
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, self.start, parent=self.parent)
+
+
+def phase(name):
+    """
+    Context manager timing a phase of the current span, a no-op if there is none
+    :type name: str
+    """
+    parent = current_span()
+    return _NO_PHASE if parent is None else _Phase(parent, name)
+
+
+def record(name, start, end=None, parent=None, **tags):
+    """
+    Export a child span of the current span for a phase that already happened
+    :type name: str
+    :param float start: timestamp
+    :param float end: timestamp, now by default
+    :param Span parent: the current span by default, nothing is recorded if there is none
+    """
+    parent = parent or current_span()
+    if parent is not None:
+        Span(parent.tracer, name, parent, start, tags).finish(end)
+
+
+def record_serialize():
+    """Record the serialize phase of the current span, from its start until now, once"""
+    span = current_span()
+    if span is not None and not span.serialized:
+        span.serialized = True
+        record(SERIALIZE, span.start, parent=span)
+
+
+class SpanExporter(object):
+    """Receives the finished spans, in the thread that finished them"""
+
+    def export(self, span):
+        """
+        :type span: Span
+        """
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the finished spans in memory"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def _after_fork(self):
+        """Replace the lock inherited from a forked parent process, one of its threads may hold it"""
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    def find(self, name):
+        """
+        :type name: str
+        :rtype: list[Span]
+        """
+        return [span for span in self.spans if span.name == name]
+
+    def children(self, span):
+        """
+        :type span: Span
+        :rtype: list[Span]
+        """
+        return [child for child in self.spans if child.parent_id == span.span_id]
+
+
+class JSONLinesExporter(SpanExporter):
+    """Appends the finished spans to a file as json lines"""
+
+    def __init__(self, path):
+        """
+        :param str path: file to append to
+        """
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _after_fork(self):
+        """Replace the lock inherited from a forked parent process, the file is line buffered so nothing is pending"""
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = ujson.dumps(span.to_dict()) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = io.open(self.path, 'a', encoding='utf-8', buffering=1)  # flushed every line
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -2,11 +2,29 @@
 # -*- coding: utf-8 -*-
 """
 For setting and returning beeswax passwords (visible only to current environment user).
+The DALs get their credentials from a CredentialProvider, the keyring by default:
+>>> from beeswax_wrapper.credentials.credential_manager import *
+>>> set_credential_provider(ChainCredentialProvider([EnvironmentCredentialProvider(), KeyringCredentialProvider()]))
 """
 from __future__ import unicode_literals
 
-import keyring
 import getpass
+import os
+import threading
+import time
+import ujson
+
+keyring = None  # imported on first use, it is slow to import
+
+
+def _keyring():
+    """
+    :return: the keyring module
+    """
+    global keyring
+    if keyring is None:
+        import keyring
+    return keyring
 
 
 def store_beeswax_credentials(username, password):
@@ -17,8 +35,8 @@ def store_beeswax_credentials(username, password):
     :param str|unicode password: Beeswax password
     """
     user = getpass.getuser()
-    keyring.set_password("beeswax_username", user, username)
-    keyring.set_password("beeswax_password", user, password)
+    _keyring().set_password("beeswax_username", user, username)
+    _keyring().set_password("beeswax_password", user, password)
 
 
 def get_beeswax_credentials():
@@ -29,6 +47,168 @@ def get_beeswax_credentials():
     """
     user = getpass.getuser()
     return {
-        'username': keyring.get_password("beeswax_username", user),
-        'password': keyring.get_password("beeswax_password", user)
+        'username': _keyring().get_password("beeswax_username", user),
+        'password': _keyring().get_password("beeswax_password", user)
     }
+
+
+class CredentialProvider(object):
+    """
+    Source of beeswax credentials for the DALs
+    Resolved credentials are cached in memory so re-authentication does not query the source
+    """
+
+    def __init__(self, ttl=None):
+        """
+        :param float ttl: seconds to cache the credentials for, None to cache them until invalidated
+        """
+        self.ttl = ttl
+        self._credentials = None
+        self._expires_at = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Query the source
+        :rtype: dict[str|unicode, str|unicode]
+        :return: beeswax credentials, e.g. {"username":"foo", "password":"bar"}
+        """
+        raise NotImplementedError
+
+    @property
+    def cached(self):
+        """
+        :rtype: bool
+        """
+        credentials, expires_at = self._credentials, self._expires_at
+        return credentials is not None and (expires_at is None or expires_at > time.time())
+
+    def get_credentials(self):
+        """
+        :rtype: dict[str|unicode, str|unicode]
+        :return: the cached credentials, loaded from the source if they are not cached or have expired
+        """
+        with self._lock:
+            if not self.cached:
+                self._credentials = self.load()
+                self._expires_at = time.time() + self.ttl if self.ttl is not None else None
+            return dict(self._credentials)
+
+    def invalidate(self):
+        """Drop the cached credentials, e.g. when they were rejected"""
+        with self._lock:
+            self._credentials = self._expires_at = None
+
+    def _after_fork(self):
+        """Replace the locks inherited from a forked parent process, one of its threads may hold them"""
+        self._lock = threading.Lock()
+
+
+class KeyringCredentialProvider(CredentialProvider):
+    """Credentials stored in the environment's keyring by store_beeswax_credentials"""
+
+    def load(self):
+        return get_beeswax_credentials()
+
+
+class EnvironmentCredentialProvider(CredentialProvider):
+    """Credentials from environment variables, e.g. for containers without a keyring"""
+
+    def __init__(self, username_variable='BEESWAX_USERNAME', password_variable='BEESWAX_PASSWORD', ttl=None):
+        """
+        :param str username_variable: the environment variable holding the username
+        :param str password_variable: the environment variable holding the password
+        :param float ttl: seconds to cache the credentials for, None to cache them until invalidated
+        """
+        super(EnvironmentCredentialProvider, self).__init__(ttl)
+        self.username_variable = username_variable
+        self.password_variable = password_variable
+
+    def load(self):
+        return {
+            'username': os.environ.get(self.username_variable),
+            'password': os.environ.get(self.password_variable)
+        }
+
+
+class FileCredentialProvider(CredentialProvider):
+    """Credentials from a json file, e.g. a mounted secret {"username": "foo", "password": "bar"}"""
+
+    def __init__(self, path, ttl=None):
+        """
+        :param str path: the json file
+        :param float ttl: seconds to cache the credentials for, None to cache them until invalidated
+        """
+        super(FileCredentialProvider, self).__init__(ttl)
+        self.path = path
+
+    def load(self):
+        with open(self.path) as f:
+            credentials = ujson.load(f)
+        return {'username': credentials.get('username'), 'password': credentials.get('password')}
+
+
+class CallableCredentialProvider(CredentialProvider):
+    """Credentials from a function, e.g. a secrets manager client"""
+
+    def __init__(self, func, ttl=None):
+        """
+        :param callable func: returns the credentials as {"username": "foo", "password": "bar"}
+        :param float ttl: seconds to cache the credentials for, None to cache them until invalidated
+        """
+        super(CallableCredentialProvider, self).__init__(ttl)
+        self.func = func
+
+    def load(self):
+        return self.func()
+
+
+class ChainCredentialProvider(CredentialProvider):
+    """The credentials of the first provider that has both a username and a password"""
+
+    def __init__(self, providers, ttl=None):
+        """
+        :type providers: list[CredentialProvider]
+        :param float ttl: seconds to cache the credentials for, None to cache them until invalidated
+        """
+        super(ChainCredentialProvider, self).__init__(ttl)
+        self.providers = providers
+
+    def load(self):
+        for provider in self.providers:
+            credentials = provider.get_credentials()
+            if credentials.get('username') and credentials.get('password'):
+                return credentials
+        return {'username': None, 'password': None}
+
+    def invalidate(self):
+        super(ChainCredentialProvider, self).invalidate()
+        for provider in self.providers:
+            provider.invalidate()
+
+    def _after_fork(self):
+        super(ChainCredentialProvider, self)._after_fork()
+        for provider in self.providers:
+            provider._after_fork()
+
+
+CREDENTIAL_PROVIDER = None
+
+
+def get_credential_provider():
+    """
+    The credential provider of DALs without their own, the keyring unless set_credential_provider was called
+    :rtype: CredentialProvider
+    """
+    global CREDENTIAL_PROVIDER
+    if CREDENTIAL_PROVIDER is None:
+        CREDENTIAL_PROVIDER = KeyringCredentialProvider()
+    return CREDENTIAL_PROVIDER
+
+
+def set_credential_provider(provider):
+    """
+    :type provider: CredentialProvider
+    """
+    global CREDENTIAL_PROVIDER
+    CREDENTIAL_PROVIDER = provider
@@ -5,20 +5,15 @@ API classes to access beeswax account information
 """
 from __future__ import unicode_literals
 
-import ujson
-
-from beeswax_wrapper.core.base_classes import BaseAPI
+from beeswax_wrapper.core.base_classes import BaseAPI, LazyEndpoint
 
 
 class Account(BaseAPI):
     """Beeswax Account API class"""
 
     paths = ['account']
-
-    def __init__(self, *args, **kwargs):
-        super(Account, self).__init__(*args, **kwargs)
-        self.alerts = AccountAlert(self._dal)
-        self.settings = AccountSetting(self._dal)
+    alerts = LazyEndpoint('AccountAlert')
+    settings = LazyEndpoint('AccountSetting')
 
     def retrieve(self, account_id, **kwargs):
         """
@@ -26,14 +21,14 @@ class Account(BaseAPI):
         :param dict kwargs: customer_id, alternative_id, account_name, primary_account, active, create_date, update_date
         """
         parameters = dict(account_id=account_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: account_id, customer_id, alternative_id, account_name, primary_account, active, create_date,
             update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, account_name, **kwargs):
         """
@@ -42,7 +37,7 @@ class Account(BaseAPI):
             date_format_string, notes
         """
         parameters = dict(account_name=account_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, account_id, **kwargs):
         """
@@ -51,7 +46,7 @@ class Account(BaseAPI):
             date_format_string, notes, active
         """
         parameters = dict(account_id=account_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class AccountAlert(BaseAPI):
@@ -65,7 +60,7 @@ class AccountAlert(BaseAPI):
         :param dict kwargs: email, slack_api, slack_channel, slack_emoji, active
         """
         parameters = dict(system_alert_key=system_alert_key, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, account_alert_id, **kwargs):
         """
@@ -73,14 +68,14 @@ class AccountAlert(BaseAPI):
         :param dict kwargs: system_alert_key, email, slack_api, slack_channel, slack_emoji, active
         """
         parameters = dict(account_alert_id=account_alert_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, account_alert_id):
         """
         :type account_alert_id: int
         """
         parameters = dict(account_alert_id=account_alert_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class AccountSetting(BaseAPI):
@@ -94,13 +89,13 @@ class AccountSetting(BaseAPI):
         :param dict kwargs: account_setting
         """
         parameters = dict(as_id=as_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: as_id, account_setting
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, account_setting, value):
         """
@@ -108,7 +103,7 @@ class AccountSetting(BaseAPI):
         :type value: str|int|float
         """
         parameters = dict(account_setting=account_setting, value=value)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, as_id, account_setting, value):
         """
@@ -117,11 +112,11 @@ class AccountSetting(BaseAPI):
         :type value: str|int|float
         """
         parameters = dict(as_id=as_id, account_setting=account_setting, value=value)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, as_id):
         """
         :type as_id: int
         """
         parameters = dict(as_id=as_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
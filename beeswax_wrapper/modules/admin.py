@@ -5,8 +5,6 @@ API classes to access beeswax admin information
 """
 from __future__ import unicode_literals
 
-import ujson
-
 from beeswax_wrapper.core.base_classes import BaseAPI
 
 
@@ -21,7 +19,7 @@ class Authentication(BaseAPI):
         :param dict kwargs: user_id, email, account_id, keep_logged_in
         """
         parameters = dict(password=password, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, user_id, password, new_password):
         """
@@ -30,7 +28,7 @@ class Authentication(BaseAPI):
         :type new_password: str
         """
         parameters = dict(user_id=user_id, password=password, new_password=new_password)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self):
         # TODO: check this is correct
@@ -48,7 +46,7 @@ class Password(BaseAPI):
         :type email: str
         """
         parameters = dict(user_id=user_id, email=email)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, login_token, new_password, **kwargs):
         """
@@ -57,7 +55,7 @@ class Password(BaseAPI):
         :param dict kwargs: user_id, email
         """
         parameters = dict(login_token=login_token, new_password=new_password, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class Role(BaseAPI):
@@ -71,13 +69,13 @@ class Role(BaseAPI):
         :param dict kwargs: role_name, is_global, parent_role_id, active
         """
         parameters = dict(role_id=role_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: role_id, role_name, is_global, parent_role_id, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, role_name, parent_role_id, permissions, **kwargs):
         """
@@ -87,7 +85,7 @@ class Role(BaseAPI):
         :param dict kwargs: global, notes, active
         """
         parameters = dict(role_name=role_name, parent_role_id=parent_role_id, permissions=permissions, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, role_id, **kwargs):
         """
@@ -95,14 +93,14 @@ class Role(BaseAPI):
         :param dict kwargs: role_name, global, parent_role_id, permissions, notes, active
         """
         parameters = dict(role_id=role_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, role_id):
         """
         :type role_id: int
         """
         parameters = dict(role_id=role_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class User(BaseAPI):
@@ -116,13 +114,13 @@ class User(BaseAPI):
         :param dict kwargs: email, first_name, last_name, role_id, active
         """
         parameters = dict(user_id=user_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: user_id, email, first_name, last_name, role_id, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, email, role_id, **kwargs):
         """
@@ -131,7 +129,7 @@ class User(BaseAPI):
         :param dict kwargs: first_name, last_name, notes, active, super_user, multi_account, send_product_comms
         """
         parameters = dict(email=email, role_id=role_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, user_id, **kwargs):
         """
@@ -140,11 +138,11 @@ class User(BaseAPI):
             send_product_comms
         """
         parameters = dict(user_id=user_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, user_id):
         """
         :type user_id: int
         """
         parameters = dict(user_id=user_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
@@ -6,24 +6,19 @@ I don't really like this separation, but there are so many creative endpoints...
 """
 from __future__ import unicode_literals
 
-import ujson
-
-from beeswax_wrapper.core.base_classes import BaseAPI
+from beeswax_wrapper.core.base_classes import BaseAPI, LazyEndpoint
 
 
 class Creative(BaseAPI):
     """Beeswax Creative API class"""
 
     paths = ['creative']
-
-    def __init__(self, *args, **kwargs):
-        super(Creative, self).__init__(*args, **kwargs)
-        self.addons = CreativeAddon(self._dal)
-        self.approvals = CreativeApproval(self._dal)
-        self.assets = CreativeAsset(self._dal)
-        self.bulk_upload = CreativeBulkUpload(self._dal)
-        self.line_items = CreativeLineItemAssociation(self._dal)
-        self.templates = CreativeTemplates(self._dal)
+    addons = LazyEndpoint('CreativeAddon')
+    approvals = LazyEndpoint('CreativeApproval')
+    assets = LazyEndpoint('CreativeAsset')
+    bulk_upload = LazyEndpoint('CreativeBulkUpload')
+    line_items = LazyEndpoint('CreativeLineItemAssociation')
+    templates = LazyEndpoint('CreativeTemplates')
 
     def retrieve(self, creative_id, **kwargs):
         """
@@ -32,14 +27,14 @@ class Creative(BaseAPI):
             create_date, update_date
         """
         parameters = dict(creative_id=creative_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: creative_id, advertiser_id, alternative_id, creative_name, creative_type,
             creative_template_id, active, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, advertiser_id, creative_name, creative_type, secure, creative_template_id, active, **kwargs):
         """
@@ -55,7 +50,7 @@ class Creative(BaseAPI):
         """
         parameters = dict(advertiser_id=advertiser_id, creative_name=creative_name, creative_type=creative_type,
                           secure=secure, creative_template_id=creative_template_id, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, creative_id, **kwargs):
         """
@@ -66,14 +61,14 @@ class Creative(BaseAPI):
             creative_addons, creative_thumbnail_url, start_date, end_date, notes, active
         """
         parameters = dict(creative_id=creative_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, creative_id):
         """
         :type creative_id: int
         """
         parameters = dict(creative_id=creative_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class CreativeAddon(BaseAPI):
@@ -93,17 +88,14 @@ class CreativeAddon(BaseAPI):
         parameters = dict(creative_addon_name=creative_addon_name, creative_addon_type=creative_addon_type,
                           active=active, creative_addon_content=creative_addon_content, **kwargs)
         parameters['global'] = is_global
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
 
 class CreativeApproval(BaseAPI):
     """Beeswax Creative Approval API class"""
 
     paths = ['creative_approval_queue']
-
-    def __init__(self, *args, **kwargs):
-        super(CreativeApproval, self).__init__(*args, **kwargs)
-        self.history = CreativeApprovalHistory(self._dal)
+    history = LazyEndpoint('CreativeApprovalHistory')
 
     def retrieve(self, creative_approval_id, **kwargs):
         """
@@ -111,14 +103,14 @@ class CreativeApproval(BaseAPI):
         :param dict kwargs: creative_id, vendor_id, action, request_date, request_status, approved, update_date
         """
         parameters = dict(creative_approval_id=creative_approval_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: creative_approval_id, creative_id, vendor_id, action, request_date, request_status,
             approved, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class CreativeApprovalHistory(BaseAPI):
@@ -133,24 +125,21 @@ class CreativeApprovalHistory(BaseAPI):
             approved, update_date
         """
         parameters = dict(creative_approval_queue_history_id=creative_approval_queue_history_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: creative_approval_queue_history_id, creative_approval_id, creative_id, vendor_id, action,
             request_date, request_status, approved, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class CreativeAsset(BaseAPI):
     """Beeswax Creative Asset API class"""
 
     paths = ['creative_asset']
-
-    def __init__(self, *args, **kwargs):
-        super(CreativeAsset, self).__init__(*args, **kwargs)
-        self.video = CreativeVideoAsset(self._dal)
+    video = LazyEndpoint('CreativeVideoAsset')
 
     def retrieve(self, creative_asset_id, **kwargs):
         """
@@ -158,13 +147,13 @@ class CreativeAsset(BaseAPI):
         :param dict kwargs: advertiser_id, creative_asset_name, active, asset_type, mime_type
         """
         parameters = dict(creative_asset_id=creative_asset_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: creative_asset_id, advertiser_id, creative_asset_name, active, asset_type, mime_type
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, creative_asset_name, size_in_bytes, active, **kwargs):
         """
@@ -174,7 +163,7 @@ class CreativeAsset(BaseAPI):
         :param dict kwargs: advertiser_id, notes
         """
         parameters = dict(creative_asset_name=creative_asset_name, size_in_bytes=size_in_bytes, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
 
 class CreativeVideoAsset(BaseAPI):
@@ -193,7 +182,7 @@ class CreativeVideoAsset(BaseAPI):
         """
         parameters = dict(advertiser_id=advertiser_id, creative_asset_name=creative_asset_name, active=active,
                           size_in_bytes=size_in_bytes, video_encoding_profile=video_encoding_profile, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
 
 class CreativeBulkUpload(BaseAPI):
@@ -207,13 +196,13 @@ class CreativeBulkUpload(BaseAPI):
         :param dict kwargs: advertiser_id, active, creative_template_id, create_date, update_date
         """
         parameters = dict(cbu_id=cbu_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: cbu_id, advertiser_id, active, creative_template_id, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, file_path, advertiser_id, size_in_bytes, active, bulk_type, **kwargs):
         """
@@ -228,7 +217,7 @@ class CreativeBulkUpload(BaseAPI):
         # todo: check this works, not sure if files should be byte packed or not...
         parameters = dict(
             advertiser_id=advertiser_id, size_in_bytes=size_in_bytes, active=active, bulk_type=bulk_type, **kwargs)
-        upload_request_data = self._call('POST', data=ujson.dumps(parameters))
+        upload_request_data = self._call('POST', data=self._dumps(parameters))
         return self._dal.call('POST', self.paths + ['upload', upload_request_data['payload']['id']], files=file_path)
 
 
@@ -243,13 +232,13 @@ class CreativeLineItemAssociation(BaseAPI):
         :param dict kwargs: creative_id, line_item_id, start_date, end_date, active
         """
         parameters = dict(cli_id=cli_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: cli_id, creative_id, line_item_id, start_date, end_date, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, creative_id, line_item_id, active, **kwargs):
         """
@@ -259,7 +248,7 @@ class CreativeLineItemAssociation(BaseAPI):
         :param dict kwargs: weighting, start_date, end_date
         """
         parameters = dict(creative_id=creative_id, line_item_id=line_item_id, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, cli_id, **kwargs):
         """
@@ -267,7 +256,7 @@ class CreativeLineItemAssociation(BaseAPI):
         :param dict kwargs: weighting, start_date, end_date, active
         """
         parameters = dict(cli_id=cli_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class CreativeTemplates(BaseAPI):
@@ -281,13 +270,13 @@ class CreativeTemplates(BaseAPI):
         :param dict kwargs: creative_template_name, creative_type, is_video, is_global, active
         """
         parameters = dict(creative_template_id=creative_template_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: creative_template_id, creative_template_name, creative_type, is_video, is_global, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, creative_template_name, is_global, rendering_key, creative_template_content, active, **kwargs):
         """
@@ -301,7 +290,7 @@ class CreativeTemplates(BaseAPI):
         parameters = dict(creative_template_name=creative_template_name, rendering_key=rendering_key,
                           creative_template_content=creative_template_content, active=active, **kwargs)
         parameters['global'] = is_global
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, creative_template_id, **kwargs):
         """
@@ -310,4 +299,4 @@ class CreativeTemplates(BaseAPI):
             creative_attributes, is_video, notes, active
         """
         parameters = dict(creative_template_id=creative_template_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
@@ -6,9 +6,7 @@ honestly i couldn't think of a good name for this file, so extenstions it is...
 """
 from __future__ import unicode_literals
 
-import ujson
-
-from beeswax_wrapper.core.base_classes import BaseAPI
+from beeswax_wrapper.core.base_classes import BaseAPI, LazyEndpoint
 
 
 class BidModifier(BaseAPI):
@@ -22,13 +20,13 @@ class BidModifier(BaseAPI):
         :param dict kwargs: advertiser_id, alternative_id, bid_modifier_name, active
         """
         parameters = dict(bid_modifier_id=bid_modifier_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: bid_modifier_id, advertiser_id, alternative_id, bid_modifier_name, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, bid_modifier_name, bid_modifier_terms, active, **kwargs):
         """
@@ -40,7 +38,7 @@ class BidModifier(BaseAPI):
         """
         parameters = dict(
             bid_modifier_name=bid_modifier_name, bid_modifier_terms=bid_modifier_terms, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, bid_modifier_id, active, **kwargs):
         """
@@ -49,14 +47,14 @@ class BidModifier(BaseAPI):
         :param dict kwargs: alternative_id, bid_modifier_name, bid_modifier_terms, notes
         """
         parameters = dict(bid_modifier_id=bid_modifier_id, active=active, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, bid_modifier_id):
         """
         :type bid_modifier_id: int
         """
         parameters = dict(bid_modifier_id=bid_modifier_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class CustomList(BaseAPI):
@@ -70,13 +68,13 @@ class CustomList(BaseAPI):
         :param dict kwargs: list_name, list_type, active, create_date, update_date
         """
         parameters = dict(list_id=list_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: list_id, list_name, list_type, active, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, list_name, list_type, **kwargs):
         """
@@ -85,7 +83,7 @@ class CustomList(BaseAPI):
         :param dict kwargs: delimiter
         """
         parameters = dict(list_name=list_name, list_type=list_type, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, list_id, **kwargs):
         """
@@ -93,24 +91,21 @@ class CustomList(BaseAPI):
         :param dict kwargs: list_name, list_type, delimiter, alternative_id, notes, active
         """
         parameters = dict(list_id=list_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, custom_list_id):
         """
         :type custom_list_id: int
         """
         parameters = dict(custom_list_id=custom_list_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class ListItem(BaseAPI):
     """Beeswax List Item API class"""
 
     paths = ['list_item']
-
-    def __init__(self, *args, **kwargs):
-        super(ListItem, self).__init__(*args, **kwargs)
-        self.bulk_uploads = ListItemsBulkUpload(self._dal)
+    bulk_uploads = LazyEndpoint('ListItemsBulkUpload')
 
     def retrieve(self, list_item_id, **kwargs):
         """
@@ -118,13 +113,13 @@ class ListItem(BaseAPI):
         :param dict kwargs: list_id, list_item, active
         """
         parameters = dict(list_item_id=list_item_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: list_item_id, list_id, list_item, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, list_id, list_item, **kwargs):
         """
@@ -133,7 +128,7 @@ class ListItem(BaseAPI):
         :param dict kwargs: value, active
         """
         parameters = dict(list_id=list_id, list_item=list_item, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, list_item_id, **kwargs):
         """
@@ -141,7 +136,7 @@ class ListItem(BaseAPI):
         :param dict kwargs: value, active
         """
         parameters = dict(list_item_id=list_item_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, list_item_id, list_id):
         """
@@ -149,7 +144,7 @@ class ListItem(BaseAPI):
         :type list_id: int
         """
         parameters = dict(list_item_id=list_item_id, list_id=list_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class ListItemsBulkUpload(BaseAPI):
@@ -161,7 +156,7 @@ class ListItemsBulkUpload(BaseAPI):
         assert list_items is not None or file_path is not None, 'Must set either list_items or file_path.'
         if list_items:
             parameters = dict(list_id=list_id, list_items=list_items)
-            return self._call('POST', data=ujson.dumps(parameters))
+            return self._call('POST', data=self._dumps(parameters))
         else:
             return self._dal.call('POST', self.paths + ['upload', list_id], files=file_path)
 
@@ -180,7 +175,7 @@ class NativeOffer(BaseAPI):
         """
         parameters = dict(native_offer_id=native_offer_id, advertiser_id=advertiser_id,
                           native_offer_name=native_offer_name, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def create(self, advertiser_id, native_offer_name, *kwargs):
         """
@@ -191,7 +186,7 @@ class NativeOffer(BaseAPI):
             notes, active, phone, address, display_url, star_rating, price, sale_price, currency
         """
         parameters = dict(advertiser_id=advertiser_id, native_offer_name=native_offer_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, native_offer_id, advertiser_id, native_offer_name, **kwargs):
         """
@@ -204,7 +199,7 @@ class NativeOffer(BaseAPI):
         """
         parameters = dict(native_offer_id=native_offer_id, advertiser_id=advertiser_id,
                           native_offer_name=native_offer_name, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class PushQueue(BaseAPI):
@@ -219,24 +214,21 @@ class PushQueue(BaseAPI):
             update_date
         """
         parameters = dict(push_id=push_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: push_id, object_id, object_type, action, push_request_date, push_status,
             push_complete_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class Report(BaseAPI):
     """Beeswax Report API class"""
 
     paths = ['report_save']
-
-    def __init__(self, *args, **kwargs):
-        super(Report, self).__init__(*args, **kwargs)
-        self.queues = ReportQueue(self._dal)
+    queues = LazyEndpoint('ReportQueue')
 
     def retrieve(self, report_save_id, **kwargs):
         """
@@ -244,14 +236,14 @@ class Report(BaseAPI):
         :param dict kwargs: report_name, report_id, advertiser_id, user_id, frequency, active, create_date, update_date
         """
         parameters = dict(report_save_id=report_save_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: report_save_id, report_name, report_id, advertiser_id, user_id, frequency, active,
             create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, report_name, report_id, **kwargs):
         """
@@ -262,7 +254,7 @@ class Report(BaseAPI):
             active
         """
         parameters = dict(report_id=report_id, report_name=report_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, report_save_id, **kwargs):
         """
@@ -271,14 +263,14 @@ class Report(BaseAPI):
             email_to, email_cc, active
         """
         parameters = dict(report_save_id=report_save_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, report_save_id):
         """
         :type report_save_id: int
         """
         parameters = dict(report_save_id=report_save_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class ReportQueue(BaseAPI):
@@ -291,7 +283,7 @@ class ReportQueue(BaseAPI):
         :type report_queue_id: int
         """
         parameters = dict(report_queue_id=report_queue_id)
-        return self._call('GET', data=ujson.dumps(parameters))
+        return self._call('GET', data=self._dumps(parameters))
 
     def create(self, report_id, **kwargs):
         """
@@ -300,7 +292,7 @@ class ReportQueue(BaseAPI):
         :param dict kwargs: report_name, request_details, report_format
         """
         parameters = dict(report_id=report_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
 
 class Strategy(BaseAPI):
@@ -314,14 +306,14 @@ class Strategy(BaseAPI):
         :param dict kwargs: line_item_type_id, strategy_name, active, default_strategy, create_date, update_date
         """
         parameters = dict(strategy_id=strategy_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: strategy_id, line_item_type_id, strategy_name, active, default_strategy, create_date,
             update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class TargetingTemplate(BaseAPI):
@@ -335,14 +327,14 @@ class TargetingTemplate(BaseAPI):
         :param dict kwargs: template_name, alternative_id, strategy_id, active, create_date, update_date
         """
         parameters = dict(targeting_template_id=targeting_template_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: targeting_template_id, template_name, alternative_id, strategy_id, active, create_date,
             update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, template_name, **kwargs):
         """
@@ -350,7 +342,7 @@ class TargetingTemplate(BaseAPI):
         :param dict kwargs: alternative_id, strategy_id, targeting, active
         """
         parameters = dict(template_name=template_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, targeting_template_id, **kwargs):
         """
@@ -358,24 +350,21 @@ class TargetingTemplate(BaseAPI):
         :param dict kwargs: template_name, alternative_id, strategy_id, targeting, active
         """
         parameters = dict(targeting_template_id=targeting_template_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, targeting_template_id):
         """
         :type targeting_template_id: int
         """
         parameters = dict(targeting_template_id=targeting_template_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class Vendor(BaseAPI):
     """Beeswax Vendor API class"""
 
     paths = ['vendor']
-
-    def __init__(self, *args, **kwargs):
-        super(Vendor, self).__init__(*args, **kwargs)
-        self.fees = VendorFee(self._dal)
+    fees = LazyEndpoint('VendorFee')
 
     def retrieve(self, vendor_id, **kwargs):
         """
@@ -383,13 +372,13 @@ class Vendor(BaseAPI):
         :param dict kwargs: vendor_name, global, create_date, update_date
         """
         parameters = dict(vendor_id=vendor_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: vendor_id, vendor_name, global, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, vendor_name, **kwargs):
         """
@@ -398,7 +387,7 @@ class Vendor(BaseAPI):
         :return:
         """
         parameters = dict(vendor_name=vendor_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, vendor_id, **kwargs):
         """
@@ -406,14 +395,14 @@ class Vendor(BaseAPI):
         :param dict kwargs: vendor_name, fee_type, fee_amount, global
         """
         parameters = dict(vendor_id=vendor_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, vendor_id):
         """
         :type vendor_id: int
         """
         parameters = dict(vendor_id=vendor_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class VendorFee(BaseAPI):
@@ -427,13 +416,13 @@ class VendorFee(BaseAPI):
         :param dict kwargs: vendor_id, vendor_fee_name, object_id, object_type, create_date, update_date
         """
         parameters = dict(vendor_fee_id=vendor_fee_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: vendor_fee_id, vendor_id, vendor_fee_name, object_id, object_type, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, vendor_id, object_id, object_type, **kwargs):
         """
@@ -443,7 +432,7 @@ class VendorFee(BaseAPI):
         :param dict kwargs: vendor_fee_name, fee_type, fee_amount, currency
         """
         parameters = dict(vendor_id=vendor_id, object_id=object_id, object_type=object_type, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, vendor_fee_id, **kwargs):
         """
@@ -451,14 +440,14 @@ class VendorFee(BaseAPI):
         :param dict kwargs: vendor_fee_name, fee_type, fee_amount
         """
         parameters = dict(vendor_fee_id=vendor_fee_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, vendor_fee_id):
         """
         :type vendor_fee_id: int
         """
         parameters = dict(vendor_fee_id=vendor_fee_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class Misc(BaseAPI):
@@ -470,27 +459,27 @@ class Misc(BaseAPI):
         """
         :param dict kwargs: user_id, email
         """
-        return self._dal.call('POST', ['resend_user_email'], data=ujson.dumps(kwargs))
+        return self._dal.call('POST', ['resend_user_email'], data=self._dumps(kwargs))
 
     def search(self, **kwargs):
         """
         :param dict kwargs: object_id, object_type, object_name
         """
-        return self._dal.call('GET', ['search'], data=ujson.dumps(kwargs))
+        return self._dal.call('GET', ['search'], data=self._dumps(kwargs))
 
     def user_lookup(self, **kwargs):
-        return self._dal.call('GET', ['user_lookup'], data=ujson.dumps(kwargs))
+        return self._dal.call('GET', ['user_lookup'], data=self._dumps(kwargs))
 
     def view(self, view_name, **kwargs):
         """
         :type view_name: str
         """
         parameters = dict(view_name=view_name, **kwargs)
-        return self._dal.call('GET', ['view'], data=ujson.dumps(parameters))
+        return self._dal.call('GET', ['view'], data=self._dumps(parameters))
 
     def view_list(self, view_name, **kwargs):
         """
         :type view_name: str
         """
         parameters = dict(view_name=view_name, **kwargs)
-        return self._dal.call('GET', ['view'], data=ujson.dumps(parameters))
+        return self._dal.call('GET', ['view'], data=self._dumps(parameters))
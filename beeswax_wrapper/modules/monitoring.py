@@ -5,8 +5,6 @@ API classes to access beeswax monitoring information
 """
 from __future__ import unicode_literals
 
-import ujson
-
 from beeswax_wrapper.core.base_classes import BaseAPI
 
 
@@ -21,13 +19,13 @@ class ActivityLog(BaseAPI):
         :param dict kwargs: user_id, object_id, object_type, activity_date, action, details
         """
         parameters = dict(log_id=log_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: log_id, user_id, object_id, object_type, activity_date, action, details
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class Alert(BaseAPI):
@@ -41,13 +39,13 @@ class Alert(BaseAPI):
         :param dict kwargs: user_id, subject, active, create_date, update_date
         """
         parameters = dict(alert_id=alert_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: alert_id, user_id, subject, active, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, subject, content, from_address, **kwargs):
         """
@@ -57,7 +55,7 @@ class Alert(BaseAPI):
         :param dict kwargs: user_id, account_id, object_type, object_id, is_global, icon, active
         """
         parameters = dict(subject=subject, content=content, from_address=from_address, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, alert_id, **kwargs):
         """
@@ -65,14 +63,14 @@ class Alert(BaseAPI):
         :param dict kwargs: user_id, is_global, active
         """
         parameters = dict(alert_id=alert_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, alert_id):
         """
         :type alert_id: int
         """
         parameters = dict(alert_id=alert_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class Dashboard(BaseAPI):
@@ -85,7 +83,7 @@ class Dashboard(BaseAPI):
         :type dashboard: str
         """
         parameters = dict(dashboard=dashboard)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self):
         return self._call('GET')
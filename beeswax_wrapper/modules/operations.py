@@ -5,9 +5,7 @@ API classes to access beeswax operational objects
 """
 from __future__ import unicode_literals
 
-import ujson
-
-from beeswax_wrapper.core.base_classes import BaseAPI
+from beeswax_wrapper.core.base_classes import BaseAPI, LazyEndpoint
 
 
 class Advertiser(BaseAPI):
@@ -20,13 +18,13 @@ class Advertiser(BaseAPI):
         :param dict kwargs: alternative_id, advertiser_name, create_date, update_date, pretty, time
         """
         parameters = dict(advertiser_id=advertiser_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: advertiser_id, alternative_id, advertiser_name, create_date, update_date, pretty, time
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, advertiser_name, conversion_method_id, **kwargs):
         """
@@ -36,7 +34,7 @@ class Advertiser(BaseAPI):
             default_creative_thumbnail_url
         """
         parameters = dict(advertiser_name=advertiser_name, conversion_method_id=conversion_method_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, advertiser_id, **kwargs):
         """
@@ -45,14 +43,14 @@ class Advertiser(BaseAPI):
             default_currency, default_creative_thumbnail_url
         """
         parameters = dict(advertiser_id=advertiser_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, advertiser_id):
         """
         :type advertiser_id: int
         """
         parameters = dict(advertiser_id=advertiser_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class Campaign(BaseAPI):
@@ -67,14 +65,14 @@ class Campaign(BaseAPI):
             update_date
         """
         parameters = dict(campaign_id=campaign_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: campaign_id, advertiser_id, alternative_id, campaign_name, bid_modifier_id, active,
             create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, advertiser_id, campaign_name, campaign_budget, budget_type,
                start_date, active, **kwargs):
@@ -90,7 +88,7 @@ class Campaign(BaseAPI):
         """
         parameters = dict(advertiser_id=advertiser_id, campaign_name=campaign_name, campaign_budget=campaign_budget,
                           budget_type=budget_type, start_date=start_date, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, campaign_id, **kwargs):
         """
@@ -100,24 +98,21 @@ class Campaign(BaseAPI):
             active
         """
         parameters = dict(campaign_id=campaign_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, campaign_id):
         """
         :type campaign_id: int
         """
         parameters = dict(campaign_id=campaign_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class Event(BaseAPI):
     """Beeswax Event API class"""
 
     paths = ['event']
-
-    def __init__(self, *args, **kwargs):
-        super(Event, self).__init__(*args, **kwargs)
-        self.tags = EventTag(self._dal)
+    tags = LazyEndpoint('EventTag')
 
     def retrieve(self, event_id, **kwargs):
         """
@@ -125,13 +120,13 @@ class Event(BaseAPI):
         :param dict kwargs: event_name, advertiser_id, event_type_id, segment_id, create_date, update_date
         """
         parameters = dict(event_id=event_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: event_id, event_name, advertiser_id, event_type_id, segment_id, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, event_name, advertiser_id, value, **kwargs):
         """
@@ -141,7 +136,7 @@ class Event(BaseAPI):
         :param dict kwargs: event_type_id, segment_id, count_unique, click_window, view_window
         """
         parameters = dict(event_name=event_name, advertiser_id=advertiser_id, value=value, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, event_id, **kwargs):
         """
@@ -150,14 +145,14 @@ class Event(BaseAPI):
             view_window
         """
         parameters = dict(event_id=event_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, event_id):
         """
         :type event_id: int
         """
         parameters = dict(event_id=event_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class EventTag(BaseAPI):
@@ -171,23 +166,20 @@ class EventTag(BaseAPI):
         :param dict kwargs: event_name, advertiser_id, event_type_id, tag_type, format
         """
         parameters = dict(event_id=event_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: event_id, event_name, advertiser_id, event_type_id, tag_type, format
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class LineItem(BaseAPI):
     """Beeswax LineItem API class"""
 
     paths = ['line_item']
-
-    def __init__(self, *args, **kwargs):
-        super(LineItem, self).__init__(*args, **kwargs)
-        self.flights = LineItemFlight(self._dal)
+    flights = LazyEndpoint('LineItemFlight')
 
     def retrieve(self, line_item_id, **kwargs):
         """
@@ -196,14 +188,14 @@ class LineItem(BaseAPI):
             bid_modifier_id, start_date, end_date, create_date, update_date
         """
         parameters = dict(line_item_id=line_item_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: line_item_id, campaign_id, advertiser_id, alternative_id, line_item_type_id, line_item_name,
             bid_modifier_id, start_date, end_date, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, advertiser_id, line_item_type_id, line_item_name, line_item_budget, budget_type, bidding,
                start_date, active, **kwargs):
@@ -222,7 +214,7 @@ class LineItem(BaseAPI):
         parameters = dict(advertiser_id=advertiser_id, line_item_type_id=line_item_type_id,
                           line_item_name=line_item_name, line_item_budget=line_item_budget, budget_type=budget_type,
                           bidding=bidding, start_date=start_date, active=active, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, line_item_id, **kwargs):
         """
@@ -232,14 +224,14 @@ class LineItem(BaseAPI):
             bid_modifier_id, max_bid, bidding, start_date, end_date, frequency_cap, notes, active
         """
         parameters = dict(line_item_id=line_item_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, line_item_id):
         """
         :type line_item_id: int
         """
         parameters = dict(line_item_id=line_item_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class LineItemFlight(BaseAPI):
@@ -253,13 +245,13 @@ class LineItemFlight(BaseAPI):
         :param dict kwargs: flight_name, start_date, end_date, alternative_id, active
         """
         parameters = dict(flight_id=flight_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: flight_id, flight_name, start_date, end_date, alternative_id, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, start_date, line_item_id, **kwargs):
         """
@@ -268,7 +260,7 @@ class LineItemFlight(BaseAPI):
         :param dict kwargs: flight_name, budget, end_date, alternative_id, notes, active
         """
         parameters = dict(start_date=start_date, line_item_id=line_item_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, start_date, **kwargs):
         """
@@ -276,8 +268,8 @@ class LineItemFlight(BaseAPI):
         :param dict kwargs: flight_id, flight_name, budget, end_date, alternative_id, notes, active
         """
         parameters = dict(start_date=start_date, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, flight_id):
         parameters = dict(flight_id=flight_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
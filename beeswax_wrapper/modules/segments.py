@@ -6,24 +6,23 @@ I don't really like this separation, but there are so many segment endpoints...
 """
 from __future__ import unicode_literals
 
-import ujson
+from functools import partial
 
-from beeswax_wrapper.core.base_classes import BaseAPI
+from beeswax_wrapper.core.base_classes import BaseAPI, LazyEndpoint
+from beeswax_wrapper.core.codecs import get_codec
+from beeswax_wrapper.core.pipeline import chunked
 
 
 class Segment(BaseAPI):
     """Beeswax Segment API class"""
 
     paths = ['segment']
-
-    def __init__(self, *args, **kwargs):
-        super(Segment, self).__init__(*args, **kwargs)
-        self.tags = SegmentTag(self._dal)
-        self.categories = SegmentCategoryAssociation(self._dal)
-        self.sharing = SegmentSharing(self._dal)
-        self.lookups = SegmentLookup(self._dal)
-        self.updates = SegmentUpdate(self._dal)
-        self.uploads = SegmentUpload(self._dal)
+    tags = LazyEndpoint('SegmentTag')
+    categories = LazyEndpoint('SegmentCategoryAssociation')
+    sharing = LazyEndpoint('SegmentSharing')
+    lookups = LazyEndpoint('SegmentLookup')
+    updates = LazyEndpoint('SegmentUpdate')
+    uploads = LazyEndpoint('SegmentUpload')
 
     def retrieve(self, segment_id, **kwargs):
         """
@@ -31,13 +30,13 @@ class Segment(BaseAPI):
         :param dict kwargs: segment_key, segment_name, alternative_id, advertiser_id, segment_description
         """
         parameters = dict(segment_id=segment_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_id, segment_key, segment_name, alternative_id, advertiser_id, segment_description
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, segment_name, **kwargs):
         """
@@ -45,7 +44,7 @@ class Segment(BaseAPI):
         :param dict kwargs: alternative_id, advertiser_id, segment_description, cpm_cost, ttl_days, aggregate_excludes
         """
         parameters = dict(segment_name=segment_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, segment_id, **kwargs):
         """
@@ -54,7 +53,7 @@ class Segment(BaseAPI):
             aggregate_excludes
         """
         parameters = dict(segment_id=segment_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class SegmentTag(BaseAPI):
@@ -68,25 +67,22 @@ class SegmentTag(BaseAPI):
         :param dict kwargs: segment_name, advertiser_id, tag_type, format
         """
         parameters = dict(segment_tag=segment_tag, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_tag, segment_name, advertiser_id, tag_type, format
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class SegmentCategory(BaseAPI):
     """Beeswax Segment Category API class"""
 
     paths = ['segment_category']
-
-    def __init__(self, *args, **kwargs):
-        super(SegmentCategory, self).__init__(*args, **kwargs)
-        self.segments = SegmentCategoryAssociation(self._dal)
-        self.lookups = SegmentCategoryLookup(self._dal)
-        self.sharing = SegmentCategorySharing(self._dal)
+    segments = LazyEndpoint('SegmentCategoryAssociation')
+    lookups = LazyEndpoint('SegmentCategoryLookup')
+    sharing = LazyEndpoint('SegmentCategorySharing')
 
     def retrieve(self, segment_category_id, **kwargs):
         """
@@ -95,14 +91,14 @@ class SegmentCategory(BaseAPI):
             advertiser_id
         """
         parameters = dict(segment_category_id=segment_category_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_category_id, alternative_id, segment_category_key, segment_category_name,
             parent_category_key, advertiser_id
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, segment_category_name, **kwargs):
         """
@@ -110,7 +106,7 @@ class SegmentCategory(BaseAPI):
         :param dict kwargs: alternative_id, parent_category_key, advertiser_id
         """
         parameters = dict(segment_category_name=segment_category_name, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, segment_category_id, **kwargs):
         """
@@ -118,14 +114,14 @@ class SegmentCategory(BaseAPI):
         :param dict kwargs: segment_category_name, alternativ_id, alternative_id, advertiser_id
         """
         parameters = dict(segment_category_id=segment_category_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
     def delete(self, segment_category_id):
         """
         :type segment_category_id: int
         """
         parameters = dict(segment_category_id=segment_category_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class SegmentCategoryAssociation(BaseAPI):
@@ -139,13 +135,13 @@ class SegmentCategoryAssociation(BaseAPI):
         :param dict kwargs: segment_category_key, segment_key
         """
         parameters = dict(segment_category_association_id=segment_category_association_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_category_association_id, segment_category_key, segment_key
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, segment_category_key, segment_key):
         """
@@ -153,14 +149,14 @@ class SegmentCategoryAssociation(BaseAPI):
         :type segment_key: int
         """
         parameters = dict(segment_category_key=segment_category_key, segment_key=segment_key)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def delete(self, segment_category_association_id):
         """
         :type segment_category_association_id: int
         """
         parameters = dict(segment_category_association_id=segment_category_association_id)
-        return self._call('DELETE', data=ujson.dumps(parameters))
+        return self._call('DELETE', data=self._dumps(parameters))
 
 
 class SegmentSharing(BaseAPI):
@@ -174,13 +170,13 @@ class SegmentSharing(BaseAPI):
         :param dict kwargs: segment_key, shared_account_id, active
         """
         parameters = dict(segment_sharing_id=segment_sharing_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_sharing_id, segment_key, shared_account_id, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, segment_key, shared_account_id, **kwargs):
         """
@@ -189,7 +185,7 @@ class SegmentSharing(BaseAPI):
         :param dict kwargs: active, cpm_cost
         """
         parameters = dict(segment_key=segment_key, shared_account_id=shared_account_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, segment_sharing_id, **kwargs):
         """
@@ -197,7 +193,7 @@ class SegmentSharing(BaseAPI):
         :param dict kwargs: segment_key, shared_account_id, active, cpm_cost
         """
         parameters = dict(segment_sharing_id=segment_sharing_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class SegmentCategorySharing(BaseAPI):
@@ -211,13 +207,13 @@ class SegmentCategorySharing(BaseAPI):
         :param dict kwargs: segment_category_key, shared_account_id, active
         """
         parameters = dict(segment_category_sharing_id=segment_category_sharing_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_category_sharing_id, segment_category_key, shared_account_id, active
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, segment_category_key, shared_account_id, **kwargs):
         """
@@ -226,7 +222,7 @@ class SegmentCategorySharing(BaseAPI):
         :param dict kwargs: active, cpm_cost
         """
         parameters = dict(segment_category_key=segment_category_key, shared_account_id=shared_account_id, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
 
     def update(self, segment_category_sharing_id, **kwargs):
         """
@@ -234,7 +230,7 @@ class SegmentCategorySharing(BaseAPI):
         :param dict kwargs: segment_key, shared_account_id, active, cpm_cost
         """
         parameters = dict(segment_category_sharing_id=segment_category_sharing_id, **kwargs)
-        return self._call('PUT', data=ujson.dumps(parameters))
+        return self._call('PUT', data=self._dumps(parameters))
 
 
 class SegmentLookup(BaseAPI):
@@ -248,13 +244,13 @@ class SegmentLookup(BaseAPI):
         :param dict kwargs: segment_key, segment_name, source
         """
         parameters = dict(segment_id=segment_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_id, segment_key, segment_name, source
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class SegmentCategoryLookup(BaseAPI):
@@ -268,13 +264,13 @@ class SegmentCategoryLookup(BaseAPI):
         :param dict kwargs: segment_category_key, segment_category_name, source
         """
         parameters = dict(segment_category_id=segment_category_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_category_id, segment_category_key, segment_category_name, source
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
 
 class SegmentUpload(BaseAPI):
@@ -288,13 +284,13 @@ class SegmentUpload(BaseAPI):
         :param dict kwargs: file_name, upload_status, upload_complete_date, create_date, update_date
         """
         parameters = dict(segment_upload_id=segment_upload_id, **kwargs)
-        return self._call('GET', data=ujson.dumps(parameters))[0]
+        return self._call('GET', data=self._dumps(parameters))[0]
 
     def list(self, **kwargs):
         """
         :param dict kwargs: segment_upload_id, file_name, upload_status, upload_complete_date, create_date, update_date
         """
-        return self._call('GET', data=ujson.dumps(kwargs))
+        return self._call('GET', data=self._dumps(kwargs))
 
     def create(self, user_id_type, **kwargs):
         """
@@ -304,10 +300,10 @@ class SegmentUpload(BaseAPI):
         """
         parameters = dict(user_id_type=user_id_type, **kwargs)
         if 'segment_file_list' in parameters:
-            return self._call('POST', data=ujson.dumps(parameters))
+            return self._call('POST', data=self._dumps(parameters))
         else:
             files = kwargs.pop('path_to_file')
-            upload_request_data = self._call('POST', data=ujson.dumps(parameters))
+            upload_request_data = self._call('POST', data=self._dumps(parameters))
             return self._dal.call('POST', self.paths + ['upload', upload_request_data['payload']['id']], files=files)
 
 
@@ -322,4 +318,38 @@ class SegmentUpdate(BaseAPI):
         :param dict kwargs: continent, segment_key_type, user_id_type
         """
         parameters = dict(user_data=user_data, **kwargs)
-        return self._call('POST', data=ujson.dumps(parameters))
+        return self._call('POST', data=self._dumps(parameters))
+
+    def push(self, user_data, chunk_size=10000, build_user=None, processes=None, upload_workers=4, **kwargs):
+        """
+        Pushes any number of users in segment updates of chunk_size users
+        The updates are built and serialized in a process pool while the DAL uploads them, from a thread pool
+        or on the event loop for an AsyncBeeswaxDAL (the result is then awaitable)
+        :param collections.Iterable user_data: user data entries, or rows built into entries by build_user
+        :param int chunk_size: users per segment update
+        :param callable build_user: builds a user data entry from a row in the process pool, must be picklable
+        :param int processes: encoding processes, None for the number of cores and 0 to encode in this process
+        :param int upload_workers: concurrent uploads
+        :param dict kwargs: continent, segment_key_type, user_id_type
+        :rtype: beeswax_wrapper.core.batch.BulkResult
+        :return: the results and errors by chunk index
+        """
+        return self._dal.pipeline_call(
+            partial(encode_segment_update, build_user=build_user, parameters=kwargs, codec=self._dal.codec),
+            lambda body: self._call('POST', data=body),
+            chunked(user_data, chunk_size), processes=processes, upload_workers=upload_workers
+        )
+
+
+def encode_segment_update(user_data, build_user=None, parameters=None, codec=None):
+    """
+    The body of a segment update, run in the SegmentUpdate.push process pool
+    :type user_data: list
+    :type build_user: callable
+    :param dict parameters: continent, segment_key_type, user_id_type
+    :param codec: the DAL's beeswax_wrapper.core.codecs.JSONCodec, None for the default
+    :rtype: bytes
+    """
+    if build_user is not None:
+        user_data = [build_user(row) for row in user_data]
+    return get_codec(codec).dumps(dict(parameters or {}, user_data=user_data))
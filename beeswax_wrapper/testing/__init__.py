@@ -0,0 +1,6 @@
+"""
+Testing tools for applications using the beeswax wrapper
+Includes:
+- an in-process fake Beeswax server for benchmarks
+- a local Beeswax simulator extending it, injecting latency and faults for load and resilience testing
+"""
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-process stand-in for the Beeswax REST API, serving in-memory objects over http on the loopback interface
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> from beeswax_wrapper.core.access import BeeswaxDAL
+>>> from beeswax_wrapper.testing.server import FakeBeeswax
+>>> with FakeBeeswax() as server:
+...     server.populate('line_item', [{'line_item_id': i} for i in range(1, 1001)])
+...     api = BeeswaxAPI(dal=BeeswaxDAL(server.url))
+...     api.line_items.list()
+"""
+from __future__ import unicode_literals
+
+import itertools
+import socket
+import sys
+import threading
+import time
+import ujson
+import zlib
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    fake = None
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], socket.error):  # clients closing their connections are expected
+            HTTPServer.handle_error(self, request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, as the Beeswax API
+    disable_nagle_algorithm = True  # the headers and body are written separately
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.fake.count_connection(1)
+
+    def finish(self):
+        try:
+            BaseHTTPRequestHandler.finish(self)
+        finally:
+            self.server.fake.count_connection(-1)
+
+    def _handle(self):
+        self.server.fake.handle(self)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeBeeswax(object):
+    """
+    Serves every endpoint path: GETs list (or filter on the <path>_id and rows/offset parameters) the populated objects,
+    other methods succeed with a new id. /authenticate sets a session cookie.
+    The server shares the GIL of the process, set a latency to simulate the time the Beeswax servers take.
+    """
+
+    prefix = '/rest/'
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0):
+        """
+        :type host: str
+        :param int port: 0 for any free port
+        :param float latency: seconds each request takes before its response
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self._objects = {}  # endpoint: [object, ...]
+        self._index = {}  # endpoint: {id: object}
+        self._bodies = {}  # endpoint: the encoded list response
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        """The endpoint_url of a DAL calling the server"""
+        return 'http://{}:{}{}'.format(self.host, self.port, self.prefix)
+
+    def start(self):
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.fake = self
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05})  # quick stops
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def populate(self, endpoint, objects):
+        """
+        :param str endpoint: e.g. 'line_item'
+        :param list[dict] objects: the objects listed by the endpoint, with their <endpoint>_id
+        """
+        id_key = '{}_id'.format(endpoint)
+        with self._lock:
+            self._objects[endpoint] = list(objects)
+            self._index[endpoint] = dict((obj[id_key], obj) for obj in objects if id_key in obj)
+            self._bodies[endpoint] = self.encode(self._objects[endpoint])
+
+    def count_connection(self, increment):
+        """Called as the connections open (1) and close (-1)"""
+
+    @staticmethod
+    def encode(payload, success=True):
+        """
+        :rtype: bytes
+        """
+        return ujson.dumps({'success': success, 'payload': payload}).encode('utf-8')
+
+    @staticmethod
+    def read_body(request):
+        """
+        :type request: BaseHTTPRequestHandler
+        :rtype: bytes
+        """
+        body = request.rfile.read(int(request.headers.get('Content-Length') or 0))
+        if request.headers.get('Content-Encoding') == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        return body
+
+    @staticmethod
+    def parameters(request, body):
+        """
+        :rtype: dict
+        :return: the json parameters of the request, empty for multipart uploads
+        """
+        if not body or 'multipart' in (request.headers.get('Content-Type') or ''):
+            return {}
+        return ujson.loads(body)
+
+    @staticmethod
+    def send_headers(request, status, length, headers=()):
+        """
+        :type request: BaseHTTPRequestHandler
+        :type status: int
+        :param int length: of the body
+        :param headers: extra (name, value) headers
+        """
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(length))
+        for name, value in headers:
+            request.send_header(name, value)
+        request.end_headers()
+
+    def respond(self, request, body, status=200, headers=()):
+        """
+        :type request: BaseHTTPRequestHandler
+        :type body: bytes
+        :type status: int
+        :param headers: extra (name, value) headers
+        """
+        self.send_headers(request, status, len(body), headers)
+        request.wfile.write(body)
+
+    def handle(self, request):
+        """
+        Respond to a request, called in the thread of its connection
+        :type request: BaseHTTPRequestHandler
+        """
+        paths = request.path[len(self.prefix):].split('?')[0].strip('/').split('/')
+        parameters = self.parameters(request, self.read_body(request))
+        if self.latency:
+            time.sleep(self.latency)
+
+        if paths[0] == 'authenticate':
+            return self.respond(request, self.encode({}), headers=[('Set-Cookie', 'session={}; Path=/'.format(
+                next(self._ids)))])
+        if request.command == 'GET':
+            return self.respond(request, self.list(paths[0], parameters))
+        return self.respond(request, self.encode({'id': next(self._ids)}))
+
+    def list(self, endpoint, parameters):
+        """
+        :rtype: bytes
+        :return: the list response of the objects matching the parameters
+        """
+        id_key = '{}_id'.format(endpoint)
+        with self._lock:
+            if id_key in parameters:
+                obj = self._index.get(endpoint, {}).get(parameters[id_key])
+                return self.encode([obj] if obj is not None else [])
+            objects = self._objects.get(endpoint, [])
+            if 'rows' in parameters:
+                offset = parameters.get('offset', 0)
+                return self.encode(objects[offset:offset + parameters['rows']])
+            if endpoint not in self._bodies:
+                self._bodies[endpoint] = self.encode(objects)
+            return self._bodies[endpoint]
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Local Beeswax simulator for load and resilience testing
+Extends the FakeBeeswax server to serve the endpoint paths of beeswax_wrapper.modules from memory
+with the /authenticate session semantics, and injects latency, errors, disconnects, throttling, session expiry
+and slow bodies.
+Usage:
+>>> from beeswax_wrapper import BeeswaxAPI
+>>> from beeswax_wrapper.core.access import BeeswaxDAL
+>>> from beeswax_wrapper.testing.simulator import BeeswaxSimulator, Faults, LogNormalLatency
+>>> with BeeswaxSimulator(faults=Faults(latency=LogNormalLatency(median=0.05, sigma=0.6), error_rate=0.01),
+...                       session_lifetime=300, rate_limit=(10, 20)) as simulator:
+...     simulator.populate('line_item', [{'line_item_id': i, 'active': True} for i in range(1, 1001)])
+...     api = BeeswaxAPI('user@example.com', 'password', dal=BeeswaxDAL(simulator.url))
+...     api.line_items.list()
+...     simulator.stats()  # requests, statuses, authentications, connections...
+"""
+from __future__ import division, unicode_literals
+
+import math
+import random
+import time
+import ujson
+import uuid
+
+from six.moves.http_cookies import SimpleCookie
+
+from beeswax_wrapper.core.rate_limit import TokenBucket
+from beeswax_wrapper.testing.server import FakeBeeswax
+
+
+SESSION_COOKIE = 'session'
+MISC_ENDPOINTS = {'resend_user_email', 'search', 'user_lookup', 'view'}
+
+
+class Latency(object):
+    """Distribution of the time the simulated servers take to respond"""
+
+    def sample(self, rng):
+        """
+        :type rng: random.Random
+        :rtype: float
+        :return: seconds
+        """
+        raise NotImplementedError
+
+
+class ConstantLatency(Latency):
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def sample(self, rng):
+        return self.seconds
+
+
+class UniformLatency(Latency):
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng):
+        return rng.uniform(self.low, self.high)
+
+
+class LogNormalLatency(Latency):
+    """Long tailed latencies as seen from real APIs"""
+
+    def __init__(self, median, sigma=0.5, maximum=None):
+        """
+        :param float median: seconds
+        :param float sigma: spread of the tail, the p99 is about median * exp(2.33 * sigma)
+        :param float maximum: seconds, None for no bound
+        """
+        self.median = median
+        self.sigma = sigma
+        self.maximum = maximum
+
+    def sample(self, rng):
+        seconds = self.median * math.exp(rng.gauss(0, self.sigma))
+        return seconds if self.maximum is None else min(seconds, self.maximum)
+
+
+class Faults(object):
+    """The latency and failures injected in the responses of an endpoint"""
+
+    def __init__(self, latency=None, error_rate=0.0, error_status=503, disconnect_rate=0.0, bytes_per_second=None):
+        """
+        :param latency: seconds or Latency before the response headers are sent, None for none
+        :param float error_rate: fraction of the requests failing with error_status
+        :param int error_status: e.g. 500, 503 or 504
+        :param float disconnect_rate: fraction of the requests whose connection is closed without a response
+        :param int bytes_per_second: response body bandwidth, None for no limit
+        """
+        self.latency = ConstantLatency(latency) if isinstance(latency, (int, float)) else latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.disconnect_rate = disconnect_rate
+        self.bytes_per_second = bytes_per_second
+
+
+def module_endpoints():
+    """
+    :rtype: set[str]
+    :return: the first path of every api class in beeswax_wrapper.modules and the custom Misc endpoints
+    """
+    from beeswax_wrapper.core.base_classes import BaseAPI
+    from beeswax_wrapper.modules import account, admin, creatives, extensions, monitoring, operations, segments
+
+    endpoints = set(MISC_ENDPOINTS)
+    for module in (account, admin, creatives, extensions, monitoring, operations, segments):
+        for value in vars(module).values():
+            paths = vars(value).get('paths') if isinstance(value, type) and issubclass(value, BaseAPI) else None
+            if isinstance(paths, list) and paths:  # abstract and custom routing classes have none
+                endpoints.add(paths[0])
+    return endpoints
+
+
+class BeeswaxSimulator(FakeBeeswax):
+    """
+    FakeBeeswax serving the endpoints of the modules with the Beeswax semantics and injected faults
+    GETs list the stored objects, filtered on <endpoint>_id or paged with rows/offset. POSTs store an object
+    with a new id, PUTs update and DELETEs remove the object with the <endpoint>_id. Uploads return a new id.
+    Every endpoint but /authenticate requires the session cookie it sets.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, faults=None, endpoint_faults=None, users=None,
+                 session_lifetime=None, advertise_expiry=False, rate_limit=None, seed=None):
+        """
+        :type host: str
+        :param int port: 0 for any free port
+        :param Faults faults: injected in every response
+        :param dict endpoint_faults: {endpoint: Faults} replacing faults for some endpoints e.g. 'segment_update'
+        :param dict users: {email: password} accepted by /authenticate, None to accept any credentials
+        :param float session_lifetime: seconds before a session is rejected, None for sessions that never expire
+        :param bool advertise_expiry: set the expiry on the session cookie, so clients can refresh before it
+        :param rate_limit: requests per second or (rate, burst) per account, excess requests get a 429
+        :param int seed: for reproducible faults
+        """
+        super(BeeswaxSimulator, self).__init__(host, port)
+        self.faults = faults or Faults()
+        self.endpoint_faults = endpoint_faults or {}
+        self.users = users
+        self.session_lifetime = session_lifetime
+        self.advertise_expiry = advertise_expiry
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.endpoints = module_endpoints()
+        self._next_ids = {}  # endpoint: the id of the next object created
+        self._sessions = {}  # token: {'email', 'account_id', 'expires_at'}
+        self._buckets = {}  # account: TokenBucket
+        self._stats = None
+        self.reset_stats()
+
+    def populate(self, endpoint, objects):
+        """
+        :param str endpoint: e.g. 'line_item'
+        :param list[dict] objects: the objects of the endpoint, with their <endpoint>_id
+        """
+        super(BeeswaxSimulator, self).populate(endpoint, objects)
+        with self._lock:
+            self._next_ids[endpoint] = max(self._index[endpoint]) + 1 if self._index[endpoint] else 1
+
+    def objects(self, endpoint):
+        """
+        :type endpoint: str
+        :rtype: list[dict]
+        """
+        with self._lock:
+            return list(self._objects.get(endpoint, []))
+
+    def expire_sessions(self):
+        """Reject every current session, e.g. to cause a re-authentication storm"""
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: requests, statuses {status: count}, authentications, disconnects, connections_opened,
+            open_connections, peak_open_connections, in_flight and peak_in_flight
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['statuses'] = dict(stats['statuses'])
+            return stats
+
+    def reset_stats(self):
+        with self._lock:
+            open_connections = self._stats['open_connections'] if self._stats else 0
+            self._stats = {'requests': 0, 'statuses': {}, 'authentications': 0, 'disconnects': 0,
+                           'connections_opened': 0, 'open_connections': open_connections,
+                           'peak_open_connections': open_connections, 'in_flight': 0, 'peak_in_flight': 0}
+
+    def _count(self, name, increment=1, peak=None):
+        with self._lock:
+            self._stats[name] += increment
+            if peak is not None:
+                self._stats[peak] = max(self._stats[peak], self._stats[name])
+
+    def count_connection(self, increment):
+        if increment > 0:
+            self._count('connections_opened')
+        self._count('open_connections', increment, peak='peak_open_connections')
+
+    @staticmethod
+    def encode_error(message):
+        """
+        :rtype: bytes
+        """
+        return ujson.dumps({'success': False, 'errors': [message]}).encode('utf-8')
+
+    def respond(self, request, body, status=200, headers=(), bytes_per_second=None):
+        """
+        :type request: BaseHTTPRequestHandler
+        :type body: bytes
+        :type status: int
+        :param headers: extra (name, value) headers
+        :param int bytes_per_second: body bandwidth, None for no limit
+        """
+        with self._lock:
+            self._stats['statuses'][status] = self._stats['statuses'].get(status, 0) + 1
+
+        if not bytes_per_second:
+            return super(BeeswaxSimulator, self).respond(request, body, status, headers)
+        self.send_headers(request, status, len(body), headers)
+        chunk_size = max(1, bytes_per_second // 20)
+        for start in range(0, len(body), chunk_size):
+            request.wfile.write(body[start:start + chunk_size])
+            time.sleep(chunk_size / bytes_per_second)
+
+    def handle(self, request):
+        """
+        Respond to a request, called in the thread of its connection
+        :type request: BaseHTTPRequestHandler
+        """
+        self._count('requests')
+        self._count('in_flight', peak='peak_in_flight')
+        try:
+            self._handle(request)
+        finally:
+            self._count('in_flight', -1)
+
+    def _handle(self, request):
+        paths = request.path[len(self.prefix):].split('?')[0].strip('/').split('/')
+        endpoint = paths[0]
+        parameters = self.parameters(request, self.read_body(request))
+        faults = self.endpoint_faults.get(endpoint, self.faults)
+
+        if faults.latency is not None:
+            time.sleep(faults.latency.sample(self.random))
+        if faults.disconnect_rate and self.random.random() < faults.disconnect_rate:
+            self._count('disconnects')
+            request.close_connection = True
+            return
+
+        if endpoint not in self.endpoints:
+            return self.respond(request, self.encode_error('Unknown endpoint {}'.format(endpoint)), 404)
+        if endpoint == 'authenticate':
+            return self.authenticate(request, parameters, faults)
+
+        session = self.session(request)
+        if session is None:
+            return self.respond(request, self.encode_error('Not logged in'), 401)
+        wait = self.throttle(session['account_id'] or session['email'])
+        if wait:
+            return self.respond(request, self.encode_error('Too many requests'), 429,
+                                headers=[('Retry-After', str(int(math.ceil(wait))))])
+        if faults.error_rate and self.random.random() < faults.error_rate:
+            return self.respond(request, self.encode_error('Simulated error'), faults.error_status)
+
+        if request.command == 'GET':
+            body = self.list(endpoint, parameters)
+        elif len(paths) > 1:  # file uploads e.g. segment_upload/upload/<id>
+            body = self.encode({'id': next(self._ids)})
+        else:
+            body = self.write(request.command, endpoint, parameters)
+        self.respond(request, body, bytes_per_second=faults.bytes_per_second)
+
+    def authenticate(self, request, parameters, faults):
+        """Start a session for valid credentials"""
+        email, password = parameters.get('email'), parameters.get('password')
+        if not email or not password or (self.users is not None and self.users.get(email) != password):
+            return self.respond(request, self.encode_error('Invalid credentials'), 401)
+
+        token = uuid.uuid4().hex
+        expires_at = time.time() + self.session_lifetime if self.session_lifetime else None
+        with self._lock:
+            self._sessions[token] = {'email': email, 'account_id': parameters.get('account_id'),
+                                     'expires_at': expires_at}
+            self._stats['authentications'] += 1
+
+        cookie = '{}={}; Path=/'.format(SESSION_COOKIE, token)
+        if expires_at and self.advertise_expiry:
+            cookie += '; Max-Age={}'.format(int(self.session_lifetime))
+        self.respond(request, self.encode({'email': email}), headers=[('Set-Cookie', cookie)],
+                     bytes_per_second=faults.bytes_per_second)
+
+    def session(self, request):
+        """
+        :type request: BaseHTTPRequestHandler
+        :rtype: dict
+        :return: the live session of the request, None if it has none or it expired
+        """
+        cookie = SimpleCookie(str(request.headers.get('Cookie') or ''))
+        if SESSION_COOKIE not in cookie:
+            return None
+        with self._lock:
+            session = self._sessions.get(cookie[SESSION_COOKIE].value)
+            if session is not None and session['expires_at'] is not None and session['expires_at'] <= time.time():
+                del self._sessions[cookie[SESSION_COOKIE].value]
+                return None
+            return session
+
+    def throttle(self, account):
+        """
+        :rtype: float
+        :return: seconds until the account may make another request, 0 if this request is allowed
+        """
+        if self.rate_limit is None:
+            return 0
+        with self._lock:
+            if account not in self._buckets:
+                rate, burst = self.rate_limit if isinstance(self.rate_limit, tuple) else (self.rate_limit, None)
+                self._buckets[account] = TokenBucket(rate, burst)
+            bucket = self._buckets[account]
+        wait = bucket.reserve()
+        if wait:
+            bucket.reserve(-1)  # rejected requests do not use a token
+        return wait
+
+    def write(self, method, endpoint, parameters):
+        """
+        Create, update or delete an object
+        :rtype: bytes
+        """
+        id_key = '{}_id'.format(endpoint)
+        with self._lock:
+            self._bodies.pop(endpoint, None)
+            index = self._index.setdefault(endpoint, {})
+            objects = self._objects.setdefault(endpoint, [])
+            if method == 'POST':
+                obj = dict(parameters, **{id_key: self._next_ids.get(endpoint, 1)})
+                self._next_ids[endpoint] = obj[id_key] + 1
+                index[obj[id_key]] = obj
+                objects.append(obj)
+                return self.encode({'id': obj[id_key]})
+            if parameters.get(id_key) not in index:
+                return self.encode_error('{} {} not found'.format(endpoint, parameters.get(id_key)))
+            if method == 'PUT':
+                index[parameters[id_key]].update(parameters)
+            else:
+                objects.remove(index.pop(parameters[id_key]))
+            return self.encode({'id': parameters[id_key]})
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the json codecs on beeswax sized list responses and segment update bodies
+Usage:
+$ python -m benchmarks.json_codecs
+"""
+from __future__ import print_function, unicode_literals
+
+import json
+import random
+import timeit
+
+import requests
+
+from beeswax_wrapper.core.codecs import CODECS, get_codec
+
+
+def line_item(line_item_id):
+    """A list response element of realistic size (~1KB)"""
+    return {
+        'line_item_id': line_item_id, 'campaign_id': random.randint(1, 1000), 'advertiser_id': 7,
+        'line_item_type_id': 0, 'line_item_name': 'Line item {} - display - retargeting'.format(line_item_id),
+        'line_item_budget': random.random() * 10000, 'budget_type': 1, 'bidding': {
+            'bidding_strategy': 'CPM_PACED', 'values': {'cpm_bid': round(random.random() * 5, 2)}
+        },
+        'frequency_cap': [{'duration': 86400, 'impressions': 3}], 'active': True, 'alternative_id': None,
+        'start_date': '2018-01-01 00:00:00', 'end_date': None, 'targeting_template_id': line_item_id * 3,
+        'creative_line_items': [{'creative_id': i, 'weighting': 1} for i in range(5)],
+        'notes': 'x' * 200, 'create_date': '2018-01-01 00:00:00', 'update_date': '2018-06-01 12:00:00',
+    }
+
+
+def response_body(rows):
+    return json.dumps({'success': True, 'payload': [line_item(i) for i in range(rows)]}).encode('utf-8')
+
+
+def requests_decode(body):
+    """The previous decoding path, requests.Response.json with the stdlib json module"""
+    http_response = requests.Response()
+    http_response._content = body
+    http_response.encoding = 'utf-8'
+    return http_response.json()
+
+
+def best(func, number):
+    """:return: the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    codecs = []
+    for name in sorted(CODECS):
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print('{} not installed, skipped'.format(name))
+
+    print('{:<24}{:>12}{:>12}'.format('decode (ms)', 'rows', 'time'))
+    for rows in (100, 1000, 10000):
+        body = response_body(rows)
+        number = max(1, 2000 // rows)
+        print('{:<24}{:>12}{:>12.2f}'.format('requests.json()', rows, best(lambda: requests_decode(body), number)))
+        for codec in codecs:
+            print('{:<24}{:>12}{:>12.2f}'.format(codec.name, rows, best(lambda: codec.loads(body), number)))
+
+    print('\n{:<24}{:>12}{:>12}'.format('encode (ms)', 'users', 'time'))
+    for users in (1000, 10000):
+        segment_update = {'segment_key': 'segment-1', 'user_data': [
+            {'user_id': '{:032x}'.format(random.getrandbits(128)), 'segments': ['1', '2']} for _ in range(users)
+        ]}
+        number = max(1, 20000 // users)
+        for codec in codecs:
+            print('{:<24}{:>12}{:>12.2f}'.format(
+                codec.name, users, best(lambda: codec.dumps(segment_update), number)))
+
+
+if __name__ == '__main__':
+    main()
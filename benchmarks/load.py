@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Load and resilience scenarios of the BeeswaxDAL against the Beeswax simulator
+reauth_storm: many threads calling while the sessions expire, reactively (401s) or proactively (advertised expiry)
+pool_exhaustion: more threads than pooled connections, with and without pool_block
+Usage:
+$ python -m benchmarks.load
+$ python -m benchmarks.load --scenario reauth_storm --duration 10 --output load.json
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+
+from six import text_type
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.retry import RetryPolicy
+from beeswax_wrapper.testing.simulator import BeeswaxSimulator, Faults, LogNormalLatency
+
+
+def hammer(dal, threads, duration):
+    """
+    Retrieve line items from threads for duration seconds
+    :rtype: dict
+    :return: calls, failures and throughput
+    """
+    counts = {'calls': 0, 'failures': 0}
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def worker():
+        calls = failures = 0
+        while time.time() < deadline:
+            try:
+                dal.call('GET', ['line_item'], data='{"line_item_id": 1}')
+                calls += 1
+            except Exception:
+                failures += 1
+        with lock:
+            counts['calls'] += calls
+            counts['failures'] += failures
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.time()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    counts['calls_per_second'] = counts['calls'] / (time.time() - start)
+    return counts
+
+
+def reauth_storm(duration, threads=32, session_lifetime=2.0):
+    """Re-authentications per session expiry, reacting to the 401s versus refreshing ahead of the advertised expiry"""
+    results = []
+    for advertise_expiry in (False, True):
+        with BeeswaxSimulator(faults=Faults(latency=LogNormalLatency(median=0.005, sigma=0.5)),
+                              session_lifetime=session_lifetime, advertise_expiry=advertise_expiry) as simulator:
+            simulator.populate('line_item', [{'line_item_id': 1}])
+            dal = BeeswaxDAL(simulator.url, pool_maxsize=threads, refresh_margin=session_lifetime / 4,
+                             retry_policy=RetryPolicy(backoff=0), coalesce=False)
+            dal.authenticate('load@example.com', 'load')
+            simulator.reset_stats()
+            counts = hammer(dal, threads, duration)
+            stats = simulator.stats()
+            results.append(dict(counts, scenario='reauth_storm', advertise_expiry=advertise_expiry,
+                                expiries=duration / session_lifetime, authentications=stats['authentications'],
+                                rejected=stats['statuses'].get(401, 0)))
+    return results
+
+
+def pool_exhaustion(duration, threads=64, pool_sizes=(4, 16, 64)):
+    """Connections opened and throughput of threads sharing pools smaller than their number"""
+    results = []
+    with BeeswaxSimulator(faults=Faults(latency=0.01)) as simulator:
+        simulator.populate('line_item', [{'line_item_id': 1}])
+        for pool_maxsize in pool_sizes:
+            for pool_block in (False, True):
+                dal = BeeswaxDAL(simulator.url, pool_maxsize=pool_maxsize, pool_block=pool_block, coalesce=False)
+                dal.authenticate('load@example.com', 'load')
+                simulator.reset_stats()
+                counts = hammer(dal, threads, duration)
+                stats = simulator.stats()
+                results.append(dict(counts, scenario='pool_exhaustion', pool_maxsize=pool_maxsize,
+                                    pool_block=pool_block, connections_opened=stats['connections_opened'],
+                                    peak_open_connections=stats['peak_open_connections']))
+                dal.reset_sessions()
+    return results
+
+
+SCENARIOS = {'reauth_storm': reauth_storm, 'pool_exhaustion': pool_exhaustion}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append', help='all scenarios by default')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--output', help='file to write the json results to')
+    arguments = parser.parse_args()
+
+    results = []
+    for name in arguments.scenario or sorted(SCENARIOS):
+        for result in SCENARIOS[name](arguments.duration):
+            print(', '.join('{}={}'.format(key, round(value, 2) if isinstance(value, float) else value)
+                            for key, value in sorted(result.items())))
+            results.append(result)
+
+    if arguments.output:
+        with io.open(arguments.output, 'w', encoding='utf-8') as f:
+            f.write(text_type(json.dumps(results, indent=2, sort_keys=True)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
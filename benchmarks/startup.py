@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Import and construction time of the BeeswaxAPI, as paid by CLI tools and serverless cold starts
+Usage:
+$ python -m benchmarks.startup
+"""
+from __future__ import print_function, unicode_literals
+
+import subprocess
+import sys
+import timeit
+
+from beeswax_wrapper import BeeswaxAPI
+from beeswax_wrapper.core.access import BeeswaxDAL
+
+
+IMPORT_SCRIPT = 'import time; start = time.time(); import beeswax_wrapper; print(time.time() - start)'
+
+
+def import_time(runs=10):
+    """
+    :return: the median `import beeswax_wrapper` time of fresh interpreters in milliseconds
+    """
+    times = sorted(float(subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT])) for _ in range(runs))
+    return times[len(times) // 2] * 1000
+
+
+def best(func, number):
+    """:return: the best time per call in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000000
+
+
+def main():
+    dal = BeeswaxDAL('')
+    print('{:<40}{:>10.1f} ms'.format('import beeswax_wrapper', import_time()))
+    print('{:<40}{:>10.1f} us'.format('BeeswaxAPI()', best(lambda: BeeswaxAPI(dal=dal), 10000)))
+    print('{:<40}{:>10.1f} us'.format('BeeswaxAPI().segments.lookups',
+                                      best(lambda: BeeswaxAPI(dal=dal).segments.lookups, 10000)))
+    api = BeeswaxAPI(dal=dal)
+    print('{:<40}{:>10.1f} us'.format('api.segments.lookups (created)', best(lambda: api.segments.lookups, 100000)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the BeeswaxAPI against an in-process fake Beeswax server
+Measures single call latency, large lists, bulk upload payloads, concurrent fan-out throughput and peak memory.
+The results are written as json to compare wrapper versions.
+Usage:
+$ python -m benchmarks.suite --output 1.1.10.json
+$ python -m benchmarks.suite --quick --compare 1.1.10.json
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+from six import text_type
+
+from beeswax_wrapper import BeeswaxAPI
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.testing.server import FakeBeeswax
+from benchmarks.json_codecs import line_item
+
+try:
+    import tracemalloc
+except ImportError:  # python 2
+    tracemalloc = None
+
+
+def version():
+    about = {}
+    with io.open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'version.py'),
+                 encoding='utf-8') as f:
+        exec(f.read(), about)
+    return about['__version__']
+
+
+def best(func, repeat=3):
+    """:return: the best time of func in seconds"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def percentile(times, fraction):
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def peak_memory(func):
+    """:return: the peak memory allocated by func in MB, None without tracemalloc"""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def create_api(server, **dal_options):
+    dal = BeeswaxDAL(server.url, **dal_options)
+    dal.authenticate('benchmark@example.com', 'benchmark')
+    return BeeswaxAPI(dal=dal)
+
+
+def latency(api, calls):
+    times = []
+    for line_item_id in range(1, calls + 1):
+        start = timeit.default_timer()
+        api.line_items.retrieve(line_item_id=line_item_id)
+        times.append(timeit.default_timer() - start)
+    return [
+        ('retrieve.p50', percentile(times, 0.5) * 1000, 'ms'),
+        ('retrieve.p99', percentile(times, 0.99) * 1000, 'ms'),
+    ]
+
+
+def lists(server, api, sizes):
+    results = []
+    for rows in sizes:
+        server.populate('line_item', [line_item(i) for i in range(1, rows + 1)])
+        results.append(('list.{}'.format(rows), best(api.line_items.list) * 1000, 'ms'))
+        results.append(('iter_list.{}'.format(rows),
+                        best(lambda: sum(1 for _ in api.line_items.iter_list())) * 1000, 'ms'))
+        results.append(('list.{}.peak_memory'.format(rows), peak_memory(api.line_items.list), 'MB'))
+        results.append(('iter_list.{}.peak_memory'.format(rows),
+                        peak_memory(lambda: sum(1 for _ in api.line_items.iter_list())), 'MB'))
+    return results
+
+
+def bulk_payloads(api, users):
+    user_data = [{'user_id': 'user-{:012d}'.format(i), 'segments': ['stinger-{}'.format(i % 50)]}
+                 for i in range(users)]
+    list_items = ['{:032x}'.format(i) for i in range(users)]
+    return [
+        ('segment_update.{}'.format(users),
+         best(lambda: api.segments.updates.create(user_data=user_data, segment_key_type=1)) * 1000, 'ms'),
+        ('list_item_bulk.{}'.format(users),
+         best(lambda: api.list_items.bulk_uploads.create(list_id=1, list_items=list_items)) * 1000, 'ms'),
+    ]
+
+
+def fan_out(server, calls, workers, latency=0.01):
+    """Throughput of concurrent calls to a server taking latency seconds per request"""
+    results = []
+    server.latency = latency
+    for max_workers in workers:
+        api = create_api(server, pool_maxsize=max_workers)
+        parameters = [{'line_item_id': i, 'active': False} for i in range(1, calls + 1)]
+        duration = best(lambda: api.line_items.bulk_update(parameters, max_workers=max_workers))
+        results.append(('bulk_update.{}_workers'.format(max_workers), calls / duration, 'calls/s'))
+    server.latency = 0.0
+    return results
+
+
+def run(quick=False):
+    """
+    :param bool quick: a tenth of the calls and rows
+    :rtype: list[tuple]
+    :return: (name, value, unit) of each measurement
+    """
+    scale = 10 if quick else 1
+    with FakeBeeswax() as server:
+        api = create_api(server)
+        server.populate('line_item', [line_item(i) for i in range(1, 1001)])
+        results = latency(api, 1000 // scale)
+        results += lists(server, api, [10000 // scale, 100000 // scale])
+        results += bulk_payloads(api, 100000 // scale)
+        results += fan_out(server, 2000 // scale, [1, 8, 32, 64])
+    return results
+
+
+def compare(results, baseline):
+    """Print the ratio of every result to the baseline's"""
+    previous = dict((result['name'], result['value']) for result in baseline['results'])
+    print('\n{:<36}{:>14}{:>14}{:>10}'.format('vs {}'.format(baseline['version']), 'baseline', 'current', 'ratio'))
+    for name, value, unit in results:
+        if previous.get(name) and value is not None:
+            print('{:<36}{:>14.2f}{:>14.2f}{:>10.2f}'.format(name, previous[name], value, value / previous[name]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='a tenth of the calls and rows')
+    parser.add_argument('--output', help='file to write the json results to')
+    parser.add_argument('--compare', help='json results of a previous run to compare with')
+    arguments = parser.parse_args()
+
+    results = run(arguments.quick)
+    for name, value, unit in results:
+        print('{:<36}{:>14}'.format(name, 'n/a' if value is None else '{:.2f} {}'.format(value, unit)))
+
+    document = {
+        'version': version(), 'python': platform.python_version(), 'platform': platform.platform(),
+        'timestamp': time.time(), 'quick': arguments.quick,
+        'results': [{'name': name, 'value': value, 'unit': unit} for name, value, unit in results],
+    }
+    if arguments.output:
+        with io.open(arguments.output, 'w', encoding='utf-8') as f:
+            f.write(text_type(json.dumps(document, indent=2, sort_keys=True)))
+    if arguments.compare:
+        with io.open(arguments.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
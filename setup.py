@@ -54,7 +54,12 @@ setup(
         'keyring==15.1.0',
         'requests>=2.19.1',
         'boltons>=18.0.0; python_version<"3.0"',
+        'futures>=3.2.0; python_version<"3.0"',
         'ujson>=1.35',
         'six>=1.11.0'
-    ]
+    ],
+    extras_require={
+        'async': ['aiohttp>=3.0; python_version>="3.5"'],
+        'orjson': ['orjson>=3.0; python_version>="3.6"'],
+    }
 )
@@ -0,0 +1,5 @@
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 5):  # async syntax, the asyncio access is python 3.5+ only
+    collect_ignore.append('core/test_async_access.py')
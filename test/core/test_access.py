@@ -1,8 +1,26 @@
+import os
+import subprocess
+import sys
+import threading
 import unittest
+import ujson
 
 import mock
 
-from beeswax_wrapper.core.access import get_beeswax_dal, BeeswaxDAL, BeeswaxRESTException
+from requests import ConnectionError, ConnectTimeout, ReadTimeout
+from requests.exceptions import SSLError
+from six.moves.http_client import BadStatusLine
+from six.moves.http_cookies import SimpleCookie
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from beeswax_wrapper.core.access import get_beeswax_dal, BeeswaxAPI, BeeswaxDAL, BeeswaxRESTException
+from beeswax_wrapper.core.cache import ResponseCache
+from beeswax_wrapper.core.exceptions import BeeswaxAuthenticationException, BeeswaxTransientException
+from beeswax_wrapper.core.rate_limit import RateLimiter
+from beeswax_wrapper.core.retry import RetryPolicy
+from beeswax_wrapper.core.sessions import cookie_expiry
+from beeswax_wrapper.core.tracing import InMemoryExporter, Tracer
+from beeswax_wrapper.credentials.credential_manager import CallableCredentialProvider, KeyringCredentialProvider
 
 
 class TestBeeswaxDalPrivateCall(unittest.TestCase):
@@ -19,15 +37,24 @@ class TestBeeswaxDalPrivateCall(unittest.TestCase):
         self.dal.endpoint_url = ''
         with mock.patch('beeswax_wrapper.core.access.BeeswaxDAL.session', new_callable=mock.PropertyMock) as p:
             p.return_value = p.get = p
-            p.json.return_value = {'errors': ['error_1', 'error_2'], 'success': False, 'message': ''}
+            p.content = ujson.dumps({'errors': ['error_1', 'error_2'], 'success': False, 'message': ''}).encode('utf-8')
             with self.assertRaises(BeeswaxRESTException):
                 self.dal._call('get', [])
 
+    def test_unauthenticated_response(self):
+        self.dal.endpoint_url = ''
+        with mock.patch('beeswax_wrapper.core.access.BeeswaxDAL.session', new_callable=mock.PropertyMock) as p:
+            p.return_value = p.get = p
+            p.status_code = 401
+            p.content = ujson.dumps({'errors': ['not logged in'], 'success': False}).encode('utf-8')
+            with self.assertRaises(BeeswaxAuthenticationException):
+                self.dal._call('get', [])
+
     def test_good_response(self):
         self.dal.endpoint_url = ''
         with mock.patch('beeswax_wrapper.core.access.BeeswaxDAL.session', new_callable=mock.PropertyMock) as p:
             p.return_value = p.get = p
-            p.json.return_value = {'payload': 'output', 'success': True}
+            p.content = ujson.dumps({'payload': 'output', 'success': True}).encode('utf-8')
             self.assertEqual(self.dal._call('get', []), 'output')
 
 
@@ -38,19 +65,38 @@ class TestBeeswaxDalAuthenticate(unittest.TestCase):
         self.dal._call = mock.Mock()
 
     def test_get_credentials(self):
-        with mock.patch('beeswax_wrapper.core.access.get_beeswax_credentials') as f:
+        with mock.patch.object(KeyringCredentialProvider, 'load') as f:
+            f.return_value = {'username': 'username', 'password': 'password'}
+            self.dal.credential_provider = KeyringCredentialProvider()
             self.dal.authenticate()
             self.assertEqual(f.called, True)
         # noinspection PyUnresolvedReferences
         self.assertEqual(self.dal._call.called, True)
 
     def test_not_get_credentials(self):
-        with mock.patch('beeswax_wrapper.core.access.get_beeswax_credentials') as f:
+        with mock.patch.object(KeyringCredentialProvider, 'load') as f:
+            self.dal.credential_provider = KeyringCredentialProvider()
             self.dal.authenticate('username', 'password')
             self.assertEqual(f.called, False)
         # noinspection PyUnresolvedReferences
         self.assertEqual(self.dal._call.called, True)
 
+    def test_credentials_cached_for_reauthentication(self):
+        load = mock.Mock(return_value={'username': 'username', 'password': 'password'})
+        self.dal.credential_provider = CallableCredentialProvider(load)
+        self.dal.masquerade(account_id=2)
+        self.dal._refresh()
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(self.dal._call.call_count, 2)
+        self.assertIn(b'"account_id":2', self.dal._call.call_args[1]['data'])
+
+    def test_rejected_credentials_invalidated(self):
+        self.dal.credential_provider = CallableCredentialProvider(lambda: {'username': 'a', 'password': 'b'})
+        self.dal._call.side_effect = BeeswaxAuthenticationException('Unauthorized', status_code=401)
+        with self.assertRaises(BeeswaxAuthenticationException):
+            self.dal.authenticate()
+        self.assertEqual(self.dal.credential_provider.cached, False)
+
 
 class TestBeeswaxDalCall(unittest.TestCase):
 
@@ -65,11 +111,61 @@ class TestBeeswaxDalCall(unittest.TestCase):
         self.assertEqual(self.dal.authenticate.called, False)
 
     def test_recurse(self):
-        self.dal._call = mock.Mock(side_effect=[BeeswaxRESTException('Test'), None])
+        self.dal._call = mock.Mock(side_effect=[BeeswaxAuthenticationException('Test'), None])
         self.dal.call('method', [])
         # noinspection PyUnresolvedReferences
         self.assertEqual(self.dal.authenticate.called, True)
 
+    def test_permanent_error_not_retried(self):
+        self.dal._call = mock.Mock(side_effect=[BeeswaxRESTException('Test'), None])
+        with self.assertRaises(BeeswaxRESTException):
+            self.dal.call('method', [])
+        # noinspection PyUnresolvedReferences
+        self.assertEqual(self.dal.authenticate.called, False)
+
+    def test_transient_error_retried_without_authenticating(self):
+        self.dal.retry_policy = RetryPolicy(backoff=0)
+        self.dal._call = mock.Mock(side_effect=[ConnectionError('Test'), None])
+        self.dal.call('GET', [])
+        # noinspection PyUnresolvedReferences
+        self.assertEqual(self.dal.authenticate.called, False)
+        self.assertEqual(self.dal._call.call_count, 2)
+
+    def test_bounded_attempts(self):
+        self.dal.retry_policy = RetryPolicy(max_attempts=3, backoff=0)
+        self.dal._call = mock.Mock(side_effect=BeeswaxAuthenticationException('Test'))
+        with self.assertRaises(BeeswaxAuthenticationException):
+            self.dal.call('GET', [])
+        self.assertEqual(self.dal._call.call_count, 3)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_classify(self):
+        classify = RetryPolicy.classify
+        self.assertEqual(classify(BeeswaxAuthenticationException(status_code=401), 'POST'), 'authentication')
+        self.assertEqual(classify(BeeswaxTransientException(status_code=502), 'GET'), 'transient')
+        self.assertEqual(classify(BeeswaxTransientException(status_code=502), 'POST'), 'permanent')
+        self.assertEqual(classify(BeeswaxTransientException(status_code=429), 'POST'), 'transient')
+        self.assertEqual(classify(BeeswaxRESTException('line_item_budget invalid'), 'PUT'), 'permanent')
+
+    def test_classify_transport_errors(self):
+        classify = RetryPolicy.classify
+        refused = ConnectionError(MaxRetryError(None, '/rest/line_item', NewConnectionError(None, 'refused')))
+        dropped = ConnectionError(ProtocolError('Connection aborted.', BadStatusLine('closed')))
+        self.assertEqual(classify(refused, 'POST'), 'transient')
+        self.assertEqual(classify(ConnectTimeout(), 'POST'), 'transient')
+        self.assertEqual(classify(dropped, 'GET'), 'transient')
+        self.assertEqual(classify(dropped, 'POST'), 'permanent')
+        self.assertEqual(classify(ReadTimeout(), 'POST'), 'permanent')
+        self.assertEqual(classify(SSLError(), 'GET'), 'permanent')
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 5)], [1, 2, 4, 5])
+        policy.jitter = True
+        self.assertTrue(0 <= policy.delay(3) <= 4)
+
 
 class TestGetBeeswaxDal(unittest.TestCase):
 
@@ -77,3 +173,150 @@ class TestGetBeeswaxDal(unittest.TestCase):
         dal1 = get_beeswax_dal()
         dal2 = get_beeswax_dal()
         self.assertIs(dal1, dal2)
+
+
+class TestBeeswaxDalSessions(unittest.TestCase):
+
+    def test_pool_configuration(self):
+        dal = BeeswaxDAL('', pool_maxsize=64, pool_block=True)
+        adapter = dal.session.get_adapter('https://example.com')
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertEqual(adapter._pool_block, True)
+
+    def test_configure_pool_resets_session(self):
+        dal = BeeswaxDAL('')
+        session = dal.session
+        dal.configure_pool(pool_maxsize=32)
+        self.assertIsNot(dal.session, session)
+        self.assertIs(dal.session.cookies, dal.cookies)
+        with self.assertRaises(TypeError):
+            dal.configure_pool(pool_size=32)
+
+    def test_thread_local_sessions_share_cookies(self):
+        dal = BeeswaxDAL('', thread_local_sessions=True)
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(dal.session))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], dal.session)
+        self.assertIs(sessions[0].cookies, dal.session.cookies)
+
+    def test_mount(self):
+        dal = BeeswaxDAL('')
+        adapter = mock.Mock()
+        dal.mount('https://beeswax', adapter)
+        self.assertIs(dal.session.get_adapter('https://beeswax.example/rest'), adapter)
+
+
+class TestBeeswaxDalSessionLifetime(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('', session_lifetime=60, refresh_margin=30)
+        self.dal._call = mock.Mock(return_value=None)
+
+    def test_not_expiring(self):
+        self.dal.masquerade('username', 'password', account_id=2)
+        self.dal.call('GET', [])
+        self.assertEqual(self.dal._call.call_count, 2)
+
+    def test_refresh_before_expiry(self):
+        self.dal.masquerade('username', 'password', account_id=2)
+        self.dal.lifetime.expires_at -= 45
+        self.dal.call('GET', [])
+        self.assertEqual(self.dal._call.call_count, 3)
+        self.assertIn(b'"account_id":2', self.dal._call.call_args_list[1][1]['data'])
+        self.assertEqual(self.dal.lifetime.expiring, False)
+
+    def test_single_flight_refresh(self):
+        self.dal.masquerade('username', 'password')
+        self.dal.lifetime.expires_at -= 45
+        threads = [threading.Thread(target=self.dal.call, args=('GET', [])) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        authentications = [c for c in self.dal._call.call_args_list if c[0][1] == ['authenticate']]
+        self.assertEqual(len(authentications), 2)
+
+    def test_cookie_expiry(self):
+        cookies = SimpleCookie('a=1; Max-Age=60; Expires=Wed, 21 Oct 2015 07:28:00 GMT')
+        cookies.load('b=2; Expires=Wed, 21 Oct 2015 07:28:00 GMT')
+        cookies.load('c=3')
+        self.assertEqual(cookie_expiry(cookies['a'], received_at=100), 160)
+        self.assertEqual(cookie_expiry(cookies['b']), 1445412480)
+        self.assertIsNone(cookie_expiry(cookies['c']))
+
+
+class TestBeeswaxAPILazyEndpoints(unittest.TestCase):
+
+    def test_created_on_first_access(self):
+        dal = BeeswaxDAL('')
+        api = BeeswaxAPI(dal=dal)
+        self.assertNotIn('segments', vars(api))
+        self.assertIs(api.segments, api.segments)
+        self.assertNotIn('tags', vars(api.segments))
+        self.assertIs(api.segments.tags._dal, dal)
+        self.assertEqual(api.creatives.assets.video.paths, ['video_asset'])
+
+    def test_deferred_imports(self):
+        script = ('import sys, beeswax_wrapper; beeswax_wrapper.BeeswaxAPI(); '
+                  'print(",".join(m for m in ("requests", "keyring", "aiohttp", "beeswax_wrapper.modules.segments") '
+                  'if m in sys.modules))')
+        output = subprocess.check_output([sys.executable, '-c', script])
+        self.assertEqual(output.strip(), b'')
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'fork not supported')
+class TestBeeswaxDalFork(unittest.TestCase):
+
+    def _in_child(self, func):
+        """:return: the exit code of func run in a forked child"""
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                os._exit(0 if func() else 1)
+            except BaseException:
+                os._exit(2)
+        return os.waitpid(pid, 0)[1] >> 8
+
+    def test_session_rebuilt_in_child(self):
+        dal = BeeswaxDAL('')
+        parent_session, parent_cookies = dal.session, dal.cookies
+        dal._auth_generation = 3
+
+        def check():
+            return dal.session is not parent_session and dal.cookies is parent_cookies and dal._auth_generation == 3
+        self.assertEqual(self._in_child(check), 0)
+        self.assertIs(dal.session, parent_session)
+
+    def test_pid_check(self):
+        dal = BeeswaxDAL('')
+        session = dal.session
+        dal._pid = -1
+        self.assertIsNot(dal.session, session)
+        self.assertEqual(dal._pid, os.getpid())
+
+    def test_held_lock_released_in_child(self):
+        dal = BeeswaxDAL('', cache=ResponseCache(default_ttl=60), rate_limiter=RateLimiter(default_rate=10),
+                         tracer=Tracer(InMemoryExporter()))
+        bucket = dal.rate_limiter._bucket(('account', '*'), 10)
+        acquired, release = threading.Event(), threading.Event()
+
+        def locks():  # read again in the child, where they are replaced
+            return [dal._lock, dal.cache._lock, dal.rate_limiter._lock, bucket._lock, dal.tracer.exporter._lock]
+
+        def hold():
+            for lock in locks():
+                lock.acquire()
+            acquired.set()
+            release.wait(5)
+            for lock in locks():
+                lock.release()
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait(5)
+        try:
+            self.assertEqual(self._in_child(lambda: all(lock.acquire(False) for lock in locks())), 0)
+        finally:
+            release.set()
+            thread.join()
@@ -0,0 +1,382 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+import ujson
+from concurrent.futures import ProcessPoolExecutor
+from six.moves.http_cookies import SimpleCookie
+
+import mock
+
+try:
+    import aiohttp
+    from beeswax_wrapper.core.async_access import AsyncBeeswaxDAL, AsyncBeeswaxAPI, AsyncResult, _transport_errors
+    from beeswax_wrapper.core.exceptions import BeeswaxAuthenticationException, BeeswaxRESTException
+    from beeswax_wrapper.core.metrics import REJECTED, MetricsCollector
+    from beeswax_wrapper.core.retry import AUTHENTICATION, RetryPolicy
+    from beeswax_wrapper.core.tracing import InMemoryExporter, Tracer
+except ImportError:  # aiohttp not installed
+    AsyncBeeswaxDAL = None
+
+
+def run(coroutine):
+    return asyncio.get_event_loop_policy().new_event_loop().run_until_complete(coroutine)
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncResult(unittest.TestCase):
+
+    def test_item_access(self):
+        async def payload():
+            return [{'id': 1}]
+
+        async def resolve():
+            return await AsyncResult(payload())[0]['id']
+
+        self.assertEqual(run(resolve()), 1)
+
+    def test_errors_wrapped(self):
+        async def payload():
+            return []
+
+        async def resolve():
+            return await AsyncResult(payload())[0]
+
+        with self.assertRaises(BeeswaxRESTException):
+            run(resolve())
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxDalCall(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = AsyncBeeswaxDAL('')
+        self.dal.authenticate = mock.Mock(side_effect=self._authenticate)
+        self.dal._call = mock.Mock(side_effect=self._call)
+        self.responses = []
+
+    async def _authenticate(self, *args, **kwargs):
+        self.dal._auth_generation += 1
+
+    async def _call(self, *args, **kwargs):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def test_success(self):
+        self.responses = ['output']
+        self.assertEqual(run(self._await(self.dal.call('GET', []))), 'output')
+        self.assertEqual(self.dal.authenticate.called, False)
+
+    def test_reauthenticate(self):
+        self.responses = [BeeswaxAuthenticationException('Test'), 'output']
+        self.assertEqual(run(self._await(self.dal.call('GET', []))), 'output')
+        self.assertEqual(self.dal.authenticate.call_count, 1)
+
+    def test_single_reauthenticate_for_concurrent_failures(self):
+        async def expired_session(*args, **kwargs):
+            await asyncio.sleep(0)
+            if not self.dal._auth_generation:
+                raise BeeswaxAuthenticationException('Test')
+            return 'output'
+
+        self.dal._call.side_effect = expired_session
+
+        async def gather():
+            return await asyncio.gather(*[self.dal.call('GET', []) for _ in range(3)])
+
+        self.assertEqual(run(gather()), ['output'] * 3)
+        self.assertEqual(self.dal.authenticate.call_count, 1)
+
+    def test_permanent_error_not_retried(self):
+        self.responses = [BeeswaxRESTException('Test'), 'output']
+        with self.assertRaises(BeeswaxRESTException):
+            run(self._await(self.dal.call('PUT', [])))
+        self.assertEqual(self.dal.authenticate.called, False)
+
+    def test_metrics(self):
+        self.dal.metrics = mock.Mock(spec=MetricsCollector)
+        self.responses = [BeeswaxAuthenticationException('Test'), 'output']
+        run(self._await(self.dal.call('GET', ['campaign'])))
+        self.dal.metrics.on_retry.assert_called_once_with('GET', 'campaign', AUTHENTICATION)
+        self.dal.metrics.on_reauthentication.assert_called_once_with(REJECTED)
+
+    def test_tracing(self):
+        exporter = InMemoryExporter()
+        self.dal.tracer = Tracer(exporter)
+        self.responses = [[{'advertiser_id': 3}]]
+        result = AsyncBeeswaxAPI(dal=self.dal).advertisers.retrieve(3)
+        self.assertEqual(exporter.spans, [exporter.find('serialize')[0]])  # finished once awaited
+        self.assertEqual(run(self._await(result)), {'advertiser_id': 3})
+        root, = exporter.find('Advertiser.retrieve')
+        self.assertEqual(root.tags, {'endpoint': 'advertiser', 'object_id': 3})
+        self.assertEqual(exporter.children(root), exporter.find('serialize'))
+
+    @staticmethod
+    async def _await(result):
+        return await result
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncTransportErrors(unittest.TestCase):
+
+    def classify(self, error, method):
+        try:
+            with _transport_errors():
+                raise error
+        except Exception as e:
+            return RetryPolicy.classify(e, method)
+
+    def test_classify(self):
+        refused = aiohttp.ClientConnectorError(mock.Mock(ssl=None), ConnectionRefusedError(111, 'refused'))
+        self.assertEqual(self.classify(refused, 'POST'), 'transient')
+        self.assertEqual(self.classify(aiohttp.ServerDisconnectedError(), 'GET'), 'transient')
+        self.assertEqual(self.classify(aiohttp.ServerDisconnectedError(), 'POST'), 'permanent')
+        self.assertEqual(self.classify(asyncio.TimeoutError(), 'POST'), 'permanent')
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxAPI(unittest.TestCase):
+
+    def test_for_account_not_supported(self):
+        with self.assertRaises(TypeError):
+            AsyncBeeswaxAPI.for_account(5, username='a', password='b')
+
+    def test_batch_not_supported(self):
+        with self.assertRaises(TypeError):
+            AsyncBeeswaxAPI(dal=mock.Mock()).batch()
+
+    def test_credentials(self):
+        api = AsyncBeeswaxAPI('user', 'secret')
+        self.assertIsInstance(api.dal, AsyncBeeswaxDAL)
+        self.assertIsNot(api.dal, AsyncBeeswaxAPI().dal)
+        self.assertEqual(api.dal.credential_provider.get_credentials(), {'username': 'user', 'password': 'secret'})
+
+        shared = mock.Mock(**{'get_credentials.return_value': {'username': 'shared', 'password': 'password'}})
+        with mock.patch('beeswax_wrapper.core.async_access.get_credential_provider', return_value=shared):
+            credentials = AsyncBeeswaxAPI(username='user').dal.credential_provider.get_credentials()
+        self.assertEqual(credentials, {'username': 'user', 'password': 'password'})
+
+        with self.assertRaises(TypeError):
+            AsyncBeeswaxAPI('user', 'secret', dal=AsyncBeeswaxDAL(''))
+
+    def test_mirrors_modules(self):
+        dal = AsyncBeeswaxDAL('')
+
+        async def retrieve():
+            return await AsyncBeeswaxAPI(dal=dal).line_items.retrieve(line_item_id=1)
+
+        async def payload(*args, **kwargs):
+            return [{'line_item_id': 1}]
+
+        with mock.patch.object(AsyncBeeswaxDAL, '_call', side_effect=payload) as f:
+            self.assertEqual(run(retrieve()), {'line_item_id': 1})
+            self.assertEqual(f.call_args[0][:2], ('GET', ['line_item']))
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxDalIterCall(unittest.TestCase):
+
+    def test_iter_call(self):
+        async def iter_chunked(chunk_size):
+            for chunk in [b'{"success": true, "pay', b'load": [{"a": 1}, {"a"', b': 2}]}']:
+                yield chunk
+
+        response = mock.Mock(ok=True, status=200)
+        response.content.iter_chunked = iter_chunked
+        dal = AsyncBeeswaxDAL('')
+
+        async def request(*args, **kwargs):
+            return response
+
+        async def consume():
+            return [item async for item in dal.iter_call('GET', ['segment_lookup'])]
+
+        with mock.patch.object(AsyncBeeswaxDAL, '_request', side_effect=request):
+            self.assertEqual(run(consume()), [{'a': 1}, {'a': 2}])
+        self.assertEqual(response.release.called, True)
+
+    def test_metrics(self):
+        async def read():
+            return b'{"success": true, "payload": 1}'
+
+        response = mock.Mock(ok=True, status=200, read=read)
+        dal = AsyncBeeswaxDAL('', metrics=mock.Mock(spec=MetricsCollector))
+
+        async def request(*args, **kwargs):
+            return response
+
+        with mock.patch.object(AsyncBeeswaxDAL, '_request', side_effect=request):
+            self.assertEqual(run(dal._call('PUT', ['campaign'], data='{}')), 1)
+        method, endpoint, status_code, _, request_bytes, response_bytes = dal.metrics.on_response.call_args[0]
+        self.assertEqual((method, endpoint, status_code, request_bytes, response_bytes),
+                         ('PUT', 'campaign', 200, 2, 31))
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncPaginate(unittest.TestCase):
+
+    def test_paginate(self):
+        async def payload(method, paths, data):
+            offset = ujson.loads(data)['offset']
+            return [{'id': i} for i in range(offset, min(offset + 10, 25))]
+
+        async def consume():
+            return [item async for item in AsyncBeeswaxAPI(dal=dal).line_items.paginate(page_size=10)]
+
+        dal = AsyncBeeswaxDAL('')
+        with mock.patch.object(AsyncBeeswaxDAL, '_call', side_effect=payload):
+            self.assertEqual(run(consume()), [{'id': i} for i in range(25)])
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxDalCoalescing(unittest.TestCase):
+
+    def test_identical_gets_share_a_call(self):
+        dal = AsyncBeeswaxDAL('')
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return [{'campaign_id': 1}]
+        dal._call = mock.Mock(side_effect=call)
+
+        async def main():
+            return await asyncio.gather(*[dal.call('GET', ['campaign'], data='{"campaign_id": 1}')
+                                          for _ in range(8)])
+
+        results = run(main())
+        self.assertEqual(dal._call.call_count, 1)
+        self.assertEqual(results, [[{'campaign_id': 1}]] * 8)
+        self.assertEqual(dal.single_flight.in_flight(), 0)
+
+    def test_cancelled_leader(self):
+        dal = AsyncBeeswaxDAL('')
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return [{'campaign_id': 1}]
+        dal._call = mock.Mock(side_effect=call)
+
+        async def main():
+            leader = asyncio.ensure_future(dal._coalesced_call('GET', ['campaign']))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(dal._coalesced_call('GET', ['campaign']))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        self.assertEqual(run(main()), [{'campaign_id': 1}])
+        self.assertEqual(dal._call.call_count, 1)
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBulkWrites(unittest.TestCase):
+
+    def test_partial_failure(self):
+        dal = AsyncBeeswaxDAL('')
+
+        async def call(method, paths, data=None):
+            if b'"line_item_id":2' in data:
+                raise BeeswaxRESTException('Bad Request', status_code=400)
+            return {'id': 1}
+        dal._call = mock.Mock(side_effect=call)
+        api = AsyncBeeswaxAPI(dal=dal)
+
+        async def main():
+            return await api.line_items.bulk_update([{'line_item_id': i} for i in range(4)], max_workers=2)
+
+        result = run(main())
+        self.assertEqual(sorted(result.succeeded), [0, 1, 3])
+        self.assertEqual(list(result.failed), [2])
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxDalFiles(unittest.TestCase):
+
+    def test_file_closed(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b'user_id,segment')
+        self.addCleanup(os.remove, f.name)
+        dal = AsyncBeeswaxDAL('http://beeswax.example/rest/')
+        forms = []
+
+        async def request(method, url, data=None):
+            field = data._fields[0][2]
+            forms.append((field.read(), field))
+            return 'response'
+        dal._session = mock.Mock(closed=False, request=request)
+
+        self.assertEqual(run(dal._request('POST', ['upload'], files=f.name)), 'response')
+        self.assertEqual(forms[0][0], b'user_id,segment')
+        self.assertTrue(forms[0][1].closed)
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncBeeswaxDalSessionLifetime(unittest.TestCase):
+
+    def test_cookie_expiry(self):
+        dal = AsyncBeeswaxDAL('', refresh_margin=30)
+
+        async def call(method, paths, data=None):
+            dal.session.cookie_jar.update_cookies(SimpleCookie('session=token; Max-Age=120'))
+            return {'email': 'username'}
+        dal._call = mock.Mock(side_effect=call)
+
+        async def main():
+            try:
+                await dal.masquerade('username', 'password')
+            finally:
+                await dal.close()
+
+        run(main())
+        self.assertAlmostEqual(dal.lifetime.expires_at, time.time() + 120, delta=2)
+        self.assertFalse(dal.lifetime.expiring)
+
+
+@unittest.skipIf(AsyncBeeswaxDAL is None, 'aiohttp not installed')
+class TestAsyncSegmentUpdatePush(unittest.TestCase):
+
+    def test_push(self):
+        dal = AsyncBeeswaxDAL('')
+        bodies = []
+
+        async def call(method, paths, data=None):
+            body = ujson.loads(data)
+            if body['user_data'][0]['user_id'] == 'user-3':
+                raise BeeswaxRESTException('Bad Request', status_code=400)
+            bodies.append(body)
+            return {'id': len(bodies)}
+        dal._call = mock.Mock(side_effect=call)
+        api = AsyncBeeswaxAPI(dal=dal)
+        users = [{'user_id': 'user-{}'.format(i), 'segments': ['1']} for i in range(10)]
+
+        async def main():
+            return await api.segments.updates.push(users, chunk_size=3, processes=0, upload_workers=2,
+                                                   segment_key_type=1)
+
+        result = run(main())
+        self.assertEqual(sorted(result.succeeded), [0, 2, 3])
+        self.assertEqual(list(result.failed), [1])
+        self.assertEqual(sorted(len(body['user_data']) for body in bodies), [1, 3, 3])
+        self.assertEqual(bodies[0]['segment_key_type'], 1)
+
+    def test_process_pool_shutdown_off_loop(self):
+        dal = AsyncBeeswaxDAL('')
+        shutdown = ProcessPoolExecutor.shutdown
+        threads = []
+
+        def record(pool, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return shutdown(pool, *args, **kwargs)
+
+        async def upload(body):
+            return len(body)
+
+        with mock.patch.object(ProcessPoolExecutor, 'shutdown', record):
+            result = run(dal.pipeline_call(str, upload, [[1], [2, 3]], processes=1))
+        self.assertEqual(result.results, [3, 6])
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
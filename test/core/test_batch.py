@@ -0,0 +1,81 @@
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL, BeeswaxRESTException
+from beeswax_wrapper.core.batch import BeeswaxBatch
+
+
+class TestBeeswaxBatch(unittest.TestCase):
+
+    def test_results_in_order(self):
+        batch = BeeswaxBatch(max_workers=4)
+        batch.map(lambda value: value * 2, [{'value': i} for i in range(20)])
+        self.assertEqual(batch.run(), [i * 2 for i in range(20)])
+        self.assertEqual(len(batch), 0)
+
+    def test_errors_collected(self):
+        error = BeeswaxRESTException('Test')
+        func = mock.Mock(side_effect=[1, error, 3])
+        with BeeswaxBatch(max_workers=1) as batch:
+            for _ in range(3):
+                batch.add(func)
+        self.assertEqual(batch.results, [1, error, 3])
+        self.assertEqual(batch.errors, {1: error})
+
+    def test_api_batch(self):
+        dal = BeeswaxDAL('')
+        dal.call = mock.Mock(return_value=[{'line_item_id': 1}])
+        api = BeeswaxAPI(dal=dal)
+        with api.batch(max_workers=2) as batch:
+            batch.add(api.line_items.retrieve, line_item_id=1)
+        self.assertEqual(batch.results, [{'line_item_id': 1}])
+
+
+class TestBeeswaxDalConcurrentReauthenticate(unittest.TestCase):
+
+    def test_single_reauthenticate(self):
+        dal = BeeswaxDAL('')
+
+        def authenticate():
+            dal._auth_generation += 1
+        dal.authenticate = mock.Mock(side_effect=authenticate)
+
+        dal._reauthenticate(0)
+        dal._reauthenticate(0)  # a second thread that failed against the same session
+        self.assertEqual(dal.authenticate.call_count, 1)
+
+
+class TestBulkWrites(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('')
+        self.api = BeeswaxAPI(dal=self.dal)
+
+    def test_bulk_methods(self):
+        self.assertTrue(hasattr(self.api.line_items, 'bulk_update'))
+        self.assertTrue(hasattr(self.api.campaigns, 'bulk_delete'))
+        self.assertTrue(hasattr(self.api.creatives, 'bulk_create'))
+        self.assertFalse(hasattr(self.api.dashboards, 'bulk_create'))
+
+    def test_partial_failure(self):
+        def call(method, paths, data=None):
+            if b'"line_item_id":2' in data:
+                raise BeeswaxRESTException('Bad Request', status_code=400)
+            return {'id': 1}
+        self.dal.call = mock.Mock(side_effect=call)
+
+        result = self.api.line_items.bulk_update(({'line_item_id': i, 'bid_price': 2.5} for i in range(4)),
+                                                 max_workers=2)
+        self.assertEqual(self.dal.call.call_count, 4)
+        self.assertEqual(sorted(result.succeeded), [0, 1, 3])
+        self.assertEqual(list(result.failed), [2])
+        self.assertIsInstance(result.failed[2], BeeswaxRESTException)
+        self.assertFalse(result)
+        self.assertEqual(len(result), 4)
+
+    def test_invalid_parameters_collected(self):
+        self.dal.call = mock.Mock(return_value={'id': 1})
+        result = self.api.creatives.bulk_delete([{'creative_id': 1}, {'line_item_id': 1}])
+        self.assertEqual(list(result.succeeded), [0])
+        self.assertEqual(list(result.failed), [1])
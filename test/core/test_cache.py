@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.cache import ResponseCache, SQLiteResponseCache
+from beeswax_wrapper.modules.extensions import Strategy
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(ttls={'strategy': 60}, max_entries=2)
+
+    def test_key(self):
+        self.assertEqual(self.cache.key('GET', ['strategy'], data='{"b":1,"a":2}'),
+                         self.cache.key('GET', ['strategy'], data='{"a":2,"b":1}'))
+        self.assertEqual(self.cache.key('GET', ['strategy'], data=b'{"b":1,"a":2}'),
+                         self.cache.key('GET', ['strategy'], data='{"a":2,"b":1}'))
+        self.assertNotEqual(self.cache.key('GET', ['strategy'], 1), self.cache.key('GET', ['strategy'], 2))
+        self.assertIsNone(self.cache.key('POST', ['strategy']))
+        self.assertIsNone(self.cache.key('GET', ['line_item']))
+
+    def test_copies(self):
+        key = self.cache.key('GET', ['strategy'])
+        self.cache.set(key, [{'strategy_id': 1}])
+        self.cache.get(key)[1][0]['strategy_id'] = 2
+        self.assertEqual(self.cache.get(key), (True, [{'strategy_id': 1}]))
+
+    def test_expiry(self):
+        key = self.cache.key('GET', ['strategy'])
+        self.cache.set(key, [])
+        with mock.patch('beeswax_wrapper.core.cache.time') as t:
+            t.time.return_value = self.cache._entries[key][0]
+            self.assertEqual(self.cache.get(key), (False, None))
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_lru(self):
+        keys = [self.cache.key('GET', ['strategy'], data='{"strategy_id":%d}' % i) for i in range(3)]
+        self.cache.set(keys[0], [0])
+        self.cache.set(keys[1], [1])
+        self.cache.get(keys[0])
+        self.cache.set(keys[2], [2])
+        self.assertEqual(self.cache.get(keys[1])[0], False)
+        self.assertEqual(self.cache.get(keys[0])[0], True)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_max_bytes(self):
+        cache = ResponseCache(default_ttl=60, max_bytes=10)
+        cache.set(cache.key('GET', ['vendor']), ['x' * 20])
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+class TestBeeswaxDalCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('', cache=ResponseCache(ttls={'strategy': 60}))
+        self.dal._call = mock.Mock(return_value=[{'strategy_id': 1}])
+        self.api = BeeswaxAPI(dal=self.dal)
+
+    def test_hit(self):
+        self.api.strategies.list()
+        self.assertEqual(self.api.strategies.list(), [{'strategy_id': 1}])
+        self.assertEqual(self.dal._call.call_count, 1)
+        self.assertEqual(self.dal.cache.stats()['hits'], 1)
+
+    def test_uncached_endpoint(self):
+        self.api.campaigns.list()
+        self.api.campaigns.list()
+        self.assertEqual(self.dal._call.call_count, 2)
+
+    def test_write_invalidates(self):
+        self.api.vendors.list()
+        self.api.strategies.list()
+        self.dal.call('PUT', ['strategy'], data='{}')
+        self.api.strategies.list()
+        self.assertEqual(self.dal._call.call_count, 4)
+
+
+class TestSQLiteResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+        self.cache = SQLiteResponseCache(self.path, ttls={Strategy: 60, 'vendor': 60})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared_between_instances(self):
+        key = self.cache.key('GET', ['strategy'], data='{"strategy_id":1}')
+        self.cache.set(key, [{'strategy_id': 1}])
+        other = SQLiteResponseCache(self.path, ttls={'strategy': 60})
+        self.assertEqual(other.get(key), (True, [{'strategy_id': 1}]))
+        self.assertEqual(other.stats()['entries'], 1)
+
+    def test_expiry(self):
+        key = self.cache.key('GET', ['strategy'])
+        self.cache.set(key, [])
+        with mock.patch('beeswax_wrapper.core.cache.time') as t:
+            t.time.return_value = time.time() + 61
+            self.assertEqual(self.cache.get(key), (False, None))
+
+    def test_invalidate(self):
+        strategy, vendor = self.cache.key('GET', ['strategy']), self.cache.key('GET', ['vendor'])
+        self.cache.set(strategy, [])
+        self.cache.set(vendor, [])
+        self.cache.invalidate('strategy')
+        self.assertEqual(self.cache.get(strategy)[0], False)
+        self.assertEqual(self.cache.get(vendor)[0], True)
+
+    def test_shared_by_environments_and_users(self):
+        dals = [BeeswaxDAL(url, cache=SQLiteResponseCache(self.path, ttls={'strategy': 60}))
+                for url in ('http://staging/rest/', 'http://prod/rest/', 'http://prod/rest/')]
+        for index, dal in enumerate(dals):
+            dal.username = 'user-{}'.format(min(index, 1))
+            dal._call = mock.Mock(return_value=[{'strategy_id': index}])
+
+        self.assertEqual(dals[0].call('GET', ['strategy']), [{'strategy_id': 0}])
+        self.assertEqual(dals[1].call('GET', ['strategy']), [{'strategy_id': 1}])
+        self.assertEqual(dals[2].call('GET', ['strategy']), [{'strategy_id': 1}])  # same endpoint and user
+        dals[2].username = 'user-2'
+        self.assertEqual(dals[2].call('GET', ['strategy']), [{'strategy_id': 2}])
+        self.assertEqual([dal._call.call_count for dal in dals], [1, 1, 1])
+
+    def test_errors_are_misses(self):
+        cache = SQLiteResponseCache(os.path.join(self.directory, 'missing', 'cache.db'), default_ttl=60)
+        key = cache.key('GET', ['strategy'])
+        cache.set(key, [])
+        self.assertEqual(cache.get(key), (False, None))
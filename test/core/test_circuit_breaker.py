@@ -0,0 +1,94 @@
+import unittest
+
+import mock
+from requests import ConnectionError
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.circuit_breaker import CircuitBreaker, CircuitBreakers, CLOSED, HALF_OPEN, OPEN
+from beeswax_wrapper.core.exceptions import BeeswaxCircuitOpenException, BeeswaxRESTException
+from beeswax_wrapper.core.retry import RetryPolicy
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.changes = []
+        self.breaker = CircuitBreaker('report_queue', failure_rate=0.5, minimum_calls=4, window=4,
+                                      open_duration=30, on_state_change=lambda *args: self.changes.append(args))
+
+    def test_opens_on_failure_rate(self):
+        for _ in range(3):
+            self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(BeeswaxCircuitOpenException):
+            self.breaker.before_call()
+        self.assertEqual(self.changes, [('report_queue', CLOSED, OPEN)])
+
+    def test_half_open_probe(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.breaker._opened_at -= 30
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.before_call()
+        with self.assertRaises(BeeswaxCircuitOpenException):
+            self.breaker.before_call()  # only one probe in flight
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.breaker._opened_at -= 30
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+
+class TestCircuitBreakers(unittest.TestCase):
+
+    def test_key_drops_ids(self):
+        self.assertEqual(CircuitBreakers.key(['segment_upload', 'upload', 12]), 'segment_upload/upload')
+
+    def test_states(self):
+        breakers = CircuitBreakers()
+        breakers.get(['line_item'])
+        self.assertEqual(breakers.states(), {'line_item': CLOSED})
+
+
+class TestBeeswaxDalCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('', retry_policy=RetryPolicy(max_attempts=1),
+                              circuit_breakers=CircuitBreakers(minimum_calls=2, window=2))
+
+    def test_fail_fast(self):
+        self.dal._call = mock.Mock(side_effect=ConnectionError('Test'))
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.dal.call('GET', ['report_queue'])
+        with self.assertRaises(BeeswaxCircuitOpenException):
+            self.dal.call('GET', ['report_queue'])
+        self.assertEqual(self.dal._call.call_count, 2)
+        self.assertEqual(self.dal.circuit_breakers.states(), {'report_queue': OPEN})
+
+    def test_business_errors_not_counted(self):
+        self.dal._call = mock.Mock(side_effect=BeeswaxRESTException('Test'))
+        for _ in range(3):
+            with self.assertRaises(BeeswaxRESTException):
+                self.dal.call('GET', ['line_item'])
+        self.assertEqual(self.dal.circuit_breakers.states(), {'line_item': CLOSED})
+
+    def test_api_exception_types(self):
+        api = BeeswaxAPI(dal=self.dal)
+        self.dal._call = mock.Mock(side_effect=ConnectionError('Test'))
+        for _ in range(2):
+            with self.assertRaises(BeeswaxRESTException) as context:
+                api.campaigns.retrieve(1)
+            self.assertIsInstance(context.exception.args[0], ConnectionError)  # foreign errors are wrapped
+        with self.assertRaises(BeeswaxCircuitOpenException):
+            api.campaigns.retrieve(1)
+        with self.assertRaises(BeeswaxCircuitOpenException):
+            list(api.campaigns.iter_list())
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.coalescing import SingleFlight
+from beeswax_wrapper.core.exceptions import BeeswaxRESTException
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_key(self):
+        self.assertEqual(SingleFlight.key('GET', ['campaign'], 1, data='{"b":1,"a":2}'),
+                         SingleFlight.key('get', ['campaign'], 1, data='{"a":2, "b":1}'))
+        self.assertEqual(SingleFlight.key('GET', ['campaign'], 1, data=b'{"b":1,"a":2}'),
+                         SingleFlight.key('GET', ['campaign'], 1, data='{"a":2,"b":1}'))
+        self.assertNotEqual(SingleFlight.key('GET', ['campaign'], 1), SingleFlight.key('GET', ['campaign'], 2))
+        self.assertIsNone(SingleFlight.key('POST', ['campaign']))
+        self.assertIsNone(SingleFlight.key('GET', ['campaign'], stream=True))
+        self.assertIsNone(SingleFlight.key('GET', []))
+
+
+class TestBeeswaxDalCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('')
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.dal._call = mock.Mock(side_effect=self._call)
+        self.outcome = [{'campaign_id': 1}]
+
+    def _call(self, *args, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def _concurrent_calls(self, count, method='GET'):
+        results = []
+
+        def call():
+            try:
+                results.append(self.dal.call(method, ['campaign'], data='{"campaign_id": 1}'))
+            except Exception as e:
+                results.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        self.started.wait(5)
+        followers = [threading.Thread(target=call) for _ in range(count - 1)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.2)  # the followers reach the in-flight call
+        self.release.set()
+        for thread in [leader] + followers:
+            thread.join()
+        return results
+
+    def test_identical_gets_share_a_call(self):
+        results = self._concurrent_calls(8)
+        self.assertEqual(self.dal._call.call_count, 1)
+        self.assertEqual(results, [[{'campaign_id': 1}]] * 8)
+        self.assertEqual(len(set(id(result) for result in results)), 8)  # every caller gets its own copy
+        self.assertEqual(self.dal.single_flight.in_flight(), 0)
+
+    def test_errors_fan_out(self):
+        self.outcome = BeeswaxRESTException('Not Found', status_code=404)
+        results = self._concurrent_calls(4)
+        self.assertEqual(self.dal._call.call_count, 1)
+        self.assertTrue(all(isinstance(result, BeeswaxRESTException) for result in results))
+
+    def test_writes_not_shared(self):
+        self.release.set()
+        self._concurrent_calls(3, method='PUT')
+        self.assertEqual(self.dal._call.call_count, 3)
+
+    def test_disabled(self):
+        self.dal = BeeswaxDAL('', coalesce=False)
+        self.dal._call = mock.Mock(return_value=[])
+        self.dal.call('GET', ['campaign'])
+        self.assertIsNone(self.dal.single_flight)
@@ -0,0 +1,61 @@
+import pickle
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.codecs import JSONCodec, StdlibCodec, UJSONCodec, get_codec
+from beeswax_wrapper.modules.segments import encode_segment_update
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TestCodecs(unittest.TestCase):
+
+    payload = {'success': True, 'payload': [{'line_item_id': 1, 'line_item_name': 'café', 'bid_price': 2.5}]}
+
+    def _test_round_trip(self, codec):
+        encoded = codec.dumps(self.payload)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(codec.loads(encoded), self.payload)
+
+    def test_ujson(self):
+        self._test_round_trip(get_codec('ujson'))
+
+    def test_stdlib(self):
+        self._test_round_trip(get_codec('json'))
+
+    @unittest.skipIf(orjson is None, 'orjson not installed')
+    def test_orjson(self):
+        self._test_round_trip(get_codec('orjson'))
+
+    def test_get_codec(self):
+        self.assertIsInstance(get_codec(), UJSONCodec)
+        codec = StdlibCodec()
+        self.assertIs(get_codec(codec), codec)
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+
+    def test_invalid_json(self):
+        for name in ('ujson', 'json'):
+            with self.assertRaises(ValueError):
+                get_codec(name).loads(b'<html>')
+
+    def test_dal_codec(self):
+        dal = BeeswaxDAL('', codec='json')
+        self.assertIsInstance(dal.codec, JSONCodec)
+        self.assertEqual(dal.codec.name, 'json')
+
+    def test_request_bodies(self):
+        dal = BeeswaxDAL('', codec='json')
+        dal.call = mock.Mock(return_value=[{'line_item_id': 1}])
+        BeeswaxAPI(dal=dal).line_items.retrieve(1)
+        self.assertEqual(dal.call.call_args[1]['data'], b'{"line_item_id":1}')
+        self.assertEqual(encode_segment_update([{'user_id': 'a'}], codec=dal.codec), b'{"user_data":[{"user_id":"a"}]}')
+
+    def test_pickle(self):
+        for name in ('ujson', 'json') + (('orjson',) if orjson else ()):
+            self.assertEqual(pickle.loads(pickle.dumps(get_codec(name))).name, name)
@@ -0,0 +1,51 @@
+import io
+import unittest
+import zlib
+
+import mock
+import requests
+from urllib3 import HTTPResponse
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.compression import RequestCompression, gzip_compress
+
+
+class TestRequestCompression(unittest.TestCase):
+
+    def test_gzip_compress(self):
+        self.assertEqual(zlib.decompress(gzip_compress('{"a": 1}'), 16 + zlib.MAX_WBITS), b'{"a": 1}')
+
+    def test_threshold(self):
+        compression = RequestCompression(threshold=100)
+        small = {'data': '{"a": 1}'}
+        self.assertIs(compression.prepare(small), small)
+
+        large = compression.prepare({'data': '[' + '1,' * 100 + '1]', 'headers': {'X': 'y'}})
+        self.assertEqual(large['headers'], {'X': 'y', 'Content-Encoding': 'gzip'})
+        self.assertEqual(zlib.decompress(large['data'], 16 + zlib.MAX_WBITS), b'[' + b'1,' * 100 + b'1]')
+
+    def test_files_not_compressed(self):
+        kwargs = {'data': 'x' * 2000, 'files': {'file': b''}}
+        self.assertIs(RequestCompression().prepare(kwargs), kwargs)
+
+
+class TestBeeswaxDalCompression(unittest.TestCase):
+
+    def test_request_compressed(self):
+        dal = BeeswaxDAL('http://beeswax/', compression=RequestCompression(threshold=10))
+        session = mock.MagicMock()
+        with mock.patch.object(BeeswaxDAL, 'session', session):
+            dal._request('POST', ['segment_update'], data='{"user_data": []}')
+        kwargs = session.post.call_args[1]
+        self.assertEqual(kwargs['headers'], {'Content-Encoding': 'gzip'})
+        self.assertEqual(zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS), b'{"user_data": []}')
+
+    def test_accept_encoding(self):
+        self.assertEqual(BeeswaxDAL('').session.headers['Accept-Encoding'], 'gzip, deflate')
+
+    def test_streamed_response_decompressed(self):
+        http_response = requests.Response()
+        http_response.status_code = 200
+        body = gzip_compress('{"success": true, "payload": [{"id": 1}, {"id": 2}]}')
+        http_response.raw = HTTPResponse(io.BytesIO(body), headers={'Content-Encoding': 'gzip'}, preload_content=False)
+        self.assertEqual(list(BeeswaxDAL._iter_payload(http_response, 8)), [{'id': 1}, {'id': 2}])
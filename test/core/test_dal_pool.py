@@ -0,0 +1,89 @@
+import os
+import signal
+import threading
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.dal_pool import DALPool
+
+
+class TestDALPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = DALPool(max_size=2, endpoint_url='http://beeswax/')
+        patcher = mock.patch.object(BeeswaxDAL, '_call', return_value={})
+        self.call = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dal_per_account(self):
+        first = self.pool.get(account_id=1, username='a', password='b')
+        self.assertIs(self.pool.get(account_id=1, username='a', password='b'), first)
+        second = self.pool.get(account_id=2, username='a', password='b')
+        self.assertIsNot(second, first)
+        self.assertEqual((first.account_id, second.account_id), (1, 2))
+        self.assertEqual(self.call.call_count, 2)  # one authentication each
+        self.assertEqual(first.endpoint_url, 'http://beeswax/')
+
+    def test_least_recently_used_evicted(self):
+        first = self.pool.get(account_id=1, username='a', password='b')
+        self.pool.get(account_id=2, username='a', password='b')
+        self.pool.get(account_id=1, username='a', password='b')
+        with mock.patch.object(BeeswaxDAL, 'reset_sessions') as reset_sessions:
+            self.pool.get(account_id=3, username='a', password='b')
+            self.assertEqual(reset_sessions.call_count, 1)
+        self.assertEqual(len(self.pool), 2)
+        self.assertIn(('a', 1), self.pool)
+        self.assertNotIn(('a', 2), self.pool)
+        self.assertIs(self.pool.get(account_id=1, username='a', password='b'), first)
+
+    def test_concurrent_first_use_authenticates_once(self):
+        threads = [threading.Thread(target=self.pool.get, kwargs={'account_id': 1, 'username': 'a', 'password': 'b'})
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.call.call_count, 1)
+
+    def test_evict_and_clear(self):
+        self.pool.get(account_id=1, username='a', password='b')
+        self.pool.get(account_id=2, username='a', password='b')
+        self.pool.evict(account_id=1, username='a')
+        self.assertEqual(len(self.pool), 1)
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
+
+    def test_api_for_account(self):
+        api = BeeswaxAPI.for_account(7, username='a', password='b', pool=self.pool)
+        self.assertIs(api.dal, self.pool.get(account_id=7, username='a', password='b'))
+        self.assertIs(api.line_items._dal, api.dal)
+        self.assertEqual(api.dal.account_id, 7)
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'fork not supported')
+class TestDALPoolFork(unittest.TestCase):
+
+    @mock.patch.object(BeeswaxDAL, '_call', return_value={})
+    def test_held_locks_released_in_child(self, _):
+        pool = DALPool(endpoint_url='http://beeswax/')
+        dal = pool.get(account_id=1, username='a', password='b')
+        acquired, release = threading.Event(), threading.Event()
+
+        def hold():  # as a thread authenticating a pooled DAL at the fork
+            with pool._lock, pool._dals[('a', 1)][1]:
+                acquired.set()
+                release.wait(5)
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait(5)
+        try:
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover
+                signal.alarm(5)  # a deadlock kills the child
+                os._exit(0 if pool.get(account_id=1, username='a', password='b') is dal else 1)
+            self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        finally:
+            release.set()
+            thread.join()
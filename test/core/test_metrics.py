@@ -0,0 +1,97 @@
+import unittest
+import ujson
+
+import mock
+from requests import ConnectionError
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.exceptions import BeeswaxAuthenticationException
+from beeswax_wrapper.core.metrics import EXPIRING, REJECTED, MetricsCollector, PrometheusMetrics, endpoint_name
+from beeswax_wrapper.core.retry import AUTHENTICATION, TRANSIENT, RetryPolicy
+
+
+class TestPrometheusMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = PrometheusMetrics(buckets=(0.1, 1.0))
+
+    def test_histogram(self):
+        self.metrics.on_response('get', 'campaign', 200, 0.05, 0, 100)
+        self.metrics.on_response('GET', 'campaign', 200, 0.5, 0, 50)
+        self.metrics.on_response('GET', 'campaign', 500, 5.0, 0, 10)
+        text = self.metrics.render()
+        self.assertIn('beeswax_request_duration_seconds_bucket{method="GET",endpoint="campaign",le="0.1"} 1\n', text)
+        self.assertIn('beeswax_request_duration_seconds_bucket{method="GET",endpoint="campaign",le="1.0"} 2\n', text)
+        self.assertIn('beeswax_request_duration_seconds_bucket{method="GET",endpoint="campaign",le="+Inf"} 3\n', text)
+        self.assertIn('beeswax_request_duration_seconds_sum{method="GET",endpoint="campaign"} 5.55\n', text)
+        self.assertIn('beeswax_request_duration_seconds_count{method="GET",endpoint="campaign"} 3\n', text)
+        self.assertIn('beeswax_response_bytes_total{method="GET",endpoint="campaign"} 160\n', text)
+        self.assertIn('beeswax_responses_total{method="GET",endpoint="campaign",status="200"} 2\n', text)
+        self.assertIn('beeswax_responses_total{method="GET",endpoint="campaign",status="500"} 1\n', text)
+
+    def test_counters(self):
+        self.metrics.on_response('POST', 'segment_upload', None, 0.2, 2048, None)
+        self.metrics.on_retry('POST', 'segment_upload', TRANSIENT)
+        self.metrics.on_reauthentication(REJECTED)
+        self.metrics.on_reauthentication(REJECTED)
+        text = self.metrics.render()
+        self.assertIn('beeswax_request_bytes_total{method="POST",endpoint="segment_upload"} 2048\n', text)
+        self.assertIn('beeswax_responses_total{method="POST",endpoint="segment_upload",status="error"} 1\n', text)
+        self.assertNotIn('beeswax_response_bytes_total{', text)
+        self.assertIn('beeswax_retries_total{method="POST",endpoint="segment_upload",classification="transient"} 1\n',
+                      text)
+        self.assertIn('beeswax_reauthentications_total{reason="rejected"} 2\n', text)
+        self.assertIn('# TYPE beeswax_retries_total counter\n', text)
+
+    def test_escaped_labels(self):
+        self.metrics.on_response('GET', 'a"b\\c', 200, 0.0, 0, 0)
+        self.assertIn('endpoint="a\\"b\\\\c"', self.metrics.render())
+
+    def test_clear(self):
+        self.metrics.on_reauthentication(EXPIRING)
+        self.metrics.clear()
+        self.assertNotIn('reason=', self.metrics.render())
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name(['segment_upload', 'upload', 1234]), 'segment_upload/upload')
+
+
+class TestBeeswaxDalMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = mock.Mock(spec=MetricsCollector)
+        self.dal = BeeswaxDAL('', metrics=self.metrics)
+
+    def test_response(self):
+        with mock.patch('beeswax_wrapper.core.access.BeeswaxDAL.session', new_callable=mock.PropertyMock) as p:
+            p.return_value = p.post = p
+            p.status_code = 200
+            p.content = ujson.dumps({'payload': 'output', 'success': True}).encode('utf-8')
+            self.dal._call('POST', ['campaign', 12], data='{"a":1}')
+        method, endpoint, status_code, duration, request_bytes, response_bytes = self.metrics.on_response.call_args[0]
+        self.assertEqual((method, endpoint, status_code, request_bytes), ('POST', 'campaign', 200, 7))
+        self.assertEqual(response_bytes, len(p.content))
+        self.assertGreaterEqual(duration, 0)
+
+    def test_transport_error(self):
+        with mock.patch('beeswax_wrapper.core.access.BeeswaxDAL.session', new_callable=mock.PropertyMock) as p:
+            p.return_value = p
+            p.get.side_effect = ConnectionError('Test')
+            with self.assertRaises(ConnectionError):
+                self.dal._call('GET', ['campaign'])
+        self.assertEqual(self.metrics.on_response.call_args[0][2], None)
+
+    def test_retries_and_reauthentication(self):
+        self.dal.authenticate = mock.Mock()
+        self.dal.retry_policy = RetryPolicy(backoff=0)
+        self.dal._call = mock.Mock(side_effect=[BeeswaxAuthenticationException('Test'), ConnectionError('Test'), 1])
+        self.dal.call('GET', ['campaign'])
+        self.assertEqual(self.metrics.on_retry.call_args_list,
+                         [mock.call('GET', 'campaign', AUTHENTICATION), mock.call('GET', 'campaign', TRANSIENT)])
+        self.metrics.on_reauthentication.assert_called_once_with(REJECTED)
+
+    def test_collector_errors_ignored(self):
+        self.metrics.on_retry.side_effect = ValueError
+        self.dal.retry_policy = RetryPolicy(backoff=0)
+        self.dal._call = mock.Mock(side_effect=[ConnectionError('Test'), 'output'])
+        self.assertEqual(self.dal.call('GET', ['campaign']), 'output')
@@ -0,0 +1,42 @@
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.codecs import get_codec
+from beeswax_wrapper.core.pagination import Paginator
+from beeswax_wrapper.modules.operations import LineItem
+
+
+def list_rows(total):
+    def list_func(rows, offset, **kwargs):
+        return [{'id': i} for i in range(offset, min(offset + rows, total))]
+    return mock.Mock(side_effect=list_func)
+
+
+class TestPaginator(unittest.TestCase):
+
+    def test_all_pages_in_order(self):
+        list_func = list_rows(25)
+        items = list(Paginator(list_func, page_size=10, read_ahead=2, campaign_id=3))
+        self.assertEqual(items, [{'id': i} for i in range(25)])
+        offsets = sorted(c[1]['offset'] for c in list_func.call_args_list)
+        self.assertEqual(offsets[:3], [0, 10, 20])
+        self.assertTrue(all(c[1]['campaign_id'] == 3 for c in list_func.call_args_list))
+
+    def test_exact_multiple(self):
+        self.assertEqual(len(list(Paginator(list_rows(20), page_size=10, read_ahead=0))), 20)
+
+    def test_errors_raised(self):
+        list_func = mock.Mock(side_effect=ValueError('Test'))
+        with self.assertRaises(ValueError):
+            list(Paginator(list_func, page_size=10))
+
+
+class TestPaginate(unittest.TestCase):
+
+    def test_paginate(self):
+        dal = mock.Mock(codec=get_codec())
+        dal.call.side_effect = lambda method, paths, data: [{'line_item_id': 1}]
+        paginator = LineItem(dal).paginate(page_size=2, read_ahead=1, campaign_id=3)
+        self.assertEqual(list(paginator), [{'line_item_id': 1}])
+        self.assertIn(b'"rows":2', dal.call.call_args_list[0][1]['data'])
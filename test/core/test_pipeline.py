@@ -0,0 +1,64 @@
+import unittest
+import ujson
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.exceptions import BeeswaxRESTException
+from beeswax_wrapper.core.pipeline import ProcessPipeline, chunked
+from beeswax_wrapper.modules.segments import SegmentUpdate
+
+
+def encode(chunk):
+    if None in chunk:
+        raise ValueError('bad row')
+    return ujson.dumps(chunk).encode('utf-8')
+
+
+def build_user(row):
+    return {'user_id': row[0], 'segments': row[1]}
+
+
+class TestProcessPipeline(unittest.TestCase):
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+    def _run(self, processes):
+        def upload(body):
+            if ujson.loads(body) == [4, 5]:
+                raise BeeswaxRESTException('Bad Request', status_code=400)
+            return len(body)
+
+        pipeline = ProcessPipeline(encode, upload, processes=processes, upload_workers=2, max_pending=1)
+        result = pipeline.run([[0, 1], [None], [4, 5], [6, 7]])
+        self.assertEqual(result.succeeded, {0: 5, 3: 5})
+        self.assertIsInstance(result.failed[1], ValueError)
+        self.assertIsInstance(result.failed[2], BeeswaxRESTException)
+        self.assertEqual(len(result), 4)
+
+    def test_inline(self):
+        self._run(processes=0)
+
+    def test_process_pool(self):
+        self._run(processes=2)
+
+
+class TestSegmentUpdatePush(unittest.TestCase):
+
+    def test_push(self):
+        dal = BeeswaxDAL('')
+        dal.call = mock.Mock(return_value={'id': 1})
+        rows = (('user-{}'.format(i), ['1']) for i in range(25))
+
+        result = SegmentUpdate(dal).push(rows, chunk_size=10, build_user=build_user, processes=2,
+                                         segment_key_type=1)
+        self.assertTrue(result)
+        self.assertEqual(len(result), 3)
+        bodies = sorted((ujson.loads(call[1]['data']) for call in dal.call.call_args_list),
+                        key=lambda body: body['user_data'][0]['user_id'])
+        self.assertEqual([len(body['user_data']) for body in bodies], [10, 10, 5])
+        self.assertEqual(bodies[0]['segment_key_type'], 1)
+        self.assertEqual(bodies[0]['user_data'][0], {'user_id': 'user-0', 'segments': ['1']})
+        self.assertEqual(dal.call.call_args[0][:2], ('POST', ['segment_update']))
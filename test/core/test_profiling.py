@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.exceptions import BeeswaxRESTException
+from beeswax_wrapper.core.profiling import CPU, Profiler
+
+
+def serialize(n):
+    return [str(i) for i in range(n)]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_aggregated_per_endpoint(self):
+        profiler = Profiler(sample_rate=1)
+        for _ in range(3):
+            self.assertEqual(profiler.profile('advertiser', serialize, 2), ['0', '1'])
+        profiler.profile('line_item', serialize, 2)
+        self.assertEqual(profiler.samples(), {'advertiser': 3, 'line_item': 1})
+        report = profiler.report('advertiser')
+        self.assertIn('advertiser (3 calls profiled)', report)
+        self.assertIn('serialize', report)
+        self.assertNotIn('line_item', report)
+
+    def test_nested_calls_not_profiled(self):
+        profiler = Profiler(sample_rate=1, clock=CPU)
+        profiler.profile('segment', profiler.profile, 'segment_upload', serialize, 2)
+        self.assertEqual(profiler.samples(), {'segment': 1})
+
+    def test_dump(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        profiler = Profiler(sample_rate=1)
+        profiler.profile('segment_upload/upload', serialize, 2)
+        path, = profiler.dump(os.path.join(directory, 'profiles'))
+        self.assertEqual(os.path.basename(path), 'segment_upload.upload.prof')
+        self.assertTrue(os.path.getsize(path))
+        profiler.clear()
+        self.assertEqual(profiler.report(), '')
+
+    def test_unknown_clock(self):
+        with self.assertRaises(ValueError):
+            Profiler(clock='gpu')
+
+
+class TestApiProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('')
+        self.dal.call = mock.Mock(return_value=[{'advertiser_id': 1}])
+        self.api = BeeswaxAPI(dal=self.dal)
+
+    def test_sampled(self):
+        self.dal.profiler = Profiler(sample_rate=1)
+        self.api.advertisers.retrieve(advertiser_id=1)
+        self.api.advertisers.list()
+        self.assertEqual(self.dal.profiler.samples(), {'advertiser': 2})
+        self.assertIn('retrieve', self.dal.profiler.report())
+
+    def test_not_sampled(self):
+        self.dal.profiler = Profiler(sample_rate=0)
+        self.api.advertisers.retrieve(advertiser_id=1)
+        self.assertEqual(self.dal.profiler.samples(), {})
+
+    def test_errors_wrapped(self):
+        self.dal.profiler = Profiler(sample_rate=1)
+        self.dal.call.side_effect = ValueError
+        with self.assertRaises(BeeswaxRESTException):
+            self.api.advertisers.retrieve(advertiser_id=1)
+        self.assertEqual(self.dal.profiler.samples(), {'advertiser': 1})
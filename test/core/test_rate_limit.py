@@ -0,0 +1,48 @@
+import unittest
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxDAL
+from beeswax_wrapper.core.rate_limit import RateLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_spaced(self):
+        with mock.patch('beeswax_wrapper.core.rate_limit.time') as t:
+            t.time.return_value = 100.0
+            bucket = TokenBucket(rate=2, capacity=2)
+            self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+            t.time.return_value = 102.0
+            self.assertEqual(bucket.reserve(), 0.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = RateLimiter(rates={'segment': 1, 'segment_update': 1, 'segment_upload/upload': 1},
+                                   account_rates={7: 100})
+
+    def test_prefix_match(self):
+        self.assertEqual(self.limiter._match(['segment_update'])[0], ('segment_update',))
+        self.assertEqual(self.limiter._match(['segment_upload', 'upload', 12])[0], ('segment_upload', 'upload'))
+        self.assertEqual(self.limiter._match(['line_item']), (None, None))
+
+    def test_separate_buckets(self):
+        self.assertEqual(self.limiter.reserve(['segment']), 0.0)
+        self.assertEqual(self.limiter.reserve(['segment_update']), 0.0)
+        self.assertEqual(self.limiter.reserve(['segment'], account_id=7), 0.0)
+        self.assertGreater(self.limiter.reserve(['segment']), 0.0)
+        self.assertIn((7, '*'), self.limiter._buckets)
+
+    def test_unlimited(self):
+        self.assertEqual(RateLimiter().reserve(['line_item']), 0.0)
+
+
+class TestBeeswaxDalRateLimit(unittest.TestCase):
+
+    def test_acquire_before_call(self):
+        dal = BeeswaxDAL('', rate_limiter=mock.Mock())
+        dal._call = mock.Mock()
+        dal.call('GET', ['line_item'])
+        dal.rate_limiter.acquire.assert_called_once_with(['line_item'], None)
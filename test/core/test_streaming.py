@@ -0,0 +1,106 @@
+import unittest
+import ujson
+
+import mock
+
+from beeswax_wrapper.core.access import BeeswaxDAL, BeeswaxRESTException
+from beeswax_wrapper.core.codecs import JSONCodec
+from beeswax_wrapper.core.streaming import JSONArrayStream
+from beeswax_wrapper.modules.segments import SegmentLookup, SegmentUpdate
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestJSONArrayStream(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = [{'segment_id': i, 'segment_name': 'a "quoted", [bracketed] {name}\\', 'tags': [i, {'x': []}]}
+                        for i in range(50)]
+
+    def test_payload(self):
+        body = ujson.dumps({'success': True, 'payload': self.payload, 'message': 'ok'}).encode('utf-8')
+        for size in (1, 3, 17, len(body)):
+            stream = JSONArrayStream(chunked(body, size))
+            self.assertEqual(list(stream), self.payload)
+            self.assertEqual(stream.envelope, {'success': True, 'message': 'ok'})
+
+    def test_top_level_array(self):
+        body = ujson.dumps(self.payload).encode('utf-8')
+        self.assertEqual(list(JSONArrayStream(chunked(body, 5))), self.payload)
+
+    def test_split_elements(self):
+        payload = [12345, -1.5e3, 'caf\u00e9 \u2603', None, True, [], {}]
+        body = ujson.dumps({'payload': payload}, ensure_ascii=False).encode('utf-8')
+        for size in (1, 2, 3):
+            self.assertEqual(list(JSONArrayStream(chunked(body, size))), payload)
+
+    def test_empty_and_errors(self):
+        stream = JSONArrayStream([b'{"success": false, "errors": ["bad"], "payload": []}'])
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.envelope, {'success': False, 'errors': ['bad']})
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            list(JSONArrayStream([b'{"success": true, "payload": [{"a": 1}, ']))
+
+    def test_bounded_buffer(self):
+        stream = JSONArrayStream()
+        stream.feed(b'{"success": true, "payload": [')
+        for i in range(100):
+            stream.feed(ujson.dumps(self.payload[0]).encode('utf-8') + b',')
+        self.assertLess(len(stream._state[0]), 200)
+
+    def test_codec(self):
+        codec = JSONCodec()
+        codec.loads = mock.Mock(side_effect=ujson.loads)
+        codec.raw_decode = mock.Mock(side_effect=codec.raw_decode)
+        body = ujson.dumps({'success': True, 'payload': self.payload}).encode('utf-8')
+        stream = JSONArrayStream(chunked(body, 7), codec=codec)
+        self.assertEqual(list(stream), self.payload)
+        self.assertTrue(codec.raw_decode.called)
+        self.assertTrue(codec.loads.called)
+        self.assertEqual(stream.envelope, {'success': True})
+
+    def test_dal_codec(self):
+        dal = BeeswaxDAL('', codec='json')
+        http_response = mock.Mock(ok=True, status_code=200)
+        http_response.iter_content.return_value = [b'{"success": true, "payload": [{"a": 1}]}']
+        dal._request = mock.Mock(return_value=http_response)
+        with mock.patch.object(dal.codec, 'raw_decode', wraps=dal.codec.raw_decode) as raw_decode:
+            self.assertEqual(list(dal._stream_call('GET', 'line_item')), [{'a': 1}])
+        self.assertTrue(raw_decode.called)
+
+
+class TestBeeswaxDalIterCall(unittest.TestCase):
+
+    def setUp(self):
+        self.dal = BeeswaxDAL('')
+        self.response = mock.Mock(ok=True, status_code=200)
+        self.dal._request = mock.Mock(return_value=self.response)
+
+    def test_iter_call(self):
+        self.response.iter_content.return_value = [b'{"success": true, "payload": [{"a"', b': 1}, {"a": 2}]}']
+        self.assertEqual(list(self.dal.iter_call('GET', ['segment_lookup'])), [{'a': 1}, {'a': 2}])
+        self.assertEqual(self.dal._request.call_args[1]['stream'], True)
+        self.assertEqual(self.response.close.called, True)
+
+    def test_unsuccessful_envelope(self):
+        self.response.iter_content.return_value = [b'{"success": false, "errors": ["bad"]}']
+        with self.assertRaises(BeeswaxRESTException):
+            list(self.dal.iter_call('GET', ['segment_lookup']))
+
+
+class TestIterList(unittest.TestCase):
+
+    def test_list_endpoints_only(self):
+        self.assertTrue(hasattr(SegmentLookup, 'iter_list'))
+        self.assertFalse(hasattr(SegmentUpdate, 'iter_list'))
+
+    def test_errors_wrapped(self):
+        dal = mock.Mock()
+        dal.iter_call.return_value = iter(mock.Mock(side_effect=ValueError('Test')), None)
+        with self.assertRaises(BeeswaxRESTException):
+            list(SegmentLookup(dal).iter_list(segment_name='a'))
+        self.assertEqual(dal.iter_call.call_args[0], ('GET', ['segment_lookup']))
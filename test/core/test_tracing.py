@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import ujson
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.exceptions import BeeswaxRESTException
+from beeswax_wrapper.core.tracing import InMemoryExporter, JSONLinesExporter, Tracer, activate, current_span, phase
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.endswith('missing'):
+            body, status = {'success': False, 'errors': ['not found']}, 404
+        else:
+            body, status = {'success': True, 'payload': [{'advertiser_id': 5}]}, 200
+        body = ujson.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = InMemoryExporter()
+        self.tracer = Tracer(self.exporter)
+
+    def test_phases(self):
+        span = self.tracer.start_span('call', endpoint='advertiser')
+        with activate(span):
+            self.assertIs(current_span(), span)
+            with phase('decode'):
+                pass
+        span.finish()
+        span.finish()
+        self.assertIsNone(current_span())
+        self.assertEqual(self.exporter.spans, [self.exporter.find('decode')[0], span])
+        self.assertEqual(self.exporter.children(span), self.exporter.find('decode'))
+        self.assertEqual(self.exporter.find('decode')[0].trace_id, span.trace_id)
+
+    def test_phase_without_span(self):
+        with phase('decode'):
+            pass
+        self.assertEqual(self.exporter.spans, [])
+
+    def test_json_lines(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        exporter = JSONLinesExporter(os.path.join(directory, 'spans.jsonl'))
+        for name in ('a', 'b'):
+            Tracer(exporter).start_span(name, object_id=1).finish()
+        exporter.close()
+        with open(exporter.path) as f:
+            spans = [ujson.loads(line) for line in f]
+        self.assertEqual([span['name'] for span in spans], ['a', 'b'])
+        self.assertEqual(spans[0]['tags'], {'object_id': 1})
+        self.assertGreaterEqual(spans[0]['duration'], 0)
+
+
+class TestBeeswaxDalTracing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.exporter = InMemoryExporter()
+        url = 'http://127.0.0.1:{}/rest/'.format(self.server.server_address[1])
+        self.api = BeeswaxAPI(dal=BeeswaxDAL(url, tracer=Tracer(self.exporter)))
+
+    def test_call_phases(self):
+        self.assertEqual(self.api.advertisers.retrieve(5), {'advertiser_id': 5})
+        root, = self.exporter.find('Advertiser.retrieve')
+        self.assertEqual(root.tags, {'endpoint': 'advertiser', 'object_id': 5})
+        phases = self.exporter.children(root)
+        self.assertEqual({span.name for span in phases}, {'serialize', 'connect', 'send', 'wait', 'download', 'decode'})
+        for span in phases:
+            self.assertTrue(root.start <= span.start <= span.end <= root.end)
+
+    def test_reused_connection(self):
+        self.api.advertisers.retrieve(advertiser_id=5)
+        self.exporter.clear()
+        self.api.advertisers.retrieve(advertiser_id=5)
+        self.assertEqual(self.exporter.find('Advertiser.retrieve')[0].tags['object_id'], 5)
+        self.assertEqual(self.exporter.find('connect'), [])
+
+    def test_failed_call(self):
+        self.api.advertisers.paths = ['advertiser', 'missing']
+        with self.assertRaises(BeeswaxRESTException):
+            self.api.advertisers.list()
+        root, = self.exporter.find('Advertiser.list')
+        self.assertIn('not found', root.tags['error'])
+        self.assertEqual(len(self.exporter.children(root)), 6)
+
+    def test_untraced(self):
+        self.api.dal.tracer = None
+        self.api.advertisers.retrieve(advertiser_id=5)
+        self.assertEqual(self.exporter.spans, [])
@@ -1,8 +1,15 @@
+import os
+import tempfile
+import time
 import unittest
 import mock
 
 
-from beeswax_wrapper.credentials.credential_manager import get_beeswax_credentials, store_beeswax_credentials
+from beeswax_wrapper.credentials.credential_manager import (
+    CallableCredentialProvider, ChainCredentialProvider, EnvironmentCredentialProvider, FileCredentialProvider,
+    KeyringCredentialProvider, get_beeswax_credentials, get_credential_provider, set_credential_provider,
+    store_beeswax_credentials
+)
 
 
 class TestStoreBeeswaxCredentials(unittest.TestCase):
@@ -19,3 +26,60 @@ class TestGetBeeswaxCredentials(unittest.TestCase):
         with mock.patch('beeswax_wrapper.credentials.credential_manager.keyring') as f:
             get_beeswax_credentials()
             self.assertEqual(f.get_password.call_count, 2)
+
+
+class TestCredentialProviders(unittest.TestCase):
+
+    def test_cached(self):
+        load = mock.Mock(return_value={'username': 'a', 'password': 'b'})
+        provider = CallableCredentialProvider(load)
+        self.assertEqual(provider.get_credentials(), {'username': 'a', 'password': 'b'})
+        provider.get_credentials()
+        self.assertEqual(load.call_count, 1)
+        provider.invalidate()
+        provider.get_credentials()
+        self.assertEqual(load.call_count, 2)
+
+    def test_ttl(self):
+        load = mock.Mock(return_value={'username': 'a', 'password': 'b'})
+        provider = CallableCredentialProvider(load, ttl=60)
+        provider.get_credentials()
+        with mock.patch('beeswax_wrapper.credentials.credential_manager.time') as t:
+            t.time.return_value = time.time() + 61
+            provider.get_credentials()
+        self.assertEqual(load.call_count, 2)
+
+    def test_keyring(self):
+        with mock.patch('beeswax_wrapper.credentials.credential_manager.keyring') as f:
+            f.get_password.return_value = 'a'
+            provider = KeyringCredentialProvider()
+            provider.get_credentials()
+            provider.get_credentials()
+            self.assertEqual(f.get_password.call_count, 2)
+
+    def test_environment(self):
+        with mock.patch.dict(os.environ, {'BEESWAX_USERNAME': 'a', 'BEESWAX_PASSWORD': 'b'}):
+            self.assertEqual(EnvironmentCredentialProvider().get_credentials(), {'username': 'a', 'password': 'b'})
+
+    def test_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            f.write('{"username": "a", "password": "b"}')
+        try:
+            self.assertEqual(FileCredentialProvider(f.name).get_credentials(), {'username': 'a', 'password': 'b'})
+        finally:
+            os.remove(f.name)
+
+    def test_chain(self):
+        missing = CallableCredentialProvider(lambda: {'username': None, 'password': None})
+        found = CallableCredentialProvider(lambda: {'username': 'a', 'password': 'b'})
+        self.assertEqual(ChainCredentialProvider([missing, found]).get_credentials(),
+                         {'username': 'a', 'password': 'b'})
+
+    def test_default_provider(self):
+        provider = CallableCredentialProvider(lambda: {})
+        previous = get_credential_provider()
+        set_credential_provider(provider)
+        try:
+            self.assertIs(get_credential_provider(), provider)
+        finally:
+            set_credential_provider(previous)
@@ -0,0 +1,29 @@
+import unittest
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.testing.server import FakeBeeswax
+from beeswax_wrapper.testing.simulator import BeeswaxSimulator
+
+
+class TestFakeBeeswax(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeBeeswax().start()
+        self.addCleanup(self.server.stop)
+        self.server.populate('line_item', [{'line_item_id': i} for i in range(1, 6)])
+        dal = BeeswaxDAL(self.server.url)
+        dal.authenticate('user@example.com', 'password')
+        self.api = BeeswaxAPI(dal=dal)
+
+    def test_list(self):
+        self.assertEqual(len(self.api.line_items.list()), 5)
+        self.assertEqual(self.api.line_items.retrieve(3), {'line_item_id': 3})
+        self.assertEqual(self.api.line_items.list(rows=2, offset=3), [{'line_item_id': 4}, {'line_item_id': 5}])
+        self.assertEqual(sum(1 for _ in self.api.line_items.iter_list()), 5)
+
+    def test_writes(self):
+        self.assertIn('id', self.api.line_items.update(1, active=False))
+        self.assertEqual(len(self.api.line_items.list()), 5)  # writes are not stored, unlike the simulator
+
+    def test_simulator_extends(self):
+        self.assertTrue(issubclass(BeeswaxSimulator, FakeBeeswax))
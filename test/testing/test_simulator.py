@@ -0,0 +1,145 @@
+import random
+import time
+import unittest
+
+from requests import ConnectionError
+
+from beeswax_wrapper.core.access import BeeswaxAPI, BeeswaxDAL
+from beeswax_wrapper.core.exceptions import (BeeswaxAuthenticationException, BeeswaxRESTException,
+                                             BeeswaxTransientException)
+from beeswax_wrapper.core.retry import RetryPolicy
+from beeswax_wrapper.credentials.credential_manager import CallableCredentialProvider
+from beeswax_wrapper.testing.simulator import BeeswaxSimulator, Faults, LogNormalLatency, UniformLatency
+
+
+class TestLatency(unittest.TestCase):
+
+    def test_distributions(self):
+        rng = random.Random(1)
+        self.assertTrue(all(0.1 <= UniformLatency(0.1, 0.2).sample(rng) <= 0.2 for _ in range(100)))
+        samples = sorted(LogNormalLatency(median=0.05, sigma=0.5, maximum=0.2).sample(rng) for _ in range(1001))
+        self.assertAlmostEqual(samples[500], 0.05, delta=0.01)
+        self.assertLessEqual(samples[-1], 0.2)
+        self.assertEqual(Faults(latency=0.5).latency.sample(rng), 0.5)
+
+
+class TestBeeswaxSimulator(unittest.TestCase):
+
+    def start(self, **options):
+        simulator = BeeswaxSimulator(users={'user@example.com': 'password'}, seed=1, **options).start()
+        self.addCleanup(simulator.stop)
+        simulator.populate('advertiser', [{'advertiser_id': i} for i in range(1, 11)])
+        return simulator
+
+    def dal(self, simulator, **options):
+        options.setdefault('retry_policy', RetryPolicy(backoff=0))
+        dal = BeeswaxDAL(simulator.url, **options)
+        dal.authenticate('user@example.com', 'password')
+        return dal
+
+    def test_crud(self):
+        api = BeeswaxAPI(dal=self.dal(self.start()))
+        self.assertEqual(api.advertisers.retrieve(3), {'advertiser_id': 3})
+        self.assertEqual(len(api.advertisers.list()), 10)
+        self.assertEqual(api.advertisers.list(rows=2, offset=8), [{'advertiser_id': 9}, {'advertiser_id': 10}])
+
+        advertiser_id = api.advertisers.create('new', 1)['id']
+        self.assertEqual(advertiser_id, 11)
+        self.assertEqual(api.advertisers.retrieve(advertiser_id)['advertiser_name'], 'new')
+        api.advertisers.update(advertiser_id, advertiser_name='renamed')
+        self.assertEqual(api.advertisers.retrieve(advertiser_id)['advertiser_name'], 'renamed')
+        api.advertisers.delete(advertiser_id)
+        self.assertEqual(api.advertisers.list(advertiser_id=advertiser_id), [])
+        self.assertEqual(len(api.advertisers.list()), 10)
+
+    def test_unknown_endpoint(self):
+        dal = self.dal(self.start())
+        with self.assertRaises(BeeswaxRESTException) as context:
+            dal.call('GET', ['not_an_endpoint'])
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_session_required(self):
+        simulator = self.start()
+        credentials = CallableCredentialProvider(lambda: {'username': 'user@example.com', 'password': 'wrong'})
+        with self.assertRaises(BeeswaxAuthenticationException):
+            BeeswaxDAL(simulator.url, credential_provider=credentials).call('GET', ['advertiser'])
+        self.assertEqual(simulator.stats()['statuses'], {401: 2})  # the call and the re-authentication
+
+        credentials.func = lambda: {'username': 'user@example.com', 'password': 'password'}
+        credentials.invalidate()
+        dal = BeeswaxDAL(simulator.url, credential_provider=credentials)
+        self.assertEqual(len(dal.call('GET', ['advertiser'])), 10)
+        self.assertEqual(simulator.stats()['authentications'], 1)
+
+    def test_session_expiry(self):
+        simulator = self.start()
+        dal = self.dal(simulator)
+        simulator.expire_sessions()
+        self.assertEqual(len(dal.call('GET', ['advertiser'])), 10)
+        stats = simulator.stats()
+        self.assertEqual(stats['authentications'], 2)
+        self.assertEqual(stats['statuses'], {200: 3, 401: 1})
+
+    def test_advertised_expiry(self):
+        simulator = self.start(session_lifetime=60, advertise_expiry=True)
+        dal = self.dal(simulator)
+        self.assertIsNotNone(dal.lifetime.expires_at)
+        self.assertAlmostEqual(dal.lifetime.expires_at, time.time() + 60, delta=2)
+
+    def test_error_rate(self):
+        simulator = self.start(faults=Faults(error_rate=1.0, error_status=503))
+        dal = self.dal(simulator, retry_policy=RetryPolicy(max_attempts=3, backoff=0))
+        with self.assertRaises(BeeswaxTransientException):
+            dal.call('GET', ['advertiser'])
+        self.assertEqual(simulator.stats()['statuses'][503], 3)
+
+    def test_endpoint_faults(self):
+        simulator = self.start(endpoint_faults={'campaign': Faults(error_rate=1.0, error_status=500)})
+        dal = self.dal(simulator, retry_policy=RetryPolicy(max_attempts=1))
+        self.assertEqual(len(dal.call('GET', ['advertiser'])), 10)
+        with self.assertRaises(BeeswaxTransientException):
+            dal.call('GET', ['campaign'])
+
+    def test_throttling(self):
+        simulator = self.start(rate_limit=(1, 2))
+        dal = self.dal(simulator, retry_policy=RetryPolicy(max_attempts=1))
+        dal.call('GET', ['advertiser'], data='{"advertiser_id": 1}')
+        dal.call('GET', ['advertiser'], data='{"advertiser_id": 2}')
+        with self.assertRaises(BeeswaxTransientException) as context:
+            dal.call('GET', ['advertiser'], data='{"advertiser_id": 3}')
+        self.assertEqual(context.exception.status_code, 429)
+
+    def test_disconnect(self):
+        simulator = self.start()
+        dal = self.dal(simulator, retry_policy=RetryPolicy(max_attempts=1))
+        simulator.faults = Faults(disconnect_rate=1.0)
+        with self.assertRaises(ConnectionError):
+            dal.call('GET', ['advertiser'])
+        self.assertEqual(simulator.stats()['disconnects'], 1)
+
+    def test_latency_and_slow_body(self):
+        simulator = self.start(faults=Faults(latency=0.05))
+        dal = self.dal(simulator)
+        start = time.time()
+        dal.call('GET', ['advertiser'])
+        self.assertGreaterEqual(time.time() - start, 0.05)
+
+        body = len(simulator.encode(simulator.objects('advertiser')))
+        simulator.faults = Faults(bytes_per_second=body * 5)
+        start = time.time()
+        self.assertEqual(len(dal.call('GET', ['advertiser'])), 10)
+        self.assertGreaterEqual(time.time() - start, 0.15)
+
+    def test_connection_stats(self):
+        simulator = self.start()
+        dal = self.dal(simulator)
+        for advertiser_id in range(1, 4):
+            dal.call('GET', ['advertiser'], data='{{"advertiser_id": {}}}'.format(advertiser_id))
+        stats = simulator.stats()
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['open_connections'], 1)
+        self.assertEqual(stats['peak_in_flight'], 1)
+        simulator.reset_stats()
+        self.assertEqual(simulator.stats()['requests'], 0)
+        self.assertEqual(simulator.stats()['open_connections'], 1)